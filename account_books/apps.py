@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AccountBooksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "account_books"
+
+    def ready(self):
+        from . import signals
+
+        signals.connect()
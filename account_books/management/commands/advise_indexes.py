@@ -0,0 +1,235 @@
+# django
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+# python
+import re
+import json
+import math
+import sqlite3
+
+# payhere
+from payhere.db import full_scans
+
+
+# 검사할 테이블
+TABLES = {"AccountBook", "Expense", "Income", "ExpenseCategory", "IncomeCategory", "ExpenseURL", "IncomeURL"}
+
+COLUMN = r'"(\w+)"\."(\w+)"'
+ALIAS = re.compile(r'(?:FROM|JOIN) "(\w+)" (?:AS )?"?([TU]\d+)"?')
+EQUAL = re.compile(COLUMN + r" (?:= \?|IN \(\?\)|IS NULL)")
+JOIN = re.compile(COLUMN + r" = " + COLUMN)
+RANGE = re.compile(COLUMN + r" (?:BETWEEN|>=?|<=?) ")
+PLAN_TABLE = re.compile(r"(SCAN|SEARCH) (\w+)(?: AS \w+)?(?: USING (?:COVERING )?(?:INDEX|INTEGER PRIMARY KEY)(.*))?")
+
+
+class Command(BaseCommand):
+    help = (
+        "수집한 쿼리(bench_api --capture-queries, 느린 쿼리 로그)의 실행 계획에서 전체 SCAN / 임시 B-tree 정렬을 찾아 "
+        "인덱스 후보를 만들고, SQLite DB 복사본에 후보 인덱스를 만들어 다시 계획한 예상 효과를 출력합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="+", help="쿼리 파일 (JSON lines, {\"sql\": ..., \"count\": ...})")
+        parser.add_argument("--top", type=int, default=10, help="출력할 인덱스 후보 수")
+        parser.add_argument("--analyze", action="store_true", help="복사본에서 ANALYZE로 통계를 만든 뒤 계획합니다.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("SQLite DB에서만 실행할 수 있습니다.")
+
+        workload = self.load_workload(options["files"])
+        if not workload:
+            raise CommandError("검사할 쿼리가 없습니다.")
+
+        scratch = self.get_scratch(options["analyze"])
+        try:
+            sizes = {table: scratch.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in TABLES}
+            plans = {}
+            for sql in workload:
+                try:
+                    plans[sql] = self.explain(scratch, sql)
+                except sqlite3.Error as e:
+                    self.stderr.write(f"EXPLAIN 실패 ({e}): {sql}")
+            problems = {sql: self.get_problems(plan) for sql, plan in plans.items()}
+            problems = {sql: problem for sql, problem in problems.items() if problem}
+
+            self.stdout.write(
+                f"쿼리 {len(plans)}개 (실행 {sum(workload[sql] for sql in plans)}번) 검사, 문제 있는 쿼리 {len(problems)}개"
+            )
+            for sql, problem in sorted(problems.items(), key=lambda item: -workload[item[0]]):
+                self.stdout.write(f"  [{', '.join(problem)}] (실행 {workload[sql]}번) {sql}")
+
+            advices = self.advise(scratch, workload, plans, problems, sizes)
+        finally:
+            scratch.close()
+
+        if not advices:
+            self.stdout.write("인덱스 후보가 없습니다.")
+            return
+
+        self.stdout.write("인덱스 후보 (예상 비용: 계획상 읽는 행 수 추정치 x 실행 횟수)")
+        for rank, (table, columns, before, after, improved) in enumerate(advices[: options["top"]], 1):
+            fields = [self.get_field_name(table, column) for column in columns]
+            # Django 인덱스 이름은 30자까지 가능합니다.
+            name = f"{table.lower()}_{'_'.join(fields)}"[:26].rstrip("_") + "_idx"
+            self.stdout.write(
+                f"{rank}. {table}({', '.join(columns)}) 예상 비용 {before:.0f} -> {after:.0f} "
+                f"(-{(before - after) / before * 100:.1f}%), 개선 쿼리 {improved}개"
+            )
+            self.stdout.write(f'   CREATE INDEX "{name}" ON "{table}" ({", ".join(columns)});')
+            self.stdout.write(f'   models.Index(fields={json.dumps(fields)}, name="{name}")')
+
+    def load_workload(self, paths):
+        """쿼리 모양별 실행 횟수 (느린 쿼리 로그처럼 앞에 시간/레벨이 붙은 줄도 읽습니다.)"""
+        workload = {}
+        for path in paths:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    lines = f.readlines()
+            except OSError as e:
+                raise CommandError(f"파일을 읽을 수 없습니다: {e}")
+
+            for line in lines:
+                start = line.find("{")
+                if start < 0:
+                    continue
+                try:
+                    row = json.loads(line[start:])
+                except ValueError:
+                    continue
+                sql = row.get("sql", "")
+                if not sql.upper().startswith(("SELECT", "UPDATE", "DELETE")):
+                    continue
+                if not any(f'"{table}"' in sql for table in TABLES):
+                    continue
+                workload[sql] = workload.get(sql, 0) + int(row.get("count", 1))
+        return workload
+
+    def get_scratch(self, analyze):
+        """현재 DB를 메모리 DB로 복사합니다.
+
+        같은 설정의 connection 복사본으로 메모리 DB를 열어 Django가 등록하는 SQLite 함수(django_date_extract 등)를 사용합니다.
+        """
+        connection.ensure_connection()
+        scratch_connection = connection.copy("advise_indexes")
+        scratch_connection.settings_dict["NAME"] = ":memory:"
+        scratch_connection.ensure_connection()
+        scratch = scratch_connection.connection
+        # 복사 순서와 관계없도록 외래 키 검사를 끕니다. (Django 연결은 켜져 있음)
+        scratch.execute("PRAGMA foreign_keys = OFF")
+        if connection.connection.in_transaction:
+            # 쓰기 트랜잭션 중에는 backup이 끝나지 않으므로 SQL로 복사합니다.
+            scratch.executescript("\n".join(connection.connection.iterdump()))
+        else:
+            connection.connection.backup(scratch)
+        if analyze:
+            scratch.execute("ANALYZE")
+        return scratch
+
+    def explain(self, scratch, sql):
+        # 정규화한 SQL의 IN 목록과 값은 NULL 파라미터로 계획합니다.
+        sql = sql.replace("(...)", "(?)")
+        rows = scratch.execute(f"EXPLAIN QUERY PLAN {sql}", [None] * sql.count("?")).fetchall()
+        return [row[-1] for row in rows]
+
+    def get_problems(self, plan):
+        problems = [f"{table} 전체 SCAN" for table in full_scans(plan, TABLES)]
+        problems += [line.replace("USE ", "") for line in plan if line.startswith("USE TEMP B-TREE")]
+        return problems
+
+    def plan_cost(self, plan, sizes):
+        """계획상 읽는 행 수 추정치 (통계가 없을 때 SQLite처럼 조건 하나당 행 수를 줄여 계산)"""
+        cost = 0.0
+        largest = 1.0
+        for line in plan:
+            match = PLAN_TABLE.match(line)
+            if match:
+                kind, table, condition = match.groups()
+                rows = max(sizes.get(table, 1), 1)
+                if kind == "SEARCH":
+                    condition = condition or ""
+                    equal = condition.count("=?")
+                    ranges = len(re.findall(r"[<>]\?", condition))
+                    rows = max(1.0, rows / 10 ** equal / 2 ** ranges)
+                    cost += math.log2(max(sizes.get(table, 1), 1) + 1) + rows
+                else:
+                    cost += rows
+                largest = max(largest, rows)
+            elif line.startswith("USE TEMP B-TREE"):
+                cost += largest * math.log2(largest + 1)
+        return cost
+
+    def get_candidates(self, sql):
+        """WHERE 동등 조건 -> 범위 조건 -> 정렬/그룹 컬럼 순서로 테이블별 인덱스 후보를 만듭니다."""
+        sql = sql.replace("(...)", "(?)")
+        aliases = dict((alias, table) for table, alias in ALIAS.findall(sql))
+
+        def columns(pattern, text):
+            result = []
+            for match in pattern.finditer(text):
+                for table, column in zip(match.groups()[::2], match.groups()[1::2]):
+                    result.append((aliases.get(table, table), column))
+            return result
+
+        where, *order = re.split(r"\b(?:ORDER BY|GROUP BY)\b", sql, maxsplit=1)
+        order = order[0] if order else ""
+        equal = columns(EQUAL, where) + columns(JOIN, where)
+        ranges = columns(RANGE, where)
+        orders = [(aliases.get(table, table), column) for table, column in re.findall(COLUMN, order)]
+
+        candidates = set()
+        for table in {table for table, _ in equal + ranges + orders} & TABLES:
+            equal_columns = list(dict.fromkeys(column for name, column in equal if name == table))
+            range_columns = [column for name, column in ranges if name == table][:1]
+            order_columns = [column for name, column in orders if name == table]
+            composite = list(dict.fromkeys(equal_columns + range_columns + order_columns))[:3]
+            if composite:
+                candidates.add((table, tuple(composite)))
+            for column in equal_columns + range_columns:
+                candidates.add((table, (column,)))
+        return candidates
+
+    def existing_prefixes(self, scratch, table):
+        prefixes = set()
+        for _, name, *_ in scratch.execute(f'PRAGMA index_list("{table}")').fetchall():
+            columns = tuple(row[2] for row in scratch.execute(f'PRAGMA index_info("{name}")').fetchall())
+            prefixes.update(columns[:i] for i in range(1, len(columns) + 1))
+        return prefixes
+
+    def advise(self, scratch, workload, plans, problems, sizes):
+        """후보 인덱스를 복사본에 만들고 다시 계획해 (테이블, 컬럼, 비용 전, 비용 후, 개선 쿼리 수) 목록을 반환합니다."""
+        candidates = set()
+        for sql in problems:
+            candidates |= self.get_candidates(sql)
+
+        advices = []
+        for table, columns in sorted(candidates):
+            if columns in self.existing_prefixes(scratch, table):
+                continue
+            affected = [sql for sql in plans if f'"{table}"' in sql]
+            before = sum(self.plan_cost(plans[sql], sizes) * workload[sql] for sql in affected)
+
+            scratch.execute(f'CREATE INDEX "advise_candidate" ON "{table}" ({", ".join(columns)})')
+            try:
+                after, improved = 0.0, 0
+                for sql in affected:
+                    cost = self.plan_cost(self.explain(scratch, sql), sizes)
+                    if cost < self.plan_cost(plans[sql], sizes):
+                        improved += 1
+                    after += cost * workload[sql]
+            finally:
+                scratch.execute('DROP INDEX "advise_candidate"')
+
+            if before and after < before:
+                advices.append((table, columns, before, after, improved))
+        return sorted(advices, key=lambda advice: (advice[3] - advice[2], len(advice[1])))
+
+    def get_field_name(self, table, column):
+        for model in apps.get_models():
+            if model._meta.db_table == table:
+                for field in model._meta.concrete_fields:
+                    if field.column == column:
+                        return field.name
+        return column
@@ -0,0 +1,123 @@
+# django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+
+# python
+import copy
+import json
+import subprocess
+import uuid
+from pathlib import Path
+
+# apps
+from users.models import User
+from payhere.bench import BenchUser, BenchRunner, parse_mix
+from payhere.db import WorkloadRecorder
+
+
+class Command(BaseCommand):
+    help = "벤치마크용 DB에 더미 데이터를 만든 뒤 API 부하 테스트를 실행하고 결과를 JSON으로 출력합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20, help="더미 유저 수 (요청을 보낼 유저 수)")
+        parser.add_argument("--days", type=int, default=60, help="유저당 가계부 수")
+        parser.add_argument("--entries-per-day", type=int, default=3, help="가계부당 평균 지출 내역 수")
+        parser.add_argument("--seed", type=int, default=0, help="데이터/트래픽 난수 시드")
+        parser.add_argument("--requests", type=int, default=2000, help="측정할 요청 수")
+        parser.add_argument("--warmup", type=int, default=100, help="측정 전에 버릴 요청 수")
+        parser.add_argument("--threads", type=int, default=4, help="동시에 요청을 보낼 스레드 수")
+        parser.add_argument("--mix", default="", help='트래픽 비율 (Ex: "account-book=10,expense-list=5")')
+        parser.add_argument("--output", default="", help="결과 JSON을 저장할 파일 (기본: 표준 출력)")
+        parser.add_argument("--keepdb", action="store_true", help="벤치마크용 DB를 지우지 않고 다음 실행에 재사용합니다.")
+        parser.add_argument("--capture-queries", default="", help="측정 중 실행한 쿼리를 저장할 파일 (advise_indexes 입력)")
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options["mix"])
+        except ValueError as e:
+            raise CommandError(e)
+
+        # 개발용 DB를 덮어쓰지 않도록 벤치마크 전용 DB를 사용합니다.
+        if connection.vendor == "sqlite":
+            connection.settings_dict["TEST"]["NAME"] = str(settings.BASE_DIR / "bench.sqlite3")
+        else:
+            connection.settings_dict["TEST"]["NAME"] = f"bench_{connection.settings_dict['NAME']}"
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options["keepdb"])
+
+        try:
+            with override_settings(CACHES=self.get_bench_caches(options["keepdb"])):
+                report, users = self.run_bench(mix, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options["keepdb"])
+
+        report["meta"] = {
+            "commit": self.get_commit(),
+            "database": connection.vendor,
+            "users": len(users),
+            "threads": options["threads"],
+            "requests": options["requests"],
+            "seed": options["seed"],
+            "mix": mix,
+        }
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                f.write(output)
+            self.stderr.write(f"결과 저장: {options['output']}")
+        else:
+            self.stdout.write(output)
+
+    def get_bench_caches(self, keepdb):
+        """
+        벤치마크 중에 사용할 CACHES 설정을 반환하는 함수
+        - 벤치마크 DB와 개발용 DB는 같은 id를 쓰므로 user_version:{id} 같은 키가 섞이지 않도록 KEY_PREFIX에 벤치마크 DB 이름을 붙입니다.
+        - keepdb가 아니면 실행마다 데이터를 새로 만드므로 이전 실행의 캐시도 읽지 않도록 실행별 토큰을 붙입니다.
+        """
+        prefix = f"bench:{Path(connection.settings_dict['NAME']).name}"
+        if not keepdb:
+            prefix = f"{prefix}:{uuid.uuid4().hex[:8]}"
+        caches = copy.deepcopy(settings.CACHES)
+        for cache in caches.values():
+            cache["KEY_PREFIX"] = f"{prefix}:{cache['KEY_PREFIX']}" if cache.get("KEY_PREFIX") else prefix
+        return caches
+
+    def run_bench(self, mix, options):
+        if not User.objects.exists():
+            self.stderr.write("더미 데이터 생성")
+            call_command("loaddata", settings.BASE_DIR / "json_data/expense_category_data.json", verbosity=0)
+            call_command("loaddata", settings.BASE_DIR / "json_data/income_category_data.json", verbosity=0)
+            call_command(
+                "seed_dumy_data",
+                users=options["users"],
+                days=options["days"],
+                entries_per_day=options["entries_per_day"],
+                seed=options["seed"],
+                stdout=self.stderr,
+            )
+
+        client = Client()
+        users = [
+            BenchUser(client, user, "test1234!")
+            for user in User.objects.filter(email__endswith="@test.com").order_by("id")[: options["users"]]
+        ]
+        runner = BenchRunner(users, mix, seed=options["seed"])
+        if options["warmup"]:
+            runner.run(options["warmup"], threads=options["threads"])
+        if options["capture_queries"]:
+            runner.recorder = WorkloadRecorder()
+        report = runner.run(options["requests"], threads=options["threads"])
+        if runner.recorder is not None:
+            runner.recorder.dump(options["capture_queries"])
+            self.stderr.write(f"쿼리 저장: {options['capture_queries']}")
+        return report, users
+
+    def get_commit(self):
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ""
@@ -0,0 +1,107 @@
+# django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+
+# python
+import time
+
+# apps
+from users.models import User
+from payhere.bench import ASYNC_ENDPOINTS, BenchUser, BenchRunner, AsyncBenchRunner
+
+
+class Command(BaseCommand):
+    help = (
+        "월간/일간/검색/통계 조회를 sync view(WSGI, 스레드 --threads개)와 async view(ASGI, 동시 요청 --concurrency개)로 "
+        "같은 요청 목록에 보내 처리량(rps)과 응답 시간을 비교합니다. --db-latency로 쿼리마다 네트워크 DB 지연을 더할 수 있습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10, help="더미 유저 수 (요청을 보낼 유저 수)")
+        parser.add_argument("--days", type=int, default=60, help="유저당 가계부 수")
+        parser.add_argument("--entries-per-day", type=int, default=3, help="가계부당 평균 지출 내역 수")
+        parser.add_argument("--seed", type=int, default=0, help="데이터/트래픽 난수 시드")
+        parser.add_argument("--requests", type=int, default=500, help="측정할 요청 수")
+        parser.add_argument("--warmup", type=int, default=20, help="측정 전에 버릴 요청 수")
+        parser.add_argument("--threads", type=int, default=4, help="sync view에 동시에 요청을 보낼 스레드 수 (WSGI 워커 스레드)")
+        parser.add_argument("--concurrency", type=int, default=32, help="async view에 동시에 보낼 요청 수")
+        parser.add_argument("--db-latency", type=float, default=0.0, help="쿼리마다 더할 지연 시간(ms)")
+        parser.add_argument("--keepdb", action="store_true", help="벤치마크용 DB를 지우지 않고 다음 실행에 재사용합니다.")
+
+    def handle(self, *args, **options):
+        if options["threads"] < 1 or options["concurrency"] < 1 or options["db_latency"] < 0:
+            raise CommandError("--threads, --concurrency는 1 이상, --db-latency는 0 이상이어야 합니다.")
+
+        # bench_api와 같이 개발용 DB를 덮어쓰지 않도록 벤치마크 전용 DB를 사용합니다.
+        if connection.vendor == "sqlite":
+            connection.settings_dict["TEST"]["NAME"] = str(settings.BASE_DIR / "bench.sqlite3")
+        else:
+            connection.settings_dict["TEST"]["NAME"] = f"bench_{connection.settings_dict['NAME']}"
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options["keepdb"])
+
+        latency = options["db_latency"] / 1000
+
+        def add_latency(execute, sql, params, many, context):
+            time.sleep(latency)
+            return execute(sql, params, many, context)
+
+        def add_latency_wrapper(sender, connection, **kwargs):
+            # 요청 중에 연결할 수 있으므로 execute_wrapper 컨텍스트(끝에서 pop)와 섞이지 않도록 앞에 넣습니다.
+            if add_latency not in connection.execute_wrappers:
+                connection.execute_wrappers.insert(0, add_latency)
+
+        try:
+            if not User.objects.exists():
+                self.stderr.write("더미 데이터 생성")
+                call_command("loaddata", settings.BASE_DIR / "json_data/expense_category_data.json", verbosity=0)
+                call_command("loaddata", settings.BASE_DIR / "json_data/income_category_data.json", verbosity=0)
+                call_command(
+                    "seed_dumy_data",
+                    users=options["users"],
+                    days=options["days"],
+                    entries_per_day=options["entries_per_day"],
+                    seed=options["seed"],
+                    stdout=self.stderr,
+                )
+
+            client = Client()
+            users = [
+                BenchUser(client, user, "test1234!")
+                for user in User.objects.filter(email__endswith="@test.com").order_by("id")[: options["users"]]
+            ]
+            # 응답/통계 캐시를 끄고 매 요청 DB를 조회하도록 합니다.
+            settings.RESPONSE_CACHE_TIMEOUT = 0
+            settings.STAT_CACHE_TIMEOUT = 0
+            if latency:
+                # 스레드마다 새로 만드는 connection(ASGI 요청 스레드 포함)에도 지연을 더합니다.
+                connection_created.connect(add_latency_wrapper)
+                connection.close()
+
+            from payhere.asgi import application
+
+            runner = BenchRunner(users, {name: 1 for name in ASYNC_ENDPOINTS}, seed=options["seed"])
+            async_runner = AsyncBenchRunner(application, options["concurrency"])
+            warmup, requests = runner.plan(options["warmup"]), runner.plan(options["requests"])
+            if warmup:
+                runner.execute(warmup, threads=options["threads"])
+                async_runner.execute(warmup)
+            reports = {
+                f"sync (WSGI, threads={options['threads']})": runner.execute(requests, threads=options["threads"]),
+                f"async (ASGI, concurrency={options['concurrency']})": async_runner.execute(requests),
+            }
+        finally:
+            connection_created.disconnect(add_latency_wrapper)
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options["keepdb"])
+
+        self.stdout.write(f"database: {connection.vendor}, requests: {len(requests)}, db latency: {options['db_latency']} ms")
+        self.stdout.write(f"{'mode':<32} {'rps':>9} {'p50':>10} {'p95':>10} {'p99':>10}  statuses")
+        for mode, report in reports.items():
+            total = report["total"]
+            self.stdout.write(
+                f"{mode:<32} {total['rps']:>9.1f} {total['p50_ms']:>7.1f} ms {total['p95_ms']:>7.1f} ms "
+                f"{total['p99_ms']:>7.1f} ms  {total['statuses']}"
+            )
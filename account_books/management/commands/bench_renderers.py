@@ -0,0 +1,106 @@
+# rest_framework
+from rest_framework.renderers import JSONRenderer
+
+# django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+
+# python
+import time
+import random
+from io import StringIO
+
+# apps
+from users.models import User
+from expenses.models import ExpenseCategory
+from incomes.models import IncomeCategory
+from payhere.bench import ENDPOINTS, BenchUser
+from payhere.renderers import FastJSONRenderer, JSONFragment, orjson
+
+
+class Command(BaseCommand):
+    help = (
+        "조회 API의 실제 응답 데이터로 DRF JSONRenderer와 FastJSONRenderer의 렌더링 시간을 비교합니다. "
+        "측정용 데이터는 트랜잭션 안에서 만들고 끝나면 롤백합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=31, help="가계부 수 (1월 1일부터)")
+        parser.add_argument("--entries-per-day", type=int, default=30, help="가계부당 평균 지출 내역 수")
+        parser.add_argument("--repeat", type=int, default=20, help="반복 횟수 (가장 빠른 값 사용)")
+        parser.add_argument("--seed", type=int, default=0, help="데이터/요청 난수 시드")
+
+    def handle(self, *args, **options):
+        if options["days"] < 1 or options["repeat"] < 1:
+            raise CommandError("--days, --repeat은 1 이상이어야 합니다.")
+
+        self.stdout.write(f"encoder: {'orjson ' + orjson.__version__ if orjson else 'json (orjson 미설치)'}")
+        with transaction.atomic():
+            payloads = self.get_payloads(options)
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'payload':<36} {'bytes':>9} {'JSONRenderer':>13} {'Fast':>10} {'speedup':>8}  same")
+        for name, data, fast_data, expected in payloads:
+            before, after, rendered = self.measure(data, fast_data, options["repeat"])
+            self.stdout.write(
+                f"{name:<36} {len(rendered):>9} {before * 1000:>10.2f} ms {after * 1000:>7.2f} ms "
+                f"{before / after:>7.1f}x  {'yes' if rendered == expected else 'NO'}"
+            )
+
+    def get_payloads(self, options):
+        """더미 유저로 조회 API를 호출해 (이름, JSONRenderer 입력, FastJSONRenderer 입력, JSONRenderer 결과) 목록을 반환합니다."""
+        if not ExpenseCategory.objects.exists():
+            call_command("loaddata", settings.BASE_DIR / "json_data/expense_category_data.json", verbosity=0)
+        if not IncomeCategory.objects.exists():
+            call_command("loaddata", settings.BASE_DIR / "json_data/income_category_data.json", verbosity=0)
+        call_command(
+            "seed_dumy_data",
+            users=1,
+            days=options["days"],
+            entries_per_day=options["entries_per_day"],
+            seed=options["seed"],
+            password="bench1234!",
+            stdout=StringIO(),
+        )
+        client = Client()
+        user = BenchUser(client, User.objects.latest("id"), "bench1234!")
+        rng = random.Random(options["seed"])
+
+        payloads = []
+        for name, make_request in ENDPOINTS.items():
+            try:
+                method, path, _ = make_request(user, rng)
+            except IndexError:
+                continue
+            if method != "get":
+                continue
+            response = client.get(path, HTTP_AUTHORIZATION=f"Bearer {user.access}")
+            if response.status_code == 200:
+                payloads.append((name, response.data, response.data, JSONRenderer().render(response.data)))
+
+        # 미리 인코딩한 카테고리 트리를 다른 응답에 넣는 경우 (JSONRenderer는 매번 다시 인코딩)
+        for name, data, _, expected in list(payloads):
+            if name.endswith("-category"):
+                payloads.append((
+                    f"{name} (JSONFragment)",
+                    {"categories": data},
+                    {"categories": JSONFragment(expected)},
+                    JSONRenderer().render({"categories": data}),
+                ))
+        return payloads
+
+    def measure(self, data, fast_data, repeat):
+        """(JSONRenderer 시간, FastJSONRenderer 시간, FastJSONRenderer 결과)"""
+        before = after = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            JSONRenderer().render(data)
+            before = min(before, time.perf_counter() - started)
+
+            started = time.perf_counter()
+            rendered = FastJSONRenderer().render(fast_data)
+            after = min(after, time.perf_counter() - started)
+        return before, after, rendered
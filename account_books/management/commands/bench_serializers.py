@@ -0,0 +1,86 @@
+# rest_framework
+from rest_framework.renderers import JSONRenderer
+
+# django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+# python
+import time
+import datetime
+
+# apps
+from users.models import User
+from account_books.models import AccountBook
+from account_books.serializers import AccountBookListSerializer
+from expenses.models import Expense
+from expenses.serializers import ExpenseListSerializer, ExpenseSearchListSerializer
+from incomes.models import Income
+from incomes.serializers import IncomeListSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "리스트 serializer(serializer.data)와 values_list 조회(values)의 처리 시간을 행 수별로 비교합니다. "
+        "측정용 데이터는 트랜잭션 안에서 만들고 끝나면 롤백합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000], help="측정할 행 수")
+        parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (가장 빠른 값 사용)")
+
+    def handle(self, *args, **options):
+        if min(options["rows"]) < 1 or options["repeat"] < 1:
+            raise CommandError("--rows, --repeat은 1 이상이어야 합니다.")
+
+        self.stdout.write(f"{'serializer':<28} {'rows':>7} {'serializer.data':>16} {'values':>10} {'speedup':>8}  same")
+        for rows in options["rows"]:
+            with transaction.atomic():
+                for name, serializer, queryset in self.create_rows(rows):
+                    before, after, same = self.measure(serializer, queryset, options["repeat"])
+                    self.stdout.write(
+                        f"{name:<28} {rows:>7} {before * 1000:>13.1f} ms {after * 1000:>7.1f} ms "
+                        f"{before / after:>7.1f}x  {'yes' if same else 'NO'}"
+                    )
+                transaction.set_rollback(True)
+
+    def create_rows(self, rows):
+        """행 수만큼 가계부/지출/수익 내역을 만들고 (이름, serializer, queryset) 목록을 반환합니다."""
+        user = User.objects.create_user(f"bench_serializers_{rows}@test.com", f"bench_serializers_{rows}", "test1234!")
+        start = datetime.datetime(2023, 1, 1)
+        account_books = AccountBook.objects.bulk_create(
+            AccountBook(date_at=start + datetime.timedelta(minutes=i), day_total_money=i * 1000, owner=user)
+            for i in range(rows)
+        )
+        details = [None, "짧은 내역", "(주) 소고기 짱 좋아"]
+        Expense.objects.bulk_create(
+            Expense(money=i * 100, expense_detail=details[i % 3], owner=user, account_book=account_books[i])
+            for i in range(rows)
+        )
+        Income.objects.bulk_create(
+            Income(money=i * 100, income_detail=details[i % 3], owner=user, account_book=account_books[i])
+            for i in range(rows)
+        )
+        return [
+            ("AccountBookListSerializer", AccountBookListSerializer, AccountBook.objects.filter(owner=user)),
+            ("ExpenseListSerializer", ExpenseListSerializer, Expense.objects.filter(owner=user)),
+            (
+                "ExpenseSearchListSerializer",
+                ExpenseSearchListSerializer,
+                Expense.objects.select_related("account_book").filter(owner=user),
+            ),
+            ("IncomeListSerializer", IncomeListSerializer, Income.objects.filter(owner=user)),
+        ]
+
+    def measure(self, serializer, queryset, repeat):
+        """(serializer.data 시간, values 시간, JSON 결과가 같은지) 쿼리 실행 시간 포함"""
+        before = after = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            data = serializer(queryset.all(), many=True).data
+            before = min(before, time.perf_counter() - started)
+
+            started = time.perf_counter()
+            values = serializer.values(queryset.all())
+            after = min(after, time.perf_counter() - started)
+        return before, after, JSONRenderer().render(data) == JSONRenderer().render(values)
@@ -0,0 +1,47 @@
+# django
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+# rest_framework_simplejwt
+from rest_framework_simplejwt.tokens import AccessToken
+
+# python
+import json
+
+# apps
+from users.models import User
+from payhere.profiling import RequestProfiler
+
+
+class Command(BaseCommand):
+    help = "특정 유저로 요청 하나를 보내 cProfile / tracemalloc 결과를 PROFILE_DIR에 저장합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help='요청 경로 (Ex: "/expenses/categories/stat/?date=2023-01")')
+        parser.add_argument("--user", type=int, required=True, help="요청을 보낼 유저 id")
+        parser.add_argument("--method", default="get", choices=["get", "post", "put", "delete"], help="HTTP 메서드")
+        parser.add_argument("--data", default="", help="요청 본문 JSON")
+        parser.add_argument("--memory", action="store_true", help="tracemalloc으로 메모리 할당도 측정합니다.")
+        parser.add_argument("--no-cpu", action="store_true", help="cProfile을 사용하지 않습니다.")
+        parser.add_argument("--output-dir", default="", help="결과를 저장할 디렉토리 (기본: PROFILE_DIR)")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(id=options["user"])
+            data = json.loads(options["data"]) if options["data"] else None
+        except User.DoesNotExist:
+            raise CommandError(f"유저가 없습니다: {options['user']}")
+        except ValueError as e:
+            raise CommandError(f"올바른 JSON이 아닙니다: {e}")
+
+        client = Client()
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+        request = getattr(client, options["method"])
+        with RequestProfiler(cpu=not options["no_cpu"], memory=options["memory"]) as profiler:
+            response = request(options["path"], data=data, content_type="application/json", **headers)
+
+        self.stdout.write(f"{options['method'].upper()} {options['path']} -> {response.status_code}")
+        for path in profiler.save(options["output_dir"] or None):
+            self.stdout.write(f"저장: {path}")
+        if profiler.profile:
+            self.stdout.write(profiler.top())
@@ -0,0 +1,33 @@
+# django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# python
+from datetime import timedelta
+
+# apps
+from account_books.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "보관 시간(IDEMPOTENCY_KEY_TTL_HOURS)이 지난 Idempotency-Key와 저장한 응답을 지웁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=None, help="보관 시간(시간, 기본 IDEMPOTENCY_KEY_TTL_HOURS)")
+        parser.add_argument("--batch-size", type=int, default=5000, help="DELETE 한 번에 지울 행 수")
+
+    def handle(self, *args, **options):
+        hours = settings.IDEMPOTENCY_KEY_TTL_HOURS if options["hours"] is None else options["hours"]
+        if hours < 0 or options["batch_size"] < 1:
+            raise CommandError("--hours는 0 이상, --batch-size는 1 이상이어야 합니다.")
+
+        # 긴 DELETE 하나로 테이블을 오래 잠그지 않도록 batch-size개씩 나누어 지웁니다.
+        idempotency_keys = IdempotencyKey.objects.filter(created_at__lt=timezone.now() - timedelta(hours=hours)).order_by("id")
+        deleted = 0
+        while True:
+            ids = list(idempotency_keys.values_list("id", flat=True)[: options["batch_size"]])
+            if not ids:
+                break
+            deleted += IdempotencyKey.objects.filter(id__in=ids).delete()[0]
+        self.stdout.write(f"Idempotency-Key {deleted}개 삭제")
@@ -0,0 +1,33 @@
+# django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# python
+from datetime import timedelta
+
+# apps
+from account_books.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = "보관 기간(SYNC_TOMBSTONE_RETENTION_DAYS)이 지난 삭제 기록(Tombstone)을 지웁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="보관 기간(일, 기본 SYNC_TOMBSTONE_RETENTION_DAYS)")
+        parser.add_argument("--batch-size", type=int, default=5000, help="DELETE 한 번에 지울 행 수")
+
+    def handle(self, *args, **options):
+        days = settings.SYNC_TOMBSTONE_RETENTION_DAYS if options["days"] is None else options["days"]
+        if days < 0 or options["batch_size"] < 1:
+            raise CommandError("--days는 0 이상, --batch-size는 1 이상이어야 합니다.")
+
+        # 긴 DELETE 하나로 테이블을 오래 잠그지 않도록 batch-size개씩 나누어 지웁니다.
+        tombstones = Tombstone.objects.filter(deleted_at__lt=timezone.now() - timedelta(days=days)).order_by("id")
+        deleted = 0
+        while True:
+            ids = list(tombstones.values_list("id", flat=True)[: options["batch_size"]])
+            if not ids:
+                break
+            deleted += Tombstone.objects.filter(id__in=ids).delete()[0]
+        self.stdout.write(f"삭제 기록 {deleted}개 삭제")
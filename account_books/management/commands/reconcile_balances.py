@@ -0,0 +1,116 @@
+# django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+# python
+import time
+
+# apps
+from account_books.models import AccountBook
+from expenses.models import Expense
+from incomes.models import Income
+from payhere.cache import bump_user_version
+
+
+class SortedSums:
+    """account_book_id 순으로 정렬된 (account_book_id, 합계) 결과를 가계부 id 순서에 맞춰 소비합니다."""
+
+    def __init__(self, rows):
+        self.rows = iter(rows)
+        self.current = next(self.rows, None)
+
+    def pop(self, account_book_id):
+        total = 0
+        while self.current is not None and self.current[0] <= account_book_id:
+            if self.current[0] == account_book_id:
+                total = self.current[1]
+            self.current = next(self.rows, None)
+        return total
+
+
+class Command(BaseCommand):
+    help = "가계부 일 총 금액(day_total_money)을 수익 합계 - 지출 합계로 다시 계산해 맞춥니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="수정하지 않고 불일치 내역만 출력합니다.")
+        parser.add_argument("--owner", type=int, action="append", help="검사할 유저 id (여러 번 지정 가능)")
+        parser.add_argument("--batch-size", type=int, default=1000, help="bulk_update 한 번에 수정할 가계부 수")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="쿼리 결과를 나누어 읽을 행 수")
+
+    def get_sums(self, model, account_book_ids=None, owners=None):
+        queryset = model.objects.all()
+        if account_book_ids is not None:
+            queryset = queryset.filter(account_book_id__in=account_book_ids)
+        if owners:
+            queryset = queryset.filter(account_book__owner_id__in=owners)
+        return (
+            queryset.values("account_book_id")
+            .annotate(total=Sum("money"))
+            .order_by("account_book_id")
+            .values_list("account_book_id", "total")
+        )
+
+    def fix_balances(self, account_book_ids):
+        """불일치 가계부를 잠근 뒤 다시 합계를 구해 수정합니다.
+
+        검사 이후 지출/수익이 변경되었을 수 있으므로 select_for_update로 잠근 상태에서
+        해당 가계부의 합계만 다시 구해 bulk_update 합니다.
+        """
+        with transaction.atomic():
+            account_books = list(AccountBook.objects.select_for_update().filter(id__in=account_book_ids).order_by("id"))
+            incomes = dict(self.get_sums(Income, account_book_ids))
+            expenses = dict(self.get_sums(Expense, account_book_ids))
+            now = timezone.now()
+            for account_book in account_books:
+                account_book.day_total_money = incomes.get(account_book.id, 0) - expenses.get(account_book.id, 0)
+                # bulk_update는 auto_now를 적용하지 않으므로 직접 넣습니다.
+                account_book.version += 1
+                account_book.updated_at = now
+            AccountBook.objects.bulk_update(account_books, ["day_total_money", "version", "updated_at"])
+            for owner_id in {account_book.owner_id for account_book in account_books}:
+                bump_user_version(owner_id)
+        return len(account_books)
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        owners = options["owner"]
+        batch_size = options["batch_size"]
+        chunk_size = options["chunk_size"]
+
+        start_time = time.time()
+        account_books = AccountBook.objects.all()
+        if owners:
+            account_books = account_books.filter(owner_id__in=owners)
+        account_books = account_books.order_by("id").values_list("id", "day_total_money")
+
+        incomes = SortedSums(self.get_sums(Income, owners=owners).iterator(chunk_size=chunk_size))
+        expenses = SortedSums(self.get_sums(Expense, owners=owners).iterator(chunk_size=chunk_size))
+
+        checked = 0
+        drifted = 0
+        fixed = 0
+        batch = []
+        for account_book_id, day_total_money in account_books.iterator(chunk_size=chunk_size):
+            checked += 1
+            expected = incomes.pop(account_book_id) - expenses.pop(account_book_id)
+            if day_total_money == expected:
+                continue
+
+            drifted += 1
+            if dry_run or options["verbosity"] >= 2:
+                self.stdout.write(f"가계부 {account_book_id}: {day_total_money} -> {expected}")
+            if not dry_run:
+                batch.append(account_book_id)
+                if len(batch) >= batch_size:
+                    fixed += self.fix_balances(batch)
+                    batch = []
+
+        if batch:
+            fixed += self.fix_balances(batch)
+
+        elapsed = time.time() - start_time
+        rate = round(checked / elapsed) if elapsed else checked
+        self.stdout.write(f"가계부 {checked}개 검사, 불일치 {drifted}개, 수정 {fixed}개")
+        self.stdout.write(f"검사 시간 {round(elapsed, 2)}초 ({rate} rows/s)")
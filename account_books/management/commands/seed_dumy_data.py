@@ -1,5 +1,8 @@
 # django
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
 
 # faker
 from faker import Faker
@@ -7,83 +10,134 @@ from faker import Faker
 # python
 import time
 import random
+import datetime
 
 # apps
 from users.models import User
 from account_books.models import AccountBook
-from expenses.models import Expense
-from incomes.models import Income
+from expenses.models import Expense, ExpenseCategory
+from incomes.models import Income, IncomeCategory
 
 
 class Command(BaseCommand):
-    help = "더미 데이터를 생성합니다."
+    help = "부하 테스트용 더미 데이터를 생성합니다. (같은 --seed면 같은 데이터)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100, help="생성할 유저 수")
+        parser.add_argument("--days", type=int, default=30, help="유저당 생성할 일별 가계부 수")
+        parser.add_argument("--entries-per-day", type=int, default=3, help="가계부당 평균 지출 내역 수")
+        parser.add_argument("--start-date", default="2023-01-01", help="첫 가계부 날짜 (YYYY-MM-DD)")
+        parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+        parser.add_argument("--password", default="test1234!", help="더미 유저 비밀번호")
+        parser.add_argument("--batch-size", type=int, default=5000, help="bulk_create 한 번에 저장할 행 수")
 
     def handle(self, *args, **options):
-        """100명의 더미 유저 데이터 생성"""
-        self.stdout.write("100명의 유저 생성")
-        start_time = time.time()
-        users_list = [
-            User(
-                email=f"test{i}@test.com",
-                nickname=f"test{i}",
-                password="test1234!",
-            )
-            for i in range(1, 101)
-        ]
-        User.objects.bulk_create(users_list)
-        end_time = time.time()
-        self.stdout.write(f"100명 유저 생성 시간{round(end_time-start_time, 2)}초")
-
-        """3000개의 가계부 더미 데이터 생성
-        """
-        self.stdout.write("1명당 30개의 가계부 생성(100명/3000개)")
-        start_time = time.time()
-        for i in range(1, 101):
-            account_books_list = [
-                AccountBook(
-                    date_at=f"2023-01-{j}",
-                    owner_id=i,
-                )
-                for j in range(1, 31)
+        self.rng = random.Random(options["seed"])
+        self.entries_per_day = options["entries_per_day"]
+        batch_size = options["batch_size"]
+        days = options["days"]
+        try:
+            start_date = datetime.datetime.strptime(options["start_date"], "%Y-%m-%d")
+        except ValueError:
+            raise CommandError("--start-date는 YYYY-MM-DD 형식이어야 합니다.")
+
+        # 단어/문장은 한 번만 만들어 재사용 (행마다 Faker()를 만들지 않음)
+        Faker.seed(options["seed"])
+        fake = Faker()
+        self.words = [fake.word()[:15] for _ in range(500)]
+        self.sentences = [fake.sentence() for _ in range(500)]
+
+        self.expense_category_ids = list(ExpenseCategory.objects.order_by("id").values_list("id", flat=True)) or [None]
+        self.income_category_ids = list(IncomeCategory.objects.order_by("id").values_list("id", flat=True)) or [None]
+
+        # 비밀번호 해시는 한 번만 계산해 모든 유저가 공유
+        password = make_password(options["password"])
+
+        user_id = (User.objects.aggregate(Max("id"))["id__max"] or 0) + 1
+        self.account_book_id = (AccountBook.objects.aggregate(Max("id"))["id__max"] or 0) + 1
+        self.expense_id = (Expense.objects.aggregate(Max("id"))["id__max"] or 0) + 1
+        self.income_id = (Income.objects.aggregate(Max("id"))["id__max"] or 0) + 1
+        if user_id + options["users"] > 1000000:
+            raise CommandError("닉네임 길이 제한으로 유저 id는 999999를 넘을 수 없습니다.")
+
+        self.stdout.write(
+            f"유저 {options['users']}명, 유저당 가계부 {days}개, 가계부당 평균 지출 {self.entries_per_day}개 생성"
+        )
+        phases = {model: [0, 0.0] for model in (User, AccountBook, Expense, Income)}
+        chunk_users = max(1, batch_size // max(1, days * (self.entries_per_day + 1)))
+        end_user_id = user_id + options["users"]
+
+        while user_id < end_user_id:
+            chunk_end = min(user_id + chunk_users, end_user_id)
+            users = [
+                User(id=i, email=f"test{i}@test.com", nickname=f"test{i}", password=password)
+                for i in range(user_id, chunk_end)
             ]
-            AccountBook.objects.bulk_create(account_books_list)
-        end_time = time.time()
-        self.stdout.write(f"100명의 3000개 가계부 생성 시간{round(end_time-start_time, 2)}초")
-
-        """10000개의 지출 데이터 생성
-        """
-        self.stdout.write("10000개의 지출 생성")
-        start_time = time.time()
-        for _ in range(1, 100):
-            expense_list = [
+            account_books, expenses, incomes = [], [], []
+            for user in users:
+                for day in range(days):
+                    self.make_account_book(user.id, start_date + datetime.timedelta(days=day), account_books, expenses, incomes)
+
+            with transaction.atomic():
+                for model, objs in ((User, users), (AccountBook, account_books), (Expense, expenses), (Income, incomes)):
+                    start_time = time.time()
+                    model.objects.bulk_create(objs, batch_size=batch_size)
+                    phases[model][0] += len(objs)
+                    phases[model][1] += time.time() - start_time
+            user_id = chunk_end
+
+        for model, (rows, seconds) in phases.items():
+            rate = round(rows / seconds) if seconds else rows
+            self.stdout.write(f"{model.__name__} {rows}개 생성 시간 {round(seconds, 2)}초 ({rate} rows/s)")
+
+    def make_account_book(self, owner_id, date_at, account_books, expenses, incomes):
+        """하루치 가계부와 지출/수익 내역을 만들고 일 총 금액을 함께 계산합니다."""
+        rng = self.rng
+        account_book_id = self.account_book_id
+        self.account_book_id += 1
+        day_total_money = 0
+
+        # 지출: 하루 0 ~ 2 * 평균 건, 금액은 소액이 많은 로그정규 분포 (100원 단위)
+        for _ in range(rng.randint(0, 2 * self.entries_per_day)):
+            money = min(max(int(rng.lognormvariate(9.5, 1.0)) // 100 * 100, 1000), 2000000)
+            day_total_money -= money
+            expenses.append(
                 Expense(
-                    money=random.randint(10000, 1000000),
-                    expense_detail=Faker().word(),
-                    memo=Faker().sentence(),
-                    owner_id=random.randint(1, 100),
-                    account_book_id=random.randint(1, 3000),
-                    category_id=random.randint(1, 62),
+                    id=self.expense_id,
+                    money=money,
+                    expense_detail=rng.choice(self.words),
+                    payment_method=rng.choice(("현금", "카드", "카드")),
+                    memo=rng.choice(self.sentences),
+                    owner_id=owner_id,
+                    account_book_id=account_book_id,
+                    category_id=rng.choice(self.expense_category_ids),
                 )
-                for _ in range(1, 100)
-            ]
-            Expense.objects.bulk_create(expense_list)
-        self.stdout.write(f"10000개의 지출 생성 시간{round(end_time-start_time, 2)}초")
-
-        """10000개의 수익 데이터 생성
-        """
-        self.stdout.write("10000개의 수익 생성")
-        for _ in range(1, 100):
-            income_list = [
+            )
+            self.expense_id += 1
+
+        # 수익: 매월 25일 급여, 그 외에는 가끔 소액 수익
+        if date_at.day == 25:
+            money = rng.randint(250, 500) * 10000
+        elif rng.random() < 0.05:
+            money = rng.randint(1, 100) * 1000
+        else:
+            money = 0
+        if money:
+            day_total_money += money
+            incomes.append(
                 Income(
-                    money=random.randint(10000, 1000000),
-                    income_detail=Faker().word(),
-                    memo=Faker().sentence(),
-                    owner_id=random.randint(1, 100),
-                    account_book_id=random.randint(1, 3000),
-                    category_id=random.randint(1, 7),
+                    id=self.income_id,
+                    money=money,
+                    income_detail=rng.choice(self.words),
+                    payment_method="현금",
+                    memo=rng.choice(self.sentences),
+                    owner_id=owner_id,
+                    account_book_id=account_book_id,
+                    category_id=rng.choice(self.income_category_ids),
                 )
-                for _ in range(1, 100)
-            ]
-            Income.objects.bulk_create(income_list)
-        end_time = time.time()
-        self.stdout.write(f"10000개의 수익 생성 시간{round(end_time-start_time, 2)}초")
+            )
+            self.income_id += 1
+
+        account_books.append(
+            AccountBook(id=account_book_id, date_at=date_at, day_total_money=day_total_money, owner_id=owner_id)
+        )
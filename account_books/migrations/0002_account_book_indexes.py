@@ -0,0 +1,20 @@
+# Generated by Django 4.1.5 on 2023-02-20 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account_books", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="accountbook",
+            index=models.Index(fields=["owner", "date_at"], name="account_book_owner_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="accountbook",
+            index=models.Index(fields=["date_at"], name="account_book_date_idx"),
+        ),
+    ]
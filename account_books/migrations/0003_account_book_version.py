@@ -0,0 +1,29 @@
+# Generated by Django 4.1.5 on 2023-02-24 10:00
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account_books", "0002_account_book_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="accountbook",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name="생성일"),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="accountbook",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="수정일"),
+        ),
+        migrations.AddField(
+            model_name="accountbook",
+            name="version",
+            field=models.PositiveIntegerField(default=0, verbose_name="버전"),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.1.5 on 2023-02-27 10:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("account_books", "0003_account_book_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("object_type", models.CharField(choices=[("account_book", "가계부"), ("expense", "지출"), ("income", "수익")], max_length=12, verbose_name="종류")),
+                ("object_id", models.BigIntegerField(verbose_name="id")),
+                ("deleted_at", models.DateTimeField(auto_now_add=True, verbose_name="삭제일")),
+            ],
+            options={
+                "db_table": "Tombstone",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="accountbook",
+            index=models.Index(fields=["owner", "updated_at", "id"], name="account_book_owner_sync_idx"),
+        ),
+        migrations.AddField(
+            model_name="tombstone",
+            name="owner",
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="tombstones", to=settings.AUTH_USER_MODEL, verbose_name="유저"),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(fields=["owner", "deleted_at", "id"], name="tombstone_owner_sync_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(fields=["deleted_at"], name="tombstone_deleted_at_idx"),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.1.5 on 2023-02-28 10:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("account_books", "0004_tombstone_sync_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IdempotencyKey",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="생성일")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="수정일")),
+                ("key", models.CharField(max_length=255, verbose_name="키")),
+                ("fingerprint", models.CharField(max_length=32, verbose_name="요청 hash")),
+                ("status_code", models.PositiveSmallIntegerField(verbose_name="응답 상태 코드")),
+                ("content", models.BinaryField(verbose_name="응답")),
+                ("owner", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="idempotency_keys", to=settings.AUTH_USER_MODEL, verbose_name="유저")),
+            ],
+            options={
+                "db_table": "IdempotencyKey",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="idempotencykey",
+            index=models.Index(fields=["created_at"], name="idempotency_key_created_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="idempotencykey",
+            constraint=models.UniqueConstraint(fields=("owner", "key"), name="idempotency_key_owner_key_unique"),
+        ),
+    ]
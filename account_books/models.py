@@ -1,23 +1,116 @@
 from django.db import models
 
+# payhere
+from payhere.cache import bump_user_version
 
-class AccountBook(models.Model):
+
+class TimeStampModel(models.Model):
+    created_at = models.DateTimeField("생성일", auto_now_add=True)
+    updated_at = models.DateTimeField("수정일", auto_now=True)
+
+    class Meta:
+        abstract = True
+
+
+class AccountBook(TimeStampModel):
     date_at = models.DateTimeField("날짜")
     day_total_money = models.IntegerField("일 총 금액", default=0)
+    # 가계부나 지출/수익 내역이 바뀔 때마다 올라가는 값 (조건부 조회 ETag)
+    version = models.PositiveIntegerField("버전", default=0)
 
     owner = models.ForeignKey("users.User", verbose_name="유저", on_delete=models.CASCADE, related_name="account_books",)
 
     class Meta:
         db_table = "AccountBook"
         ordering = ["-date_at"]
+        indexes = [
+            # 월간 조회 (owner, 기간, 날짜 정렬)
+            models.Index(fields=["owner", "date_at"], name="account_book_owner_date_idx"),
+            # 일별 조회 (날짜)
+            models.Index(fields=["date_at"], name="account_book_date_idx"),
+            # 동기화 조회 (owner, 수정일, id 순 keyset)
+            models.Index(fields=["owner", "updated_at", "id"], name="account_book_owner_sync_idx"),
+        ]
 
     def __str__(self):
         return f"{self.date_at}/[일 총 금액:{self.day_total_money}]"
 
+    @classmethod
+    def lock(cls, ids):
+        """가계부들을 id 순으로 select_for_update 하여 {id: 가계부}로 반환합니다.
 
-class TimeStampModel(models.Model):
-    created_at = models.DateTimeField("생성일", auto_now_add=True)
-    updated_at = models.DateTimeField("수정일", auto_now=True)
+        여러 가계부를 잠글 때는 항상 이 함수로 id 순으로 잠가, 서로 반대 순서로 잠그는 요청끼리 교착되지 않도록 합니다.
+        (in_bulk는 정렬을 지우므로 사용하지 않음)
+        """
+        return {account_book.id: account_book for account_book in cls.objects.select_for_update().filter(id__in=ids).order_by("id")}
+
+    def touch(self, update_fields=()):
+        """version을 올려 update_fields와 함께 저장합니다.
+
+        select_for_update로 잠근 가계부에서 지출/수익 내역을 바꿀 때 호출하며, 사용자 응답 캐시도 무효화합니다.
+        """
+        self.version += 1
+        self.save(update_fields=[*update_fields, "version", "updated_at"])
+        bump_user_version(self.owner_id)
+
+
+class Tombstone(models.Model):
+    """삭제된 가계부, 지출/수익 내역
+
+    동기화 API(account-books/sync/)에서 삭제된 내역을 알려주기 위해 삭제할 때 남기며 (account_books.signals),
+    SYNC_TOMBSTONE_RETENTION_DAYS일이 지나면 prune_tombstones 명령으로 지웁니다.
+    """
+
+    OBJECT_TYPE = (
+        ("account_book", "가계부"),
+        ("expense", "지출"),
+        ("income", "수익"),
+    )
+
+    object_type = models.CharField("종류", max_length=12, choices=OBJECT_TYPE)
+    object_id = models.BigIntegerField("id")
+    deleted_at = models.DateTimeField("삭제일", auto_now_add=True)
+
+    owner = models.ForeignKey("users.User", verbose_name="유저", on_delete=models.CASCADE, related_name="tombstones",)
 
     class Meta:
-        abstract = True
+        db_table = "Tombstone"
+        indexes = [
+            # 동기화 조회 (owner, 삭제일, id 순 keyset)
+            models.Index(fields=["owner", "deleted_at", "id"], name="tombstone_owner_sync_idx"),
+            # 보관 기간이 지난 기록 삭제
+            models.Index(fields=["deleted_at"], name="tombstone_deleted_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"[{self.deleted_at}]{self.object_type}/{self.object_id}"
+
+
+class IdempotencyKey(TimeStampModel):
+    """Idempotency-Key 헤더로 받은 키와 첫 응답
+
+    같은 키로 다시 요청하면 저장한 응답을 그대로 반환해 재시도로 내역이 중복 생성되지 않도록 하며 (payhere.idempotency),
+    IDEMPOTENCY_KEY_TTL_HOURS시간이 지나면 prune_idempotency_keys 명령으로 지웁니다.
+    """
+
+    key = models.CharField("키", max_length=255)
+    # 같은 키로 다른 요청(method, 경로, 본문)을 보냈는지 확인합니다.
+    fingerprint = models.CharField("요청 hash", max_length=32)
+    status_code = models.PositiveSmallIntegerField("응답 상태 코드")
+    content = models.BinaryField("응답")
+
+    owner = models.ForeignKey("users.User", verbose_name="유저", on_delete=models.CASCADE, related_name="idempotency_keys",)
+
+    class Meta:
+        db_table = "IdempotencyKey"
+        constraints = [
+            # 조회 (owner, key) / 동시에 같은 키로 요청하면 하나만 저장
+            models.UniqueConstraint(fields=["owner", "key"], name="idempotency_key_owner_key_unique"),
+        ]
+        indexes = [
+            # 보관 기간이 지난 키 삭제
+            models.Index(fields=["created_at"], name="idempotency_key_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"[{self.created_at}]{self.key}"
@@ -2,8 +2,12 @@
 from rest_framework import serializers
 
 # django
+from django.conf import settings
 from django.utils.dateformat import DateFormat
 
+# payhere
+from payhere.utils import FormatUtil
+
 # apps
 from .models import AccountBook
 from expenses.serializers import ExpenseListSerializer
@@ -28,6 +32,24 @@ class AccountBookListSerializer(serializers.ModelSerializer):
     def get_day_total_money(self, obj):
         return format(obj.day_total_money, ",")
 
+    @staticmethod
+    def values(queryset):
+        """필요한 컬럼만 values_list로 조회해 serializer.data와 같은 list를 반환합니다."""
+        money, date = FormatUtil.money, FormatUtil.date
+        return [
+            {"id": id, "date_at": date(date_at), "day_total_money": money(day_total_money)}
+            for id, date_at, day_total_money in queryset.values_list("id", "date_at", "day_total_money")
+        ]
+
+    @staticmethod
+    async def avalues(queryset):
+        """values의 async 버전 (async ORM으로 조회합니다.)"""
+        money, date = FormatUtil.money, FormatUtil.date
+        return [
+            {"id": id, "date_at": date(date_at), "day_total_money": money(day_total_money)}
+            async for id, date_at, day_total_money in queryset.values_list("id", "date_at", "day_total_money")
+        ]
+
 
 class AccountBookDetailSerializer(serializers.ModelSerializer):
     date_at = serializers.SerializerMethodField()
@@ -79,3 +101,41 @@ class AccountBookCreateSerializer(serializers.ModelSerializer):
             pass
 
         return data
+
+    def update(self, instance, validated_data):
+        # 입력받은 필드만 저장합니다. (일 총 금액은 지출/수익 내역 변경에서만 반영)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, "updated_at"])
+        return instance
+
+
+class AccountBookBatchOperationSerializer(serializers.Serializer):
+    """일괄 처리할 작업 하나
+
+    op: create, update, delete / type: account_book, expense, income
+    id: 수정/삭제할 객체 id, account_book_id: 지출/수익 내역을 생성할 가계부 id
+    data: 각 생성/수정 API와 같은 입력값
+    """
+
+    op = serializers.ChoiceField(choices=("create", "update", "delete"))
+    type = serializers.ChoiceField(choices=("account_book", "expense", "income"))
+    id = serializers.IntegerField(required=False)
+    account_book_id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False, default=dict)
+
+    def validate(self, data):
+        if data["op"] != "create" and "id" not in data:
+            raise serializers.ValidationError(detail={"id": "수정/삭제할 id를 입력해주세요."})
+        if data["op"] == "create" and data["type"] != "account_book" and "account_book_id" not in data:
+            raise serializers.ValidationError(detail={"account_book_id": "가계부 id를 입력해주세요."})
+        return data
+
+
+class AccountBookBatchSerializer(serializers.Serializer):
+    operations = serializers.ListField(child=AccountBookBatchOperationSerializer(), allow_empty=False)
+
+    def validate_operations(self, value):
+        if len(value) > settings.BATCH_MAX_OPERATIONS:
+            raise serializers.ValidationError(f"한 번에 {settings.BATCH_MAX_OPERATIONS}개까지 처리할 수 있습니다.")
+        return value
@@ -0,0 +1,50 @@
+# django
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, pre_delete
+
+# apps
+from .models import AccountBook, Tombstone
+from expenses.models import Expense
+from incomes.models import Income
+from users.models import User
+
+
+OBJECT_TYPES = {
+    AccountBook: "account_book",
+    Expense: "expense",
+    Income: "income",
+}
+
+
+def create_tombstone(sender, instance, origin=None, **kwargs):
+    """지출/수익 내역이 삭제되면 동기화 API에서 알려줄 Tombstone을 남깁니다.
+
+    가계부와 함께 삭제되는 내역은 create_account_book_tombstones에서 한 번에 남기며, 유저를 삭제할 때는 남기지 않습니다.
+    """
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if issubclass(origin_model, (User, AccountBook)):
+        return
+    Tombstone.objects.create(object_type=OBJECT_TYPES[sender], object_id=instance.id, owner_id=instance.owner_id)
+
+
+def create_account_book_tombstones(sender, instance, origin=None, **kwargs):
+    """가계부가 삭제되기 전에 가계부와 함께 삭제될 지출/수익 내역의 Tombstone을 bulk_create 한 번으로 남깁니다.
+
+    내역마다 INSERT 하지 않도록 내역 id는 종류별로 한 번씩 조회합니다. (유저를 삭제할 때는 남기지 않음)
+    """
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if issubclass(origin_model, User):
+        return
+    tombstones = [Tombstone(object_type="account_book", object_id=instance.id, owner_id=instance.owner_id)]
+    for model in (Expense, Income):
+        tombstones += [
+            Tombstone(object_type=OBJECT_TYPES[model], object_id=id, owner_id=owner_id)
+            for id, owner_id in model.objects.filter(account_book=instance).values_list("id", "owner_id")
+        ]
+    Tombstone.objects.bulk_create(tombstones)
+
+
+def connect():
+    pre_delete.connect(create_account_book_tombstones, sender=AccountBook, dispatch_uid="tombstone:account_book")
+    for model in (Expense, Income):
+        post_delete.connect(create_tombstone, sender=model, dispatch_uid=f"tombstone:{model._meta.label}")
@@ -1,12 +1,39 @@
 # rest_framework
 from rest_framework.test import APITestCase
+from rest_framework.renderers import JSONRenderer
 
 # django
 from django.urls import reverse
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.core.management import call_command, CommandError
+from django.db.models import F
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# asgiref
+from asgiref.sync import sync_to_async
+
+# python
+import os
+import json
+import base64
+import tempfile
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
 # apps
-from .models import AccountBook
+from .models import AccountBook, Tombstone, IdempotencyKey
+from .serializers import AccountBookListSerializer
+from .management.commands.bench_api import Command as BenchApiCommand
 from users.models import User
+from expenses.models import Expense, ExpenseCategory
+from incomes.models import Income
+from payhere.db import get_executor, run_concurrently
+from payhere.utils import CursorUtil
 
 
 
@@ -142,10 +169,10 @@ class AccountBookAPIViewTestCase(APITestCase):
 
 
 class AccountBookDetailAPIViewTestCase(APITestCase):
-    """AccountBookDetailView의 API를 검증하는 클래스 (14개)
+    """AccountBookDetailView의 API를 검증하는 클래스 (15개)
     get method case: 4개
     put method case: 6개
-    delete method case: 4개
+    delete method case: 5개
     """
     @classmethod
     def setUpTestData(cls):
@@ -206,14 +233,19 @@ class AccountBookDetailAPIViewTestCase(APITestCase):
     def test_account_book_detail_put_success(self):
         """
         AccountBookDetailView의 put 함수를 겸증하는 함수
-        case: 성공
+        case: 성공(입력받은 필드와 version만 저장)
         """
-        response = self.client.put(
-            path=reverse("account-book-detail", kwargs={"account_book_id": "1"}),
-            HTTP_AUTHORIZATION=f"Bearer {self.user_access_token}",
-            data={"date_at": "2023-02-06"},
-        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put(
+                path=reverse("account-book-detail", kwargs={"account_book_id": "1"}),
+                HTTP_AUTHORIZATION=f"Bearer {self.user_access_token}",
+                data={"date_at": "2023-02-06"},
+            )
         self.assertEqual(response.status_code, 200)
+        updates = [query["sql"] for query in queries.captured_queries if query["sql"].startswith('UPDATE "AccountBook"')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn("day_total_money", updates[0])
+        self.assertEqual(AccountBook.objects.get(id=1).version, 1)
 
     def test_account_book_detail_put_unique_fail(self):
         """
@@ -285,6 +317,25 @@ class AccountBookDetailAPIViewTestCase(APITestCase):
         )
         self.assertEqual(response.status_code, 204)
 
+    def test_account_book_detail_delete_entries_success(self):
+        """
+        AccountBookDetailView의 delete 함수를 겸증하는 함수
+        case: 성공(함께 삭제되는 내역이 NPLUSONE_THRESHOLD개보다 많아도 삭제 기록은 bulk_create 한 번으로 남김)
+        """
+        count = settings.NPLUSONE_THRESHOLD * 4
+        Expense.objects.bulk_create([Expense(money=1000, owner=self.user, account_book_id=1) for _ in range(count)])
+        Income.objects.bulk_create([Income(money=1000, owner=self.user, account_book_id=1) for _ in range(count)])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(
+                path=reverse("account-book-detail", kwargs={"account_book_id": "1"}),
+                HTTP_AUTHORIZATION=f"Bearer {self.user_access_token}",
+            )
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(Tombstone.objects.count(), 1 + count * 2)
+        inserts = [query for query in queries.captured_queries if query["sql"].startswith('INSERT INTO "Tombstone"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertLessEqual(len(queries.captured_queries), 15)
+
     def test_account_book_detail_delete_anonymous_fail(self):
         """
         AccountBookDetailView의 delete 함수를 겸증하는 함수
@@ -316,3 +367,893 @@ class AccountBookDetailAPIViewTestCase(APITestCase):
             HTTP_AUTHORIZATION=f"Bearer {self.user_access_token}",
         )
         self.assertEqual(response.status_code, 404)
+
+
+class AccountBookConditionalGetTestCase(APITestCase):
+    """AccountBookView, AccountBookDetailView의 ETag 조건부 조회를 검증하는 클래스 (5개)
+    get method case: 5개
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test1234@test.com", "test1234", "Test1234!")
+        cls.account_book = AccountBook.objects.create(date_at="2023-02-01", owner=cls.user)
+        AccountBook.objects.create(date_at="2023-02-02", owner=cls.user)
+        cls.expense = Expense.objects.create(money=3000, expense_detail="점심", owner=cls.user, account_book=cls.account_book)
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+        self.month_path = f"{reverse('account-book')}?date=2023-02"
+        self.detail_path = reverse("account-book-detail", kwargs={"account_book_id": self.account_book.id})
+
+    def test_month_not_modified(self):
+        """
+        AccountBookView의 get 함수를 겸증하는 함수
+        case: 성공(ETag가 같으면 목록 조회 없이 304)
+        """
+        etag = self.client.get(self.month_path)["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.month_path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(len(queries), 1)
+
+    def test_month_modified(self):
+        """
+        AccountBookView의 get 함수를 겸증하는 함수
+        case: 성공(지출 생성, 가계부 생성/삭제 후에는 ETag가 바뀌어 200 / 같은 내용이면 같은 ETag)
+        """
+        etags = [self.client.get(self.month_path)["ETag"]]
+        self.client.post(
+            reverse("expense-create", kwargs={"account_book_id": self.account_book.id}),
+            {"money": 1000, "payment_method": "현금"},
+        )
+        etags.append(self.client.get(self.month_path)["ETag"])
+        self.client.post(reverse("account-book"), {"date_at": "2023-02-03"})
+        etags.append(self.client.get(self.month_path)["ETag"])
+        AccountBook.objects.filter(date_at="2023-02-03").delete()
+        response = self.client.get(self.month_path, HTTP_IF_NONE_MATCH=etags[-1])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(set(etags)), 3)
+        self.assertEqual(response["ETag"], etags[1])
+
+    def test_detail_not_modified(self):
+        """
+        AccountBookDetailView의 get 함수를 겸증하는 함수
+        case: 성공(ETag가 같으면 지출/수익 내역 조회 없이 304)
+        """
+        response = self.client.get(self.detail_path)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        with CaptureQueriesContext(connection) as queries:
+            not_modified = self.client.get(self.detail_path, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(len(queries), 1)
+
+    def test_detail_modified(self):
+        """
+        AccountBookDetailView의 get 함수를 겸증하는 함수
+        case: 성공(금액이 같은 지출 수정 후에도 ETag가 바뀌어 200)
+        """
+        etag = self.client.get(self.detail_path)["ETag"]
+        self.client.put(reverse("expense-detail", kwargs={"expense_id": self.expense.id}), {"memo": "메모"})
+        response = self.client.get(self.detail_path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["expenses"][0]["money"], "3,000")
+
+    def test_version_bumped(self):
+        """
+        가계부 수정, reconcile_balances 명령어가 version을 올리는지 검증하는 함수
+        """
+        self.client.put(self.detail_path, {"date_at": "2023-02-05"})
+        self.account_book.refresh_from_db()
+        self.assertEqual(self.account_book.version, 1)
+
+        call_command("reconcile_balances", stdout=StringIO())
+        self.account_book.refresh_from_db()
+        self.assertEqual(self.account_book.version, 2)
+
+class AccountBookAsyncViewTestCase(APITestCase):
+    """AccountBookAsyncView를 검증하는 클래스 (3개)
+    get method case: 3개
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test1234@test.com", "test1234", "Test1234!")
+        cls.account_book = AccountBook.objects.create(date_at="2023-02-01", day_total_money=-3000, owner=cls.user)
+        AccountBook.objects.create(date_at="2023-02-02", owner=cls.user)
+
+    def setUp(self):
+        access = self.client.post(reverse("auth-signin"), {"email": "test1234@test.com", "password": "Test1234!"}).json()["access"]
+        self.headers = {"AUTHORIZATION": f"Bearer {access}"}
+        self.path = f"{reverse('account-book-async')}?date=2023-02"
+
+    async def test_account_book_async_success(self):
+        """
+        AccountBookAsyncView의 get 함수를 겸증하는 함수
+        case: 성공(AccountBookView와 같은 응답, ETag)
+        """
+        response = await self.async_client.get(self.path, **self.headers)
+        sync_response = await sync_to_async(self.client.get)(
+            f"{reverse('account-book')}?date=2023-02", HTTP_AUTHORIZATION=self.headers["AUTHORIZATION"]
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), sync_response.json())
+        self.assertEqual(response["ETag"], sync_response["ETag"])
+
+    async def test_account_book_async_not_modified(self):
+        """
+        AccountBookAsyncView의 get 함수를 겸증하는 함수
+        case: 성공(ETag가 같으면 304)
+        """
+        etag = (await self.async_client.get(self.path, **self.headers))["ETag"]
+        response = await self.async_client.get(self.path, **self.headers, **{"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_account_book_async_fail(self):
+        """
+        AccountBookAsyncView의 get 함수를 겸증하는 함수
+        case: 실패(비회원일 때, 가계부가 없을 때, 매개변수를 잘못 입력했을 때)
+        """
+        response = await self.async_client.get(self.path)
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("detail", response.json())
+        response = await self.async_client.get(f"{reverse('account-book-async')}?date=2023-03", **self.headers)
+        self.assertEqual(response.status_code, 404)
+        response = await self.async_client.get(f"{reverse('account-book-async')}?date=2023", **self.headers)
+        self.assertEqual(response.status_code, 400)
+
+
+class AccountBookDashboardAPIViewTestCase(APITestCase):
+    """AccountBookDashboardView를 검증하는 클래스 (4개)
+    get method case: 4개
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test1234@test.com", "test1234", "Test1234!")
+        cls.other_user = User.objects.create_user("other1234@test.com", "other1234", "Test1234!")
+        cls.account_book = AccountBook.objects.create(date_at="2023-02-01", day_total_money=-1000, owner=cls.user)
+        AccountBook.objects.create(date_at="2023-02-02", owner=cls.user)
+        Expense.objects.create(money=3000, owner=cls.user, account_book=cls.account_book)
+        Income.objects.create(money=2000, owner=cls.user, account_book=cls.account_book)
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+        self.path = f"{reverse('account-book-dashboard')}?date=2023-02"
+
+    def test_dashboard_success(self):
+        """
+        AccountBookDashboardView의 get 함수를 겸증하는 함수
+        case: 성공(월간 가계부, 지출/수익 통계, 순현금흐름)
+        """
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            "account_books": self.client.get(f"{reverse('account-book')}?date=2023-02").json(),
+            "expense_category_data": {"없음": {"amount": "3000"}},
+            "income_category_data": {"없음": {"amount": "2000"}},
+            "total_income": "2000",
+            "total_expense": "3000",
+            "net_cash_flow": "-1000",
+        })
+
+    def test_dashboard_not_found_fail(self):
+        """
+        AccountBookDashboardView의 get 함수를 겸증하는 함수
+        case: 실패(해당 월에 가계부가 없을 때, 다른 회원일 때)
+        """
+        self.assertEqual(self.client.get(f"{reverse('account-book-dashboard')}?date=2023-03").status_code, 404)
+        self.client.force_authenticate(user=self.other_user)
+        self.assertEqual(self.client.get(self.path).status_code, 404)
+
+    def test_dashboard_param_fail(self):
+        """
+        AccountBookDashboardView의 get 함수를 겸증하는 함수
+        case: 실패(매개변수를 잘못 입력했을 때, 비회원일 때)
+        """
+        self.assertEqual(self.client.get(f"{reverse('account-book-dashboard')}?date=2023").status_code, 400)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(self.path).status_code, 401)
+
+    @override_settings(DB_PARALLEL_WORKERS=2)
+    def test_run_concurrently(self):
+        """
+        run_concurrently 함수를 겸증하는 함수
+        case: 성공(트랜잭션 밖에서는 스레드 풀에서 동시에 실행, 결과 순서 유지, 예외 전달, DB_PARALLEL_WORKERS별 스레드 풀)
+        """
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait(value):
+            # 두 함수가 동시에 실행되어야 barrier를 통과합니다.
+            barrier.wait()
+            return value, threading.current_thread().name
+
+        with mock.patch.object(connection, "in_atomic_block", False):
+            results = run_concurrently(lambda: wait(1), lambda: wait(2))
+            self.assertEqual([value for value, _ in results], [1, 2])
+            self.assertTrue(all(name.startswith("payhere-db") for _, name in results))
+            with self.assertRaises(ZeroDivisionError):
+                run_concurrently(lambda: 1, lambda: 1 / 0)
+
+        self.assertEqual(run_concurrently(lambda: threading.current_thread().name), [threading.current_thread().name])
+
+        self.assertEqual(get_executor()._max_workers, 2)
+        with override_settings(DB_PARALLEL_WORKERS=3):
+            self.assertEqual(get_executor()._max_workers, 3)
+
+
+class AccountBookBatchAPIViewTestCase(APITestCase):
+    """AccountBookBatchView를 검증하는 클래스 (7개)
+    post method case: 7개
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test1234@test.com", "test1234", "Test1234!")
+        cls.other_user = User.objects.create_user("other1234@test.com", "other1234", "Test1234!")
+        cls.account_book = AccountBook.objects.create(date_at="2023-02-01", day_total_money=-1000, owner=cls.user)
+        cls.other_account_book = AccountBook.objects.create(date_at="2023-02-02", owner=cls.user)
+        cls.expense = Expense.objects.create(money=3000, owner=cls.user, account_book=cls.account_book)
+        cls.income = Income.objects.create(money=2000, owner=cls.user, account_book=cls.account_book)
+        cls.other_user_account_book = AccountBook.objects.create(date_at="2023-02-01", owner=cls.other_user)
+        cls.other_user_expense = Expense.objects.create(money=500, owner=cls.other_user, account_book=cls.other_user_account_book)
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+        self.path = reverse("account-book-batch")
+
+    def post(self, operations):
+        return self.client.post(self.path, {"operations": operations}, format="json")
+
+    def test_batch_success(self):
+        """
+        AccountBookBatchView의 post 함수를 겸증하는 함수
+        case: 성공(순서대로 처리, 작업별 결과, 가계부별 일 총 금액 update와 version은 한 번만)
+        """
+        operations = [
+            {"op": "create", "type": "expense", "account_book_id": self.account_book.id, "data": {"money": 1000}},
+            {"op": "create", "type": "expense", "account_book_id": self.account_book.id, "data": {"money": 500}},
+            {"op": "update", "type": "expense", "id": self.expense.id, "data": {"money": 4000, "memo": "수정"}},
+            {"op": "update", "type": "income", "id": self.income.id, "data": {"memo": "수정"}},
+            {"op": "delete", "type": "income", "id": self.income.id},
+            {"op": "create", "type": "account_book", "data": {"date_at": "2023-02-03"}},
+        ]
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as queries:
+            response = self.post(operations)
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([result["status"] for result in results], [201, 201, 200, 200, 204, 201])
+        self.assertEqual(results[2], {"status": 200, "id": self.expense.id, "data": {
+            "money": 4000, "expense_detail": None, "payment_method": "현금", "memo": "수정", "category": None,
+        }})
+        self.assertEqual(results[4], {"status": 204, "id": self.income.id})
+        self.assertTrue(AccountBook.objects.filter(id=results[5]["id"], date_at__date="2023-02-03").exists())
+
+        # -1000 - 1000 - 500 - (4000 - 3000) - 2000
+        self.account_book.refresh_from_db()
+        self.assertEqual(self.account_book.day_total_money, -5500)
+        self.assertEqual(self.account_book.version, 1)
+        self.assertEqual(Expense.objects.filter(account_book=self.account_book).count(), 3)
+        self.assertFalse(Income.objects.filter(id=self.income.id).exists())
+        updates = [query for query in queries.captured_queries if query["sql"].startswith('UPDATE "AccountBook"')]
+        self.assertEqual(len(updates), 1)
+
+    def test_batch_move_success(self):
+        """
+        AccountBookBatchView의 post 함수를 겸증하는 함수
+        case: 성공(다른 일자로 이동, 가계부 수정, 가계부 삭제 후 함께 삭제된 내역은 찾을 수 없음)
+        """
+        response = self.post([
+            {"op": "update", "type": "expense", "id": self.expense.id, "data": {"account_book": self.other_account_book.id}},
+            {"op": "update", "type": "account_book", "id": self.other_account_book.id, "data": {"date_at": "2023-02-05"}},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.account_book.refresh_from_db()
+        self.other_account_book.refresh_from_db()
+        self.assertEqual((self.account_book.day_total_money, self.account_book.version), (2000, 1))
+        self.assertEqual((self.other_account_book.day_total_money, self.other_account_book.version), (-3000, 1))
+        self.assertEqual(self.other_account_book.date_at.day, 5)
+
+        response = self.post([
+            {"op": "delete", "type": "account_book", "id": self.account_book.id},
+            {"op": "delete", "type": "income", "id": self.income.id},
+        ])
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()["index"], 1)
+        self.assertTrue(AccountBook.objects.filter(id=self.account_book.id).exists())
+
+    def test_batch_lock_order_success(self):
+        """
+        AccountBookBatchView의 post 함수를 겸증하는 함수
+        case: 성공(작업에 쓰이는 가계부를 내역보다 먼저 id 순으로 한 번에 잠금)
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post([
+                {"op": "update", "type": "expense", "id": self.expense.id, "data": {"account_book": self.other_account_book.id}},
+                {"op": "create", "type": "income", "account_book_id": self.account_book.id, "data": {"money": 100}},
+            ])
+        self.assertEqual(response.status_code, 200)
+        selects = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("SELECT")]
+        account_book_selects = [index for index, sql in enumerate(selects) if 'FROM "AccountBook"' in sql]
+        # 가계부 일자 이동 입력값 검증 조회는 잠그지 않음
+        lock = selects[account_book_selects[0]]
+        self.assertIn(f'IN ({self.account_book.id}, {self.other_account_book.id}) ORDER BY "AccountBook"."id" ASC', lock)
+        entry_lock = next(index for index, sql in enumerate(selects) if sql.startswith('SELECT "Expense"."id"'))
+        self.assertLess(account_book_selects[0], entry_lock)
+
+    def test_batch_max_operations_success(self):
+        """
+        AccountBookBatchView의 post 함수를 겸증하는 함수
+        case: 성공(BATCH_MAX_OPERATIONS개 생성도 N+1 검사(raise)에 걸리지 않고 처리)
+        """
+        category = ExpenseCategory.objects.create(name="식비")
+        operations = [
+            {"op": "create", "type": "expense", "account_book_id": self.account_book.id, "data": {"money": 10, "category": category.id}}
+            for _ in range(settings.BATCH_MAX_OPERATIONS - 1)
+        ]
+        operations.append({"op": "update", "type": "expense", "id": self.expense.id, "data": {"category": category.id}})
+        with override_settings(NPLUSONE_MODE="raise"):
+            response = self.post(operations)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Expense.objects.filter(account_book=self.account_book, category=category).count(), settings.BATCH_MAX_OPERATIONS)
+        self.account_book.refresh_from_db()
+        self.assertEqual(self.account_book.day_total_money, -1000 - 10 * (settings.BATCH_MAX_OPERATIONS - 1))
+
+    def test_batch_rollback_fail(self):
+        """
+        AccountBookBatchView의 post 함수를 겸증하는 함수
+        case: 실패(작업 하나가 실패하면 모두 되돌리고 실패한 작업의 index와 에러 반환)
+        """
+        response = self.post([
+            {"op": "create", "type": "income", "account_book_id": self.account_book.id, "data": {"money": 1000}},
+            {"op": "delete", "type": "expense", "id": self.expense.id},
+            {"op": "create", "type": "account_book", "data": {"date_at": "2023-02-01"}},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"index": 2, "errors": {"date_at": ["해당 날짜에 가계부 목록이 존재합니다."]}})
+        self.account_book.refresh_from_db()
+        self.assertEqual((self.account_book.day_total_money, self.account_book.version), (-1000, 0))
+        self.assertTrue(Expense.objects.filter(id=self.expense.id).exists())
+        self.assertEqual(Income.objects.count(), 1)
+
+        response = self.post([{"op": "create", "type": "expense", "account_book_id": self.account_book.id, "data": {"money": "a"}}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"index": 0, "errors": {"money": ["숫자만 입력해주세요."]}})
+
+    def test_batch_permission_fail(self):
+        """
+        AccountBookBatchView의 post 함수를 겸증하는 함수
+        case: 실패(다른 회원의 가계부/내역일 때, 없는 내역일 때)
+        """
+        response = self.post([
+            {"op": "create", "type": "expense", "account_book_id": self.account_book.id, "data": {"money": 1000}},
+            {"op": "update", "type": "expense", "id": self.other_user_expense.id, "data": {"money": 1}},
+        ])
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()["index"], 1)
+        self.assertEqual(Expense.objects.filter(account_book=self.account_book).count(), 1)
+
+        response = self.post([
+            {"op": "create", "type": "income", "account_book_id": self.other_user_account_book.id, "data": {"money": 1}}
+        ])
+        self.assertEqual(response.status_code, 403)
+        response = self.post([{"op": "delete", "type": "expense", "id": 0}])
+        self.assertEqual(response.status_code, 404)
+        self.other_user_expense.refresh_from_db()
+        self.assertEqual(self.other_user_expense.money, 500)
+
+    @override_settings(BATCH_MAX_OPERATIONS=2)
+    def test_batch_input_fail(self):
+        """
+        AccountBookBatchView의 post 함수를 겸증하는 함수
+        case: 실패(작업 목록이 비었거나 너무 많을 때, 잘못된 작업일 때, 비회원일 때)
+        """
+        delete = {"op": "delete", "type": "expense", "id": self.expense.id}
+        self.assertEqual(self.post([]).status_code, 400)
+        self.assertEqual(self.post([delete] * 3).status_code, 400)
+        self.assertEqual(self.post([{"op": "move", "type": "expense", "id": self.expense.id}]).status_code, 400)
+        self.assertEqual(self.post([{"op": "delete", "type": "expense"}]).status_code, 400)
+        self.assertEqual(self.post([{"op": "create", "type": "expense", "data": {"money": 1}}]).status_code, 400)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.post([delete]).status_code, 401)
+        self.assertTrue(Expense.objects.filter(id=self.expense.id).exists())
+
+
+class AccountBookDigestAPIViewTestCase(APITestCase):
+    """AccountBookDigestView를 검증하는 클래스 (4개)
+    get method case: 4개
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test1234@test.com", "test1234", "Test1234!")
+        cls.other_user = User.objects.create_user("other1234@test.com", "other1234", "Test1234!")
+        cls.february = AccountBook.objects.create(date_at="2023-02-01", day_total_money=-1000, owner=cls.user)
+        cls.february_second = AccountBook.objects.create(date_at="2023-02-02", owner=cls.user)
+        cls.april = AccountBook.objects.create(date_at="2023-04-30", owner=cls.user)
+        cls.expense = Expense.objects.create(money=3000, owner=cls.user, account_book=cls.february)
+        cls.income = Income.objects.create(money=2000, owner=cls.user, account_book=cls.february)
+        Expense.objects.create(money=100, owner=cls.user, account_book=cls.april)
+        other_account_book = AccountBook.objects.create(date_at="2023-02-01", owner=cls.other_user)
+        Expense.objects.create(money=500, owner=cls.other_user, account_book=other_account_book)
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+        self.path = reverse("account-book-digest")
+
+    def digest(self, **params):
+        response = self.client.get(self.path, {"start": "2023-01", "end": "2023-12", **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_digest_success(self):
+        """
+        AccountBookDigestView의 get 함수를 겸증하는 함수
+        case: 성공(내역이 있는 월/일별 hash, end 생략 시 한 달)
+        """
+        data = self.digest(days="true")
+        self.assertEqual(list(data["months"]), ["2023-02", "2023-04"])
+        self.assertEqual(list(data["days"]), ["2023-02-01", "2023-02-02", "2023-04-30"])
+        self.assertTrue(all(len(digest) == 16 for digest in [*data["months"].values(), *data["days"].values()]))
+        self.assertEqual(self.digest(), {"months": data["months"]})
+
+        response = self.client.get(self.path, {"start": "2023-04"})
+        self.assertEqual(response.json(), {"months": {"2023-04": data["months"]["2023-04"]}})
+
+    def test_digest_changed_success(self):
+        """
+        AccountBookDigestView의 get 함수를 겸증하는 함수
+        case: 성공(내역을 수정/삭제/이동한 일과 월의 hash만 바뀜, 다른 회원의 내역은 영향 없음)
+        """
+        before = self.digest(days="true")
+        Expense.objects.create(money=1, owner=self.other_user, account_book=AccountBook.objects.get(owner=self.other_user))
+        self.assertEqual(self.digest(days="true"), before)
+
+        self.expense.money = 4000
+        self.expense.save()
+        after = self.digest(days="true")
+        self.assertNotEqual(after["months"]["2023-02"], before["months"]["2023-02"])
+        self.assertNotEqual(after["days"]["2023-02-01"], before["days"]["2023-02-01"])
+        self.assertEqual(after["days"]["2023-02-02"], before["days"]["2023-02-02"])
+        self.assertEqual(after["months"]["2023-04"], before["months"]["2023-04"])
+
+        self.income.delete()
+        self.assertNotEqual(self.digest()["months"]["2023-02"], after["months"]["2023-02"])
+
+        before = self.digest()
+        self.expense.account_book = self.april
+        self.expense.save()
+        after = self.digest()
+        self.assertNotEqual(after["months"]["2023-02"], before["months"]["2023-02"])
+        self.assertNotEqual(after["months"]["2023-04"], before["months"]["2023-04"])
+
+    def test_digest_cache_invalidated_success(self):
+        """
+        AccountBookDigestView의 get 함수를 겸증하는 함수
+        case: 성공(응답 캐시를 사용해도 API로 내역을 바꾸면 새 hash 반환)
+        """
+        with self.settings(RESPONSE_CACHE_TIMEOUT=300), self.captureOnCommitCallbacks(execute=True):
+            before = self.digest()
+            self.assertEqual(self.digest(), before)
+            response = self.client.delete(reverse("expense-detail", kwargs={"expense_id": self.expense.id}))
+            self.assertEqual(response.status_code, 204)
+        with self.settings(RESPONSE_CACHE_TIMEOUT=300):
+            self.assertNotEqual(self.digest()["months"]["2023-02"], before["months"]["2023-02"])
+
+    def test_digest_fail(self):
+        """
+        AccountBookDigestView의 get 함수를 겸증하는 함수
+        case: 실패(매개변수를 잘못 입력했을 때, 종료 월이 잘못되었을 때, 기간이 잘못되었을 때, 비회원일 때)
+        """
+        for params in ({}, {"start": "2023"}, {"start": "2023-13"}, {"start": "2023-02-01"}, {"start": "2023-02", "end": "a"}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(self.path, params).status_code, 400)
+        for end in ("2023-00", "2023-13"):
+            with self.subTest(end=end):
+                response = self.client.get(self.path, {"start": "2023-02", "end": end})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {"message": "올바른 매개변수의 날짜를 입력해주세요.(Ex: YYYY-MM)"})
+        self.assertEqual(self.client.get(self.path, {"start": "2023-03", "end": "2023-02"}).status_code, 400)
+        self.assertEqual(self.client.get(self.path, {"start": "2000-01", "end": "2023-02"}).status_code, 400)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(self.path, {"start": "2023-02"}).status_code, 401)
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class AccountBookSyncAPIViewTestCase(APITestCase):
+    """AccountBookSyncView를 검증하는 클래스 (5개)
+    get method case: 5개
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test1234@test.com", "test1234", "Test1234!")
+        cls.other_user = User.objects.create_user("other1234@test.com", "other1234", "Test1234!")
+        cls.account_book = AccountBook.objects.create(date_at="2023-02-01", day_total_money=-1000, owner=cls.user)
+        cls.expense = Expense.objects.create(money=3000, memo="메모", owner=cls.user, account_book=cls.account_book)
+        cls.income = Income.objects.create(money=2000, owner=cls.user, account_book=cls.account_book)
+        other_account_book = AccountBook.objects.create(date_at="2023-02-01", owner=cls.other_user)
+        Expense.objects.create(money=500, owner=cls.other_user, account_book=other_account_book)
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+        self.path = reverse("account-book-sync")
+
+    def sync(self, cursor=None):
+        response = self.client.get(self.path, {"cursor": cursor} if cursor else {})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_sync_initial_success(self):
+        """
+        AccountBookSyncView의 get 함수를 겸증하는 함수
+        case: 성공(cursor 없이 처음 동기화하면 자신의 전체 내역 반환)
+        """
+        data = self.sync()
+        self.assertEqual([account_book["id"] for account_book in data["account_books"]], [self.account_book.id])
+        self.assertEqual(data["account_books"][0]["date_at"], "2023-02-01")
+        self.assertEqual(data["account_books"][0]["day_total_money"], -1000)
+        expense = data["expenses"][0]
+        self.assertEqual(len(data["expenses"]), 1)
+        self.assertEqual(expense["updated_at"], JSONRenderer().render(self.expense.updated_at).decode().strip('"'))
+        self.assertEqual(
+            {key: value for key, value in expense.items() if key != "updated_at"},
+            {
+                "id": self.expense.id, "account_book_id": self.account_book.id, "money": 3000, "expense_detail": None,
+                "payment_method": "현금", "memo": "메모", "category_id": None,
+            },
+        )
+        self.assertEqual([income["id"] for income in data["incomes"]], [self.income.id])
+        self.assertEqual(data["deleted"], [])
+        self.assertFalse(data["has_more"])
+
+    def test_sync_changes_success(self):
+        """
+        AccountBookSyncView의 get 함수를 겸증하는 함수
+        case: 성공(cursor 이후 바뀐 내역만 반환, 바뀐 내역이 없으면 쿼리 한 번)
+        """
+        cursor = self.sync()["cursor"]
+        with self.assertNumQueries(1):
+            data = self.sync(cursor)
+        self.assertEqual([data[name] for name in ("account_books", "expenses", "incomes", "deleted")], [[], [], [], []])
+
+        self.expense.memo = "수정"
+        self.expense.save()
+        income_id = self.income.id
+        self.income.delete()
+        with override_settings(SYNC_SETTLE_SECONDS=60):
+            # 최근 SYNC_SETTLE_SECONDS초 동안 바뀐 내역은 다음 동기화에서 보냅니다.
+            self.assertEqual(self.sync(data["cursor"])["expenses"], [])
+        data = self.sync(data["cursor"])
+        self.assertEqual([(expense["id"], expense["memo"]) for expense in data["expenses"]], [(self.expense.id, "수정")])
+        self.assertEqual([{"type": deleted["type"], "id": deleted["id"]} for deleted in data["deleted"]], [
+            {"type": "income", "id": income_id},
+        ])
+        self.assertEqual(data["account_books"], [])
+        self.assertEqual(self.sync(data["cursor"])["expenses"], [])
+
+    @override_settings(SYNC_PAGE_SIZE=2)
+    def test_sync_pagination_success(self):
+        """
+        AccountBookSyncView의 get 함수를 겸증하는 함수
+        case: 성공(SYNC_PAGE_SIZE개씩 나누어 빠짐 없이 반환)
+        """
+        expense_ids = [self.expense.id] + [
+            Expense.objects.create(money=i, owner=self.user, account_book=self.account_book).id for i in range(4)
+        ]
+        synced = []
+        data = {"cursor": None, "has_more": True}
+        while data["has_more"]:
+            data = self.sync(data["cursor"])
+            self.assertLessEqual(len(data["expenses"]), 2)
+            synced += [expense["id"] for expense in data["expenses"]]
+        self.assertEqual(synced, expense_ids)
+
+    def test_sync_deleted_success(self):
+        """
+        AccountBookSyncView의 get 함수를 겸증하는 함수
+        case: 성공(가계부를 삭제하면 함께 삭제된 내역도 반환, 유저 삭제 시에는 삭제 기록을 남기지 않음)
+        """
+        cursor = self.sync()["cursor"]
+        response = self.client.delete(reverse("account-book-detail", kwargs={"account_book_id": self.account_book.id}))
+        self.assertEqual(response.status_code, 204)
+        deleted = {(deleted["type"], deleted["id"]) for deleted in self.sync(cursor)["deleted"]}
+        self.assertEqual(deleted, {
+            ("account_book", self.account_book.id), ("expense", self.expense.id), ("income", self.income.id),
+        })
+
+        self.other_user.delete()
+        self.assertEqual(Tombstone.objects.count(), 3)
+
+    def test_sync_fail(self):
+        """
+        AccountBookSyncView의 get 함수를 겸증하는 함수
+        case: 실패(잘못된 cursor일 때, timezone 정보가 USE_TZ와 다른 cursor일 때, 보관 기간이 지난 cursor일 때, 비회원일 때)
+        """
+        self.assertEqual(self.client.get(self.path, {"cursor": "abc"}).status_code, 400)
+        self.assertEqual(self.client.get(self.path, {"cursor": CursorUtil.encode({})}).status_code, 400)
+
+        data = {name: ["2099-01-01T00:00:00+00:00", 0] for name in ("account_books", "expenses", "incomes", "deleted")}
+        cursor = base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+        self.assertEqual(self.client.get(self.path, {"cursor": cursor}).status_code, 400)
+
+        expired_at = timezone.now() - timedelta(days=31)
+        cursor = CursorUtil.encode({name: (expired_at, 0) for name in ("account_books", "expenses", "incomes", "deleted")})
+        self.assertEqual(self.client.get(self.path, {"cursor": cursor}).status_code, 410)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(self.path).status_code, 401)
+
+
+class PruneTombstonesCommandTestCase(TestCase):
+    """prune_tombstones 명령어를 검증하는 클래스 (1개)"""
+
+    def test_prune_tombstones_success(self):
+        """
+        prune_tombstones 명령어를 겸증하는 함수
+        case: 성공(보관 기간이 지난 삭제 기록만 나누어 삭제)
+        """
+        user = User.objects.create_user("test1234@test.com", "test1234", "Test1234!")
+        tombstones = [Tombstone.objects.create(object_type="expense", object_id=i, owner=user) for i in range(5)]
+        Tombstone.objects.filter(id__in=[tombstone.id for tombstone in tombstones[:3]]).update(
+            deleted_at=timezone.now() - timedelta(days=31)
+        )
+        out = StringIO()
+        call_command("prune_tombstones", batch_size=2, stdout=out)
+        self.assertIn("삭제 기록 3개 삭제", out.getvalue())
+        self.assertEqual(list(Tombstone.objects.values_list("object_id", flat=True).order_by("id")), [3, 4])
+
+
+class PruneIdempotencyKeysCommandTestCase(TestCase):
+    """prune_idempotency_keys 명령어를 검증하는 클래스 (1개)"""
+
+    def test_prune_idempotency_keys_success(self):
+        """
+        prune_idempotency_keys 명령어를 겸증하는 함수
+        case: 성공(보관 시간이 지난 키만 삭제)
+        """
+        user = User.objects.create_user("test1234@test.com", "test1234", "Test1234!")
+        for i in range(3):
+            IdempotencyKey.objects.create(key=str(i), fingerprint="", status_code=201, content=b"{}", owner=user)
+        IdempotencyKey.objects.filter(key__in=["0", "1"]).update(created_at=timezone.now() - timedelta(hours=25))
+        out = StringIO()
+        call_command("prune_idempotency_keys", batch_size=1, stdout=out)
+        self.assertIn("Idempotency-Key 2개 삭제", out.getvalue())
+        self.assertEqual(list(IdempotencyKey.objects.values_list("key", flat=True)), ["2"])
+
+
+class ReconcileBalancesCommandTestCase(TestCase):
+    """reconcile_balances 명령어를 검증하는 클래스 (3개)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test1234@test.com", "test1234", "Test1234!")
+        cls.other_user = User.objects.create_user("test1235@test.com", "test12345", "Test1235!")
+        cls.account_books = [
+            AccountBook.objects.create(date_at=f"2023-02-{i}", owner=cls.user, day_total_money=123)
+            for i in range(1, 6)
+        ]
+        cls.other_account_book = AccountBook.objects.create(date_at="2023-02-01", owner=cls.other_user, day_total_money=123)
+        for account_book in cls.account_books[:4] + [cls.other_account_book]:
+            Expense.objects.create(money=1000, owner=account_book.owner, account_book=account_book)
+            Expense.objects.create(money=500, owner=account_book.owner, account_book=account_book)
+        for account_book in cls.account_books[2:]:
+            Income.objects.create(money=3000, owner=account_book.owner, account_book=account_book)
+
+    def test_reconcile_balances_success(self):
+        """
+        reconcile_balances 명령어를 검증하는 함수
+        case: 성공(일 총 금액이 수익 합계 - 지출 합계로 수정)
+        """
+        call_command("reconcile_balances", batch_size=2, stdout=StringIO())
+        totals = [AccountBook.objects.get(id=account_book.id).day_total_money for account_book in self.account_books]
+        self.assertEqual(totals, [-1500, -1500, 1500, 1500, 3000])
+        self.assertEqual(AccountBook.objects.get(id=self.other_account_book.id).day_total_money, -1500)
+
+    def test_reconcile_balances_dry_run_success(self):
+        """
+        reconcile_balances 명령어를 검증하는 함수
+        case: 성공(--dry-run은 수정하지 않음)
+        """
+        out = StringIO()
+        call_command("reconcile_balances", dry_run=True, stdout=out)
+        self.assertIn("불일치 6개, 수정 0개", out.getvalue())
+        self.assertFalse(AccountBook.objects.exclude(day_total_money=123).exists())
+
+    def test_reconcile_balances_owner_success(self):
+        """
+        reconcile_balances 명령어를 검증하는 함수
+        case: 성공(--owner로 지정한 유저만 수정)
+        """
+        call_command("reconcile_balances", owner=[self.other_user.id], stdout=StringIO())
+        self.assertEqual(AccountBook.objects.get(id=self.other_account_book.id).day_total_money, -1500)
+        self.assertEqual(AccountBook.objects.filter(owner=self.user, day_total_money=123).count(), 5)
+
+
+class SeedDumyDataCommandTestCase(TestCase):
+    """seed_dumy_data 명령어를 검증하는 클래스 (3개)"""
+
+    def seed(self, seed=0):
+        call_command("seed_dumy_data", users=3, days=5, entries_per_day=2, seed=seed, stdout=StringIO())
+
+    def test_seed_dumy_data_success(self):
+        """
+        seed_dumy_data 명령어를 검증하는 함수
+        case: 성공(유저/가계부 수, 비밀번호 해시, 본인 가계부에만 내역 생성)
+        """
+        self.seed()
+        self.assertEqual(User.objects.count(), 3)
+        self.assertEqual(AccountBook.objects.count(), 15)
+        self.assertTrue(User.objects.first().check_password("test1234!"))
+        self.assertFalse(Expense.objects.exclude(owner=F("account_book__owner")).exists())
+        self.assertFalse(Income.objects.exclude(owner=F("account_book__owner")).exists())
+
+    def test_seed_dumy_data_total_money_success(self):
+        """
+        seed_dumy_data 명령어를 검증하는 함수
+        case: 성공(일 총 금액이 지출/수익 합계와 일치)
+        """
+        self.seed()
+        out = StringIO()
+        call_command("reconcile_balances", dry_run=True, stdout=out)
+        self.assertIn("불일치 0개", out.getvalue())
+
+    def test_seed_dumy_data_seed_success(self):
+        """
+        seed_dumy_data 명령어를 검증하는 함수
+        case: 성공(같은 시드면 같은 데이터)
+        """
+        self.seed(seed=7)
+        first = list(Expense.objects.order_by("id").values_list("money", "expense_detail", "payment_method"))
+        Expense.objects.all().delete()
+        self.seed(seed=7)
+        second = list(Expense.objects.order_by("id").values_list("money", "expense_detail", "payment_method"))
+        self.assertEqual(first, second)
+
+
+class ProfileRequestCommandTestCase(TestCase):
+    """profile_request 명령어를 검증하는 클래스 (2개)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test@test.com", "test", "Test1234!")
+        AccountBook.objects.create(owner=cls.user, date_at="2023-01-01")
+
+    def test_profile_request_success(self):
+        """
+        profile_request 명령어를 검증하는 함수
+        case: 성공(해당 유저로 요청을 보내고 결과 파일 저장)
+        """
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as output_dir:
+            call_command(
+                "profile_request", f"{reverse('account-book')}?date=2023-01",
+                user=self.user.id, memory=True, output_dir=output_dir, stdout=out,
+            )
+            files = sorted(os.path.splitext(name)[1] for name in os.listdir(output_dir))
+        self.assertIn("-> 200", out.getvalue())
+        self.assertEqual(files, [".collapsed", ".pstats", ".txt"])
+
+    def test_profile_request_user_fail(self):
+        """
+        profile_request 명령어를 검증하는 함수
+        case: 실패(없는 유저)
+        """
+        with self.assertRaises(CommandError):
+            call_command("profile_request", reverse("account-book"), user=0, stdout=StringIO())
+
+
+class BenchApiCommandTestCase(TestCase):
+    """bench_api 명령어를 검증하는 클래스 (1개)"""
+
+    def test_bench_caches_success(self):
+        """
+        get_bench_caches 함수를 검증하는 함수
+        case: 성공(모든 캐시의 KEY_PREFIX를 벤치마크용으로 분리, keepdb가 아니면 실행마다 다른 KEY_PREFIX)
+        """
+        caches = BenchApiCommand().get_bench_caches(keepdb=False)
+        self.assertEqual(caches.keys(), settings.CACHES.keys())
+        for alias, cache in caches.items():
+            self.assertTrue(cache["KEY_PREFIX"].startswith("bench:"))
+            self.assertEqual(cache["LOCATION"], settings.CACHES[alias]["LOCATION"])
+        self.assertNotEqual(caches, BenchApiCommand().get_bench_caches(keepdb=False))
+        self.assertEqual(BenchApiCommand().get_bench_caches(keepdb=True), BenchApiCommand().get_bench_caches(keepdb=True))
+        self.assertNotIn("KEY_PREFIX", settings.CACHES["shared"])
+
+
+class AdviseIndexesCommandTestCase(TestCase):
+    """advise_indexes 명령어를 검증하는 클래스 (3개)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_dumy_data", users=2, days=5, entries_per_day=2, seed=1, stdout=StringIO())
+
+    def advise(self, *queries):
+        out = StringIO()
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", encoding="utf-8", delete=False) as f:
+            for sql, count in queries:
+                f.write(json.dumps({"sql": sql, "count": count}) + "\n")
+        self.addCleanup(os.remove, f.name)
+        call_command("advise_indexes", f.name, stdout=out)
+        return out.getvalue()
+
+    def test_advise_indexes_success(self):
+        """
+        advise_indexes 명령어를 검증하는 함수
+        case: 성공(전체 SCAN 쿼리에 복합 인덱스 후보 제안)
+        """
+        output = self.advise(
+            ('SELECT "Expense"."id" FROM "Expense" WHERE ("Expense"."payment_method" = ? AND "Expense"."money" > ?) '
+             'ORDER BY "Expense"."created_at" DESC', 10),
+        )
+        self.assertIn("Expense 전체 SCAN", output)
+        self.assertIn("1. Expense(payment_method, money", output)
+        self.assertIn('models.Index(fields=["payment_method", "money"', output)
+
+    def test_advise_indexes_no_candidate_success(self):
+        """
+        advise_indexes 명령어를 검증하는 함수
+        case: 성공(인덱스를 사용하는 쿼리는 후보 없음)
+        """
+        output = self.advise(
+            ('SELECT "AccountBook"."id" FROM "AccountBook" WHERE "AccountBook"."date_at" = ?', 3),
+            ('SELECT "Expense"."id" FROM "Expense" WHERE "Expense"."account_book_id" IN (...)', 3),
+        )
+        self.assertIn("문제 있는 쿼리 0개", output)
+        self.assertIn("인덱스 후보가 없습니다.", output)
+
+    def test_advise_indexes_file_fail(self):
+        """
+        advise_indexes 명령어를 검증하는 함수
+        case: 실패(없는 파일)
+        """
+        with self.assertRaises(CommandError):
+            call_command("advise_indexes", "not_exists.jsonl", stdout=StringIO())
+
+
+class AccountBookValuesSerializerTestCase(TestCase):
+    """AccountBookListSerializer의 values와 bench_serializers 명령어를 검증하는 클래스 (2개)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test@test.com", "test", "Test1234!")
+        for date_at, day_total_money in (("2023-01-01", 0), ("2023-01-09 23:59:59", -3000), ("2023-01-31", 1234567)):
+            AccountBook.objects.create(owner=cls.user, date_at=date_at, day_total_money=day_total_money)
+
+    def test_list_values_same_json(self):
+        """
+        AccountBookListSerializer의 values 함수를 검증하는 함수
+        case: 성공(serializer.data와 같은 JSON)
+        """
+        account_books = AccountBook.objects.filter(owner=self.user)
+        data = AccountBookListSerializer(account_books, many=True).data
+        values = AccountBookListSerializer.values(account_books)
+        self.assertEqual(JSONRenderer().render(values), JSONRenderer().render(data))
+
+    def test_bench_serializers_success(self):
+        """
+        bench_serializers 명령어를 검증하는 함수
+        case: 성공(결과가 같고 측정용 데이터는 롤백)
+        """
+        out = StringIO()
+        call_command("bench_serializers", rows=[20], repeat=1, stdout=out)
+        lines = out.getvalue().splitlines()[1:]
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(all(line.endswith("yes") for line in lines))
+        self.assertEqual(AccountBook.objects.count(), 3)
+
+
+class BenchRenderersCommandTestCase(TestCase):
+    """bench_renderers 명령어를 검증하는 클래스 (1개)"""
+
+    def test_bench_renderers_success(self):
+        """
+        bench_renderers 명령어를 검증하는 함수
+        case: 성공(조회 API 응답 결과가 같고 측정용 데이터는 롤백)
+        """
+        out = StringIO()
+        call_command("bench_renderers", days=3, entries_per_day=2, repeat=1, stdout=out)
+        lines = out.getvalue().splitlines()[2:]
+        self.assertTrue(any(line.startswith("account-book ") for line in lines))
+        self.assertTrue(all(line.endswith("yes") for line in lines))
+        self.assertFalse(User.objects.exists())
@@ -8,5 +8,10 @@ from . import views
 urlpatterns = [
     # Account book
     path("", views.AccountBookView.as_view(), name="account-book"),
+    path("async/", views.AccountBookAsyncView.as_view(), name="account-book-async"),
+    path("batch/", views.AccountBookBatchView.as_view(), name="account-book-batch"),
+    path("dashboard/", views.AccountBookDashboardView.as_view(), name="account-book-dashboard"),
+    path("digest/", views.AccountBookDigestView.as_view(), name="account-book-digest"),
+    path("sync/", views.AccountBookSyncView.as_view(), name="account-book-sync"),
     path("details/<int:account_book_id>/", views.AccountBookDetailView.as_view(), name="account-book-detail"),
 ]
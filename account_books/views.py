@@ -4,24 +4,47 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.generics import get_object_or_404
+from rest_framework.exceptions import NotFound
 
 # django
-from django.shortcuts import get_list_or_404
+from django.http import Http404
+from django.db import transaction
+from django.conf import settings
+from django.db.models import Count, Sum, Max, F, Q, Exists
+from django.utils import timezone
 
 # drf_yasg
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
+# python
+from datetime import datetime, timedelta
+
 # account_books
-from .models import AccountBook
+from .models import AccountBook, Tombstone
 from .serializers import (
     AccountBookListSerializer,
     AccountBookDetailSerializer,
     AccountBookCreateSerializer,
+    AccountBookBatchSerializer,
 )
 
 # payhere
-from payhere.permissions import IsOwner
+from payhere.permissions import IsOwner, GenericAPIException
+from payhere.middleware import serializer_timing
+from payhere.utils import ConditionalUtil, CursorUtil, DigestUtil, FormatUtil
+from payhere.cache import cache_response, bump_user_version
+from payhere.db import run_concurrently
+from payhere.async_views import AsyncAPIView, json_response
+
+# apps
+from users.models import User
+from expenses.models import Expense
+from expenses.views import get_category_data as get_expense_category_data
+from expenses.serializers import ExpenseCreateSerializer
+from incomes.models import Income
+from incomes.views import get_category_data as get_income_category_data
+from incomes.serializers import IncomeCreateSerializer
 
 
 class AccountBookView(APIView):
@@ -29,6 +52,8 @@ class AccountBookView(APIView):
     
     post: 날짜가 중복되지 않는 가계부를 생성합니다.
     get: url 매개변수로 date(YYYY-MM)를 받으면 월간 가계부 조회합니다.
+        월간 가계부 개수, id/version 합계로 만든 ETag가 If-None-Match와 같으면 조회 없이 304를 반환합니다.
+        응답은 사용자 데이터 버전별로 캐시합니다. (cache_response)
         return: id, date_at, day_total_money
     """
     permission_classes = [IsAuthenticated]
@@ -49,50 +74,348 @@ class AccountBookView(APIView):
         serializer = AccountBookCreateSerializer(data=request.data, context={"request": request})
         if serializer.is_valid():
             serializer.save(owner=request.user)
+            bump_user_version(request.user.id)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @swagger_auto_schema(
         manual_parameters=[date_param_config],
         operation_summary="월간 가계부 조회",
+        responses={200: "성공", 304: "변경 없음", 400: "매개변수 에러", 401: "인증 오류", 404: "찾을 수 없음", 500: "서버 에러"},
+    )
+    @cache_response("account-book")
+    def get(self, request):
+        try:
+            date = request.GET.get("date", None).split("-")
+            year = date[0]
+            month = date[1]
+            account_books = AccountBook.objects.filter(date_at__year=year, date_at__month=month, owner=request.user.id)
+            # 가계부 추가/삭제(개수, id 합계)와 내역 변경(version 합계)을 인덱스 조회 한 번으로 확인합니다.
+            validator = account_books.aggregate(count=Count("id"), ids=Sum("id"), versions=Sum("version"))
+            if not validator["count"]:
+                raise Http404
+            etag = ConditionalUtil.get_etag(request.user.id, year, month, *validator.values())
+            not_modified = ConditionalUtil.not_modified(request, etag)
+            if not_modified:
+                return not_modified
+            response = Response(AccountBookListSerializer.values(account_books), status=status.HTTP_200_OK)
+            return ConditionalUtil.set_etag(response, etag)
+
+        except IndexError:
+            return Response({"message": "올바른 매개변수의 날짜를 입력해주세요.(Ex: YYYY-MM)"},status=status.HTTP_400_BAD_REQUEST)
+
+
+class AccountBookAsyncView(AsyncAPIView):
+    """가계부 월간 조회 (async)
+
+    get: AccountBookView의 get과 같은 응답(ETag, 304 포함)을 async ORM으로 조회합니다. (ASGI)
+        응답 캐시는 사용하지 않습니다.
+        return: id, date_at, day_total_money
+    """
+
+    async def get(self, request):
+        try:
+            date = request.GET.get("date", None).split("-")
+            year = date[0]
+            month = date[1]
+            account_books = AccountBook.objects.filter(date_at__year=year, date_at__month=month, owner=request.user.id)
+            validator = await account_books.aaggregate(count=Count("id"), ids=Sum("id"), versions=Sum("version"))
+            if not validator["count"]:
+                raise Http404
+            etag = ConditionalUtil.get_etag(request.user.id, year, month, *validator.values())
+            not_modified = ConditionalUtil.not_modified(request, etag)
+            if not_modified:
+                return not_modified
+            response = json_response(await AccountBookListSerializer.avalues(account_books))
+            return ConditionalUtil.set_etag(response, etag)
+
+        except (IndexError, AttributeError):
+            return json_response({"message": "올바른 매개변수의 날짜를 입력해주세요.(Ex: YYYY-MM)"}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AccountBookDashboardView(APIView):
+    """월간 대시보드
+
+    get: url 매개변수로 date(YYYY-MM)를 받아 월간 가계부 조회, 월간 지출/수익 내역 통계와
+        수익/지출 총액, 순현금흐름(수익 - 지출)을 한 번에 반환합니다.
+        서로 관계없는 세 조회(가계부, 지출 통계, 수익 통계)는 run_concurrently로 동시에 실행합니다.
+        응답은 사용자 데이터 버전별로 캐시합니다. (cache_response)
+        return account_books, expense_category_data, income_category_data, total_income, total_expense, net_cash_flow
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        manual_parameters=[AccountBookView.date_param_config],
+        operation_summary="월간 대시보드",
         responses={200: "성공", 400: "매개변수 에러", 401: "인증 오류", 404: "찾을 수 없음", 500: "서버 에러"},
     )
+    @cache_response("account-book-dashboard")
     def get(self, request):
         try:
             date = request.GET.get("date", None).split("-")
             year = date[0]
             month = date[1]
-            account_books = get_list_or_404(AccountBook, date_at__year=year, date_at__month=month, owner=request.user.id)
-            serializer = AccountBookListSerializer(account_books, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            user_id = request.user.id
+
+            def get_account_books():
+                account_books = AccountBook.objects.filter(date_at__year=year, date_at__month=month, owner=user_id)
+                return AccountBookListSerializer.values(account_books)
+
+            account_books, expense_category_data, income_category_data = run_concurrently(
+                get_account_books,
+                lambda: get_expense_category_data(user_id, year, month),
+                lambda: get_income_category_data(user_id, year, month),
+            )
+            total_expense = sum(int(data["amount"]) for data in expense_category_data.values())
+            total_income = sum(int(data["amount"]) for data in income_category_data.values())
+            return Response(
+                {
+                    "account_books": account_books,
+                    "expense_category_data": expense_category_data,
+                    "income_category_data": income_category_data,
+                    "total_income": str(total_income),
+                    "total_expense": str(total_expense),
+                    "net_cash_flow": str(total_income - total_expense),
+                },
+                status=status.HTTP_200_OK,
+            )
 
         except IndexError:
             return Response({"message": "올바른 매개변수의 날짜를 입력해주세요.(Ex: YYYY-MM)"},status=status.HTTP_400_BAD_REQUEST)
 
 
+class AccountBookDigestView(APIView):
+    """월별 내역 요약 hash 조회
+
+    get: url 매개변수로 start, end(YYYY-MM)를 받아 기간 안의 월별 hash를 반환합니다. (days=true면 일별 hash도 반환)
+        일별 hash는 가계부 (id, 일 총 금액, 수정일)와 지출/수익 내역의 (개수, id 합계, 금액 합계, 최근 수정일)로 만들고,
+        월별 hash는 그 달 일별 hash로 만듭니다. 내역을 생성/수정/삭제/이동하면 해당 일과 월의 hash가 바뀌므로
+        클라이언트는 가진 데이터로 만든 hash와 비교해 다른 월만 다시 조회합니다. 내역이 없는 월은 포함하지 않습니다.
+        가계부 조회와 지출/수익 집계 쿼리(가계부별 GROUP BY)는 run_concurrently로 동시에 실행하며,
+        응답은 사용자 데이터 버전별로 캐시합니다. (cache_response)
+        return months, days
+    """
+    permission_classes = [IsAuthenticated]
+
+    # 한 번에 조회할 수 있는 최대 개월 수
+    max_months = 120
+
+    start_param_config = openapi.Parameter(
+        "start",
+        in_=openapi.IN_QUERY,
+        description="시작 년 월 입력 (Ex:YYYY-MM)",
+        type=openapi.TYPE_STRING,
+    )
+    end_param_config = openapi.Parameter(
+        "end",
+        in_=openapi.IN_QUERY,
+        description="끝 년 월 입력 (Ex:YYYY-MM, 생략하면 start와 같음)",
+        type=openapi.TYPE_STRING,
+    )
+    days_param_config = openapi.Parameter(
+        "days",
+        in_=openapi.IN_QUERY,
+        description="일별 hash 포함 여부 (true)",
+        type=openapi.TYPE_BOOLEAN,
+    )
+
+    def get_entry_summaries(self, model, user_id, start_at, end_at):
+        """가계부별 (개수, id 합계, 금액 합계, 최근 수정일)"""
+        queryset = (
+            model.objects.filter(owner=user_id, account_book__date_at__gte=start_at, account_book__date_at__lt=end_at)
+            .values("account_book_id")
+            .annotate(count=Count("id"), ids=Sum("id"), money=Sum("money"), updated_at=Max("updated_at"))
+            .order_by()
+            .values_list("account_book_id", "count", "ids", "money", "updated_at")
+        )
+        # DB마다 다른 합계 타입(int, Decimal)과 관계없이 같은 문자열이 되도록 바꿉니다.
+        return {
+            account_book_id: f"{count}:{int(ids)}:{int(money)}:{updated_at.isoformat()}"
+            for account_book_id, count, ids, money, updated_at in queryset
+        }
+
+    @swagger_auto_schema(
+        manual_parameters=[start_param_config, end_param_config, days_param_config],
+        operation_summary="월별 내역 요약 hash 조회",
+        responses={200: "성공", 400: "매개변수 에러", 401: "인증 오류", 500: "서버 에러"},
+    )
+    @cache_response("account-book-digest")
+    def get(self, request):
+        try:
+            start = request.GET.get("start", None)
+            start_year, start_month = (int(value) for value in start.split("-"))
+            end_year, end_month = (int(value) for value in request.GET.get("end", start).split("-"))
+            start_at = datetime(start_year, start_month, 1)
+            # end 다음 달 1일 전까지 (잘못된 월은 ValueError)
+            end_at = datetime(end_year, end_month, 1)
+            end_at = datetime(end_at.year + end_at.month // 12, end_at.month % 12 + 1, 1)
+        except (AttributeError, ValueError):
+            return Response({"message": "올바른 매개변수의 날짜를 입력해주세요.(Ex: YYYY-MM)"},status=status.HTTP_400_BAD_REQUEST)
+        if not 0 < (end_at.year - start_at.year) * 12 + end_at.month - start_at.month <= self.max_months:
+            return Response(
+                {"message": f"기간은 1~{self.max_months}개월로 입력해주세요."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        user_id = request.user.id
+        account_books, expenses, incomes = run_concurrently(
+            lambda: list(
+                AccountBook.objects.filter(owner=user_id, date_at__gte=start_at, date_at__lt=end_at)
+                .order_by("date_at", "id")
+                .values_list("id", "date_at", "day_total_money", "updated_at")
+            ),
+            lambda: self.get_entry_summaries(Expense, user_id, start_at, end_at),
+            lambda: self.get_entry_summaries(Income, user_id, start_at, end_at),
+        )
+
+        days = {}
+        for id, date_at, day_total_money, updated_at in account_books:
+            day = FormatUtil.date(date_at)
+            days[day] = DigestUtil.digest(
+                days.get(day), id, day_total_money, updated_at.isoformat(), expenses.get(id), incomes.get(id)
+            )
+        months = {}
+        for day, digest in days.items():
+            month = day[:7]
+            months[month] = DigestUtil.digest(months.get(month), day, digest)
+
+        data = {"months": months}
+        if request.GET.get("days", None) == "true":
+            data["days"] = days
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class AccountBookSyncView(APIView):
+    """가계부, 지출/수익 내역 동기화
+
+    get: url 매개변수로 받은 cursor 이후에 생성/수정된 가계부, 지출/수익 내역과 삭제된 내역(deleted)을 반환합니다.
+        cursor가 없으면 전체 가계부, 지출/수익 내역을 반환하며, 응답의 cursor를 다음 요청에 그대로 보냅니다.
+        종류별로 (owner, 수정일, id) 인덱스를 keyset으로 SYNC_PAGE_SIZE개씩 조회하고, 더 있으면 has_more가 true입니다.
+        바뀐 내역이 있는지는 종류별 EXISTS를 묶은 쿼리 한 번으로 먼저 확인하므로 바뀐 것이 없으면 쿼리 한 번으로 끝납니다.
+        삭제 기록 보관 기간(SYNC_TOMBSTONE_RETENTION_DAYS)보다 오래된 cursor는 410을 반환합니다. (cursor 없이 다시 동기화)
+        return account_books, expenses, incomes, deleted, cursor, has_more
+    """
+    permission_classes = [IsAuthenticated]
+
+    cursor_param_config = openapi.Parameter(
+        "cursor",
+        in_=openapi.IN_QUERY,
+        description="이전 동기화 응답의 cursor (처음 동기화할 때는 생략)",
+        type=openapi.TYPE_STRING,
+    )
+
+    # 종류: (모델, 시각 필드, 조회할 필드, 응답 key)
+    sync_streams = {
+        "account_books": (AccountBook, "updated_at", ("id", "date_at", "day_total_money", "version"), None),
+        "expenses": (
+            Expense,
+            "updated_at",
+            ("id", "account_book_id", "money", "expense_detail", "payment_method", "memo", "category_id"),
+            None,
+        ),
+        "incomes": (
+            Income,
+            "updated_at",
+            ("id", "account_book_id", "money", "income_detail", "payment_method", "memo", "category_id"),
+            None,
+        ),
+        "deleted": (Tombstone, "deleted_at", ("object_type", "object_id"), ("type", "id")),
+    }
+
+    def get_queryset(self, name, position, until):
+        """position((시각, id)) 다음부터 until 전까지 바뀐 내역을 (시각, id) 순으로 조회하는 queryset"""
+        model, time_field, _, _ = self.sync_streams[name]
+        queryset = model.objects.filter(owner=self.request.user.id, **{f"{time_field}__lt": until})
+        if position is not None:
+            at, id = position
+            # (시각, id) > position을 인덱스 범위 조건(시각 >= at)과 함께 씁니다.
+            queryset = queryset.filter(Q(**{f"{time_field}__gte": at}), Q(**{f"{time_field}__gt": at}) | Q(id__gt=id))
+        return queryset.order_by(time_field, "id")
+
+    @swagger_auto_schema(
+        manual_parameters=[cursor_param_config],
+        operation_summary="가계부, 지출/수익 내역 동기화",
+        responses={200: "성공", 400: "매개변수 에러", 401: "인증 오류", 410: "cursor 만료", 500: "서버 에러"},
+    )
+    def get(self, request):
+        now = timezone.now()
+        until = now - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+        cursor = request.GET.get("cursor", None)
+        if cursor is None:
+            # 처음 동기화할 때는 삭제된 내역을 보낼 필요가 없습니다.
+            positions = {name: None for name in self.sync_streams}
+            positions["deleted"] = (until, 0)
+        else:
+            try:
+                positions = CursorUtil.decode(cursor, self.sync_streams)
+            except ValueError:
+                return Response({"message": "올바른 cursor를 입력해주세요."}, status=status.HTTP_400_BAD_REQUEST)
+            if positions["deleted"][0] < now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS):
+                return Response(
+                    {"message": "동기화 기록이 만료되었습니다. cursor 없이 다시 동기화해주세요."}, status=status.HTTP_410_GONE
+                )
+
+        querysets = {name: self.get_queryset(name, positions[name], until) for name in self.sync_streams}
+        changed = (
+            User.objects.filter(id=request.user.id)
+            .annotate(**{f"{name}_changed": Exists(queryset) for name, queryset in querysets.items()})
+            .values_list(*(f"{name}_changed" for name in querysets))
+            .get()
+        )
+
+        page_size = settings.SYNC_PAGE_SIZE
+        data = {}
+        has_more = False
+        for (name, queryset), is_changed in zip(querysets.items(), changed):
+            _, time_field, fields, keys = self.sync_streams[name]
+            rows = list(queryset.values_list("id", time_field, *fields)[: page_size + 1]) if is_changed else []
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                has_more = True
+                positions[name] = (rows[-1][1], rows[-1][0])
+            else:
+                # 다 보냈으면 until부터 다시 조회합니다.
+                positions[name] = (until, 0)
+            data[name] = [{**dict(zip(keys or fields, values)), time_field: at} for _, at, *values in rows]
+
+        for account_book in data["account_books"]:
+            account_book["date_at"] = FormatUtil.date(account_book["date_at"])
+        return Response(
+            {**data, "cursor": CursorUtil.encode(positions), "has_more": has_more}, status=status.HTTP_200_OK
+        )
+
+
 class AccountBookDetailView(APIView):
     """가계부 상세조회, 수정, 삭제
     
     get: 지출/수익내역을 포함하는 일별 가계부 상세 조회합니다.
+        가계부 version으로 만든 ETag가 If-None-Match와 같으면 내역 조회 없이 304를 반환합니다.
         return id, date_at, day_total_money, expenses, incomes
-    put: 날짜가 중복되지 않는 특정 가계부를 수정합니다.
+    put: 날짜가 중복되지 않는 특정 가계부를 수정하고 version을 올립니다.
+        transaction 안에서 가계부를 select_for_update 하고 입력받은 필드와 version만 저장하므로
+        동시에 지출/수익 내역이 바뀌어도 일 총 금액을 덮어쓰지 않습니다.
     delete: 특정 가계부를 삭제합니다.
     """
     permission_classes = [IsOwner]
 
-    def get_objects(self, account_book_id):
-        account_book = get_object_or_404(AccountBook, id=account_book_id)
+    def get_objects(self, account_book_id, for_update=False):
+        queryset = AccountBook.objects.select_for_update() if for_update else AccountBook
+        account_book = get_object_or_404(queryset, id=account_book_id)
         self.check_object_permissions(self.request, account_book)
         return account_book
 
     @swagger_auto_schema(
         operation_summary="일별 가게부 상세 조회",
-        responses={200: "성공", 403: "권한 오류", 404: "찾을 수 없음", 500: "서버 에러"},
+        responses={200: "성공", 304: "변경 없음", 403: "권한 오류", 404: "찾을 수 없음", 500: "서버 에러"},
     )
     def get(self, request, account_book_id):
         account_book = self.get_objects(account_book_id)
-        serializer = AccountBookDetailSerializer(account_book)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        etag = ConditionalUtil.get_etag(account_book.id, account_book.version)
+        not_modified = ConditionalUtil.not_modified(request, etag)
+        if not_modified:
+            return not_modified
+        with serializer_timing():
+            data = AccountBookDetailSerializer(account_book).data
+        return ConditionalUtil.set_etag(Response(data, status=status.HTTP_200_OK), etag)
 
     @swagger_auto_schema(
         request_body=AccountBookCreateSerializer,
@@ -100,11 +423,13 @@ class AccountBookDetailView(APIView):
         responses={200: "성공", 400: "인풋값 에러", 403: "권한 오류", 404: "찾을 수 없음", 500: "서버 에러"},
     )
     def put(self, request, account_book_id):
-        account_book = self.get_objects(account_book_id)
-        serializer = AccountBookCreateSerializer(account_book, data=request.data, partial=True, context={"request": request})
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
+        with transaction.atomic():
+            account_book = self.get_objects(account_book_id, for_update=True)
+            serializer = AccountBookCreateSerializer(account_book, data=request.data, partial=True, context={"request": request})
+            if serializer.is_valid():
+                serializer.save(version=account_book.version + 1)
+                bump_user_version(account_book.owner_id)
+                return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @swagger_auto_schema(
@@ -114,4 +439,214 @@ class AccountBookDetailView(APIView):
     def delete(self, request, account_book_id):
         account_book = self.get_objects(account_book_id)
         account_book.delete()
+        bump_user_version(account_book.owner_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AccountBookBatchView(APIView):
+    """가계부, 지출/수익 내역 일괄 생성, 수정, 삭제
+
+    post: operations(op, type, id, account_book_id, data) 목록을 받아 순서대로 하나의 transaction 안에서 처리하고
+        작업별 결과(status, id, data)를 같은 순서로 반환합니다. (오프라인에서 쌓인 수정 내역을 요청 하나로 반영)
+        data는 각 생성/수정 API와 같은 입력값이며, 하나라도 실패하면 모두 되돌리고
+        실패한 작업의 index와 에러를 해당 상태 코드(400, 403, 404)로 반환합니다.
+        쓰이는 가계부를 id 순으로 먼저 잠근 뒤 수정/삭제할 내역을 종류별로 한 번에 잠그고, 일 총 금액 변경은 가계부별로 모아
+        마지막에 가계부마다 update 한 번으로 반영합니다. (version과 사용자 데이터 버전도 한 번만 올림)
+        입력값이 참조하는 카테고리도 종류별로 한 번에 조회해 작업마다 조회하지 않습니다.
+        return results
+    """
+    permission_classes = [IsAuthenticated]
+
+    # type: (모델, 생성/수정 serializer, 일 총 금액 부호)
+    entry_types = {
+        "expense": (Expense, ExpenseCreateSerializer, -1),
+        "income": (Income, IncomeCreateSerializer, 1),
+    }
+
+    @swagger_auto_schema(
+        request_body=AccountBookBatchSerializer,
+        operation_summary="가계부, 지출/수익 내역 일괄 처리",
+        responses={200: "성공", 400: "인풋값 에러", 401: "인증 오류", 403: "권한 오류", 404: "찾을 수 없음", 500: "서버 에러"},
+    )
+    def post(self, request):
+        serializer = AccountBookBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        operations = serializer.validated_data["operations"]
+
+        # 가계부 id별 잠근 가계부, 일 총 금액 변경값 (변경값이 있는 가계부는 version을 올립니다.)
+        self.account_books = {}
+        self.deltas = {}
+        results = []
+        # 예외가 transaction.atomic 밖으로 나가면 모든 작업이 되돌려집니다.
+        try:
+            with transaction.atomic():
+                self.entries = self.lock_entries(operations)
+                for operation in operations:
+                    results.append(self.run(operation))
+                self.apply_deltas()
+        except Http404:
+            return Response(
+                {"index": len(results), "errors": {"detail": NotFound.default_detail}}, status=status.HTTP_404_NOT_FOUND
+            )
+        except GenericAPIException as e:
+            return Response({"index": len(results), "errors": e.detail}, status=e.status_code)
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    def lock_entries(self, operations):
+        """작업에 쓰이는 가계부를 id 순으로 먼저 잠그고, 수정/삭제할 지출/수익 내역을 종류별로 한 번에 select_for_update 합니다.
+
+        가계부를 항상 내역보다 먼저 id 순으로 잠가 다른 일괄 처리나 지출/수익 수정 요청과 교착되지 않도록 합니다.
+        (수정/삭제할 내역의 가계부 id는 잠그기 전에 조회하며, 그 사이 다른 가계부로 이동한 내역은 get_account_book에서 잠금)
+        """
+        entry_ids = {
+            entry_type: {operation["id"] for operation in operations if operation["type"] == entry_type and operation["op"] != "create"}
+            for entry_type in self.entry_types
+        }
+        account_book_ids = set()
+        for operation in operations:
+            if operation["type"] == "account_book":
+                if operation["op"] != "create":
+                    account_book_ids.add(operation["id"])
+            elif operation["op"] == "create":
+                account_book_ids.add(operation["account_book_id"])
+            else:
+                # 다른 일자로 이동할 가계부 (잘못된 값은 serializer에서 검증)
+                account_book_id = self.parse_id(operation["data"].get("account_book"))
+                if account_book_id is not None:
+                    account_book_ids.add(account_book_id)
+        for entry_type, (model, _, _) in self.entry_types.items():
+            if entry_ids[entry_type]:
+                account_book_ids.update(
+                    model.objects.filter(id__in=entry_ids[entry_type]).values_list("account_book_id", flat=True)
+                )
+        self.account_books.update(AccountBook.lock(account_book_ids))
+
+        # 생성/수정 serializer가 작업마다 조회하지 않도록 가계부와 카테고리를 넘깁니다. (PrefetchedPrimaryKeyRelatedField)
+        self.prefetched = {AccountBook: self.account_books}
+        for entry_type, (model, _, _) in self.entry_types.items():
+            category_ids = {
+                self.parse_id(operation["data"].get("category")) for operation in operations if operation["type"] == entry_type
+            } - {None}
+            category_model = model._meta.get_field("category").related_model
+            self.prefetched[category_model] = category_model.objects.in_bulk(category_ids) if category_ids else {}
+
+        entries = {}
+        for entry_type, (model, _, _) in self.entry_types.items():
+            ids = entry_ids[entry_type]
+            entries[entry_type] = (
+                {entry.id: entry for entry in model.objects.select_for_update().filter(id__in=ids).order_by("id")} if ids else {}
+            )
+        return entries
+
+    def parse_id(self, value):
+        """입력값이 id 형식이면 int로, 아니면 None을 반환합니다. (잘못된 값은 serializer에서 검증)"""
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.isdigit():
+            return int(value)
+        return None
+
+    def get_account_book(self, account_book_id):
+        """잠근 가계부를 반환합니다. (처음 사용하는 가계부는 select_for_update로 조회)"""
+        account_book = self.account_books.get(account_book_id)
+        if account_book is None:
+            account_book = get_object_or_404(AccountBook.objects.select_for_update(), id=account_book_id)
+            self.account_books[account_book_id] = account_book
+        IsOwner().has_object_permission(self.request, self, account_book)
+        return account_book
+
+    def get_entry(self, entry_type, entry_id):
+        entry = self.entries[entry_type].get(entry_id)
+        if entry is None:
+            raise Http404
+        IsOwner().has_object_permission(self.request, self, entry)
+        return entry
+
+    def add_delta(self, account_book, money):
+        self.deltas[account_book.id] = self.deltas.get(account_book.id, 0) + money
+
+    def run(self, operation):
+        if operation["type"] == "account_book":
+            return getattr(self, f"{operation['op']}_account_book")(operation)
+        return getattr(self, f"{operation['op']}_entry")(operation["type"], operation)
+
+    def create_entry(self, entry_type, operation):
+        _, serializer_class, sign = self.entry_types[entry_type]
+        account_book = self.get_account_book(operation["account_book_id"])
+        serializer = serializer_class(data=operation["data"], context={"request": self.request, "prefetched": self.prefetched})
+        if not serializer.is_valid():
+            raise GenericAPIException(status.HTTP_400_BAD_REQUEST, detail=serializer.errors)
+        entry = serializer.save(owner=self.request.user, account_book=account_book)
+        self.add_delta(account_book, sign * entry.money)
+        return {"status": status.HTTP_201_CREATED, "id": entry.id, "data": serializer.data}
+
+    def update_entry(self, entry_type, operation):
+        _, serializer_class, sign = self.entry_types[entry_type]
+        entry = self.get_entry(entry_type, operation["id"])
+        entry_money = entry.money
+        current_account_book = self.get_account_book(entry.account_book_id)
+        serializer = serializer_class(
+            entry, data=operation["data"], partial=True, context={"request": self.request, "prefetched": self.prefetched}
+        )
+        if not serializer.is_valid():
+            raise GenericAPIException(status.HTTP_400_BAD_REQUEST, detail=serializer.errors)
+
+        # 다른 일자로 이동할 경우 이동할 가계부도 잠급니다.
+        if "account_book" in serializer.validated_data:
+            request_account_book = self.get_account_book(serializer.validated_data["account_book"].id)
+            entry = serializer.save(account_book=request_account_book)
+        else:
+            request_account_book = current_account_book
+            entry = serializer.save()
+        # 금액이 같아도 다른 내역이 바뀌었으므로 변경값 0으로 version은 올립니다.
+        self.add_delta(current_account_book, -sign * entry_money)
+        self.add_delta(request_account_book, sign * entry.money)
+        return {"status": status.HTTP_200_OK, "id": entry.id, "data": serializer.data}
+
+    def delete_entry(self, entry_type, operation):
+        _, _, sign = self.entry_types[entry_type]
+        entry = self.get_entry(entry_type, operation["id"])
+        self.add_delta(self.get_account_book(entry.account_book_id), -sign * entry.money)
+        entry.delete()
+        del self.entries[entry_type][operation["id"]]
+        return {"status": status.HTTP_204_NO_CONTENT, "id": operation["id"]}
+
+    def create_account_book(self, operation):
+        serializer = AccountBookCreateSerializer(data=operation["data"], context={"request": self.request})
+        if not serializer.is_valid():
+            raise GenericAPIException(status.HTTP_400_BAD_REQUEST, detail=serializer.errors)
+        account_book = serializer.save(owner=self.request.user)
+        self.account_books[account_book.id] = account_book
+        return {"status": status.HTTP_201_CREATED, "id": account_book.id, "data": serializer.data}
+
+    def update_account_book(self, operation):
+        account_book = self.get_account_book(operation["id"])
+        serializer = AccountBookCreateSerializer(
+            account_book, data=operation["data"], partial=True, context={"request": self.request}
+        )
+        if not serializer.is_valid():
+            raise GenericAPIException(status.HTTP_400_BAD_REQUEST, detail=serializer.errors)
+        serializer.save()
+        self.add_delta(account_book, 0)
+        return {"status": status.HTTP_200_OK, "id": account_book.id, "data": serializer.data}
+
+    def delete_account_book(self, operation):
+        account_book = self.get_account_book(operation["id"])
+        account_book.delete()
+        del self.account_books[operation["id"]]
+        self.deltas.pop(operation["id"], None)
+        # 가계부와 함께 삭제된 내역은 이후 작업에서 찾을 수 없습니다.
+        for entries in self.entries.values():
+            for entry_id in [entry_id for entry_id, entry in entries.items() if entry.account_book_id == operation["id"]]:
+                del entries[entry_id]
+        return {"status": status.HTTP_204_NO_CONTENT, "id": operation["id"]}
+
+    def apply_deltas(self):
+        """가계부별로 모은 일 총 금액 변경값을 가계부마다 update 한 번으로 반영하고 version을 올립니다."""
+        now = timezone.now()
+        for account_book_id, money in sorted(self.deltas.items()):
+            AccountBook.objects.filter(id=account_book_id).update(
+                day_total_money=F("day_total_money") + money, version=F("version") + 1, updated_at=now
+            )
+        bump_user_version(self.request.user.id)
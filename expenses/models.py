@@ -37,6 +37,10 @@ class Expense(TimeStampModel):
 
     class Meta:
         db_table = "Expense"
+        indexes = [
+            # 동기화 조회 (owner, 수정일, id 순 keyset)
+            models.Index(fields=["owner", "updated_at", "id"], name="expense_owner_sync_idx"),
+        ]
 
     def __str__(self):
         return f"[{self.created_at}]{self.money}원"
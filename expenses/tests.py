@@ -1,17 +1,28 @@
 # rest_framework
 from rest_framework.test import APITestCase
+from rest_framework.renderers import JSONRenderer
 
 # django
 from django.urls import reverse
+from django.test import TestCase, override_settings
+from django.http import StreamingHttpResponse
 from django.core.management import call_command
+from django.utils import timezone
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# asgiref
+from asgiref.sync import sync_to_async
 
 # python
 import random
+from datetime import timedelta
 
 # apps
 from .models import Expense, ExpenseURL
+from .serializers import ExpenseListSerializer, ExpenseSearchListSerializer
 from users.models import User
-from account_books.models import AccountBook
+from account_books.models import AccountBook, IdempotencyKey
 
 
 class ExpenseListAPIViewTestCase(APITestCase):
@@ -43,13 +54,19 @@ class ExpenseListAPIViewTestCase(APITestCase):
     def test_expense_list_success(self):
         """
         ExpenseListView의 get 함수를 겸증하는 함수
-        case: 성공
+        case: 성공(같은 날짜에 다른 회원의 가계부가 있어도 본인 가계부만 조회)
         """
-        response = self.client.get(
-            path=f"{reverse('expense-list')}?date=2023-02-01",
-            HTTP_AUTHORIZATION=f"Bearer {self.user_access_token}",
-        )
+        AccountBook.objects.create(date_at="2023-02-01", owner=self.other_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                path=f"{reverse('expense-list')}?date=2023-02-01",
+                HTTP_AUTHORIZATION=f"Bearer {self.user_access_token}",
+            )
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 10)
+        account_book_queries = [query["sql"] for query in queries.captured_queries if 'FROM "AccountBook"' in query["sql"]]
+        self.assertEqual(len(account_book_queries), 1)
+        self.assertIn('"AccountBook"."owner_id" =', account_book_queries[0])
 
     def test_expense_list_anonymous_fail(self):
         """
@@ -188,10 +205,10 @@ class ExpenseCreateAPIViewTestCase(APITestCase):
 
 
 class ExpenseDetailAPIViewTestCase(APITestCase):
-    """ExpenseDetailView의 API를 검증하는 클래스 (19개)
+    """ExpenseDetailView의 API를 검증하는 클래스 (23개)
     get method case: 4개
-    post method case: 4개
-    put method case: 7개
+    post method case: 5개
+    put method case: 10개
     delete method case: 4개
     """
 
@@ -210,6 +227,8 @@ class ExpenseDetailAPIViewTestCase(APITestCase):
             account_book=cls.account_book,
             owner=cls.user,
         )
+        cls.other_account_book = AccountBook.objects.create(date_at=f"2023-02-02", owner=cls.user)
+        cls.other_user_account_book = AccountBook.objects.create(date_at=f"2023-02-02", owner=cls.other_user)
 
     def setUp(self):
         self.user_access_token = self.client.post(reverse("auth-signin"), self.user_data).data["access"]
@@ -426,6 +445,147 @@ class ExpenseDetailAPIViewTestCase(APITestCase):
         )
         self.assertEqual(response.status_code, 404)
 
+    def test_expense_detail_post_total_money_success(self):
+        """
+        ExpenseDetailView의 post 함수를 겸증하는 함수
+        case: 성공(복제한 금액이 가계부 일 총 금액에 반영)
+        """
+        self.client.post(
+            path=reverse("expense-detail", kwargs={"expense_id": "1"}),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_access_token}",
+        )
+        self.account_book.refresh_from_db()
+        self.assertEqual(self.account_book.day_total_money, -30000)
+
+    def test_expense_detail_put_total_money_success(self):
+        """
+        ExpenseDetailView의 put 함수를 겸증하는 함수
+        case: 성공(수정한 금액 차이가 가계부 일 총 금액에 반영)
+        """
+        self.client.put(
+            path=reverse("expense-detail", kwargs={"expense_id": "1"}),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_access_token}",
+            data={"money": 40000},
+        )
+        self.account_book.refresh_from_db()
+        self.assertEqual(self.account_book.day_total_money, -10000)
+
+    def test_expense_detail_put_move_success(self):
+        """
+        ExpenseDetailView의 put 함수를 겸증하는 함수
+        case: 성공(다른 일자의 가계부로 이동)
+        """
+        response = self.client.put(
+            path=reverse("expense-detail", kwargs={"expense_id": "1"}),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_access_token}",
+            data={"account_book": self.other_account_book.id},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.account_book.refresh_from_db()
+        self.other_account_book.refresh_from_db()
+        self.assertEqual(self.account_book.day_total_money, 30000)
+        self.assertEqual(self.other_account_book.day_total_money, -30000)
+        self.assertEqual(Expense.objects.get(id=1).account_book_id, self.other_account_book.id)
+
+    def test_expense_detail_put_move_other_user_fail(self):
+        """
+        ExpenseDetailView의 put 함수를 겸증하는 함수
+        case: 실패(다른 회원의 가계부로 이동할 때)
+        """
+        response = self.client.put(
+            path=reverse("expense-detail", kwargs={"expense_id": "1"}),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_access_token}",
+            data={"account_book": self.other_user_account_book.id},
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class ExpenseIdempotencyAPIViewTestCase(APITestCase):
+    """ExpenseCreateView, ExpenseDetailView의 post(Idempotency-Key)를 검증하는 클래스 (4개)
+    post method case: 4개
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test1234@test.com", "test1234", "Test1234!")
+        cls.other_user = User.objects.create_user("test1235@test.com", "test12345", "Test1235!")
+        cls.account_book = AccountBook.objects.create(date_at="2023-02-01", owner=cls.user)
+        cls.expense = Expense.objects.create(money=1000, owner=cls.user, account_book=cls.account_book)
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+        self.create_path = reverse("expense-create", kwargs={"account_book_id": self.account_book.id})
+
+    def test_create_replay_success(self):
+        """
+        ExpenseCreateView의 post 함수를 겸증하는 함수
+        case: 성공(같은 키로 재시도하면 생성하지 않고 첫 응답 반환, 키가 없으면 매번 생성)
+        """
+        data = {"money": 3000, "expense_detail": "재시도"}
+        first = self.client.post(self.create_path, data, HTTP_IDEMPOTENCY_KEY="key")
+        second = self.client.post(self.create_path, data, HTTP_IDEMPOTENCY_KEY="key")
+        self.assertEqual((first.status_code, second.status_code), (201, 201))
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertFalse(first.has_header("Idempotent-Replayed"))
+        self.assertEqual(Expense.objects.filter(expense_detail="재시도").count(), 1)
+        self.account_book.refresh_from_db()
+        self.assertEqual(self.account_book.day_total_money, -3000)
+
+        self.client.post(self.create_path, data)
+        self.client.post(self.create_path, data)
+        self.assertEqual(Expense.objects.filter(expense_detail="재시도").count(), 3)
+
+    def test_copy_replay_success(self):
+        """
+        ExpenseDetailView의 post 함수를 겸증하는 함수
+        case: 성공(같은 키로 재시도하면 복제하지 않고 첫 응답 반환)
+        """
+        path = reverse("expense-detail", kwargs={"expense_id": self.expense.id})
+        for _ in range(3):
+            response = self.client.post(path, HTTP_IDEMPOTENCY_KEY="copy")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), {"message": "복사 완료"})
+        self.assertEqual(Expense.objects.filter(account_book=self.account_book).count(), 2)
+
+    def test_key_scope_success(self):
+        """
+        idempotent 함수를 겸증하는 함수
+        case: 성공(같은 키로 다른 요청은 422, 다른 회원의 같은 키와 보관 시간이 지난 키는 새 요청으로 처리)
+        """
+        self.client.post(self.create_path, {"money": 3000}, HTTP_IDEMPOTENCY_KEY="key")
+        response = self.client.post(self.create_path, {"money": 4000}, HTTP_IDEMPOTENCY_KEY="key")
+        self.assertEqual(response.status_code, 422)
+
+        other_account_book = AccountBook.objects.create(date_at="2023-02-01", owner=self.other_user)
+        self.client.force_authenticate(user=self.other_user)
+        path = reverse("expense-create", kwargs={"account_book_id": other_account_book.id})
+        self.assertEqual(self.client.post(path, {"money": 3000}, HTTP_IDEMPOTENCY_KEY="key").status_code, 201)
+        self.assertEqual(Expense.objects.filter(money=3000).count(), 2)
+
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(hours=25))
+        response = self.client.post(path, {"money": 3000}, HTTP_IDEMPOTENCY_KEY="key")
+        self.assertFalse(response.has_header("Idempotent-Replayed"))
+        self.assertEqual(Expense.objects.filter(money=3000).count(), 3)
+        self.assertEqual(IdempotencyKey.objects.count(), 2)
+
+    def test_idempotency_key_fail(self):
+        """
+        idempotent 함수를 겸증하는 함수
+        case: 실패(키가 너무 길 때, 저장하지 않은 에러 응답은 다시 처리)
+        """
+        response = self.client.post(self.create_path, {"money": 1000}, HTTP_IDEMPOTENCY_KEY="a" * 256)
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(reverse("expense-detail", kwargs={"expense_id": 0}), HTTP_IDEMPOTENCY_KEY="key")
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        # 입력값 에러(400)는 저장해 같은 응답을 반환합니다.
+        response = self.client.post(self.create_path, {"money": "a"}, HTTP_IDEMPOTENCY_KEY="key")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(self.create_path, {"money": "a"}, HTTP_IDEMPOTENCY_KEY="key")
+        self.assertEqual((response.status_code, response["Idempotent-Replayed"]), (400, "true"))
+
 
 class ExpenseShareUrlCreateAPIViewTestCase(APITestCase):
     """ExpenseShareUrlCreateView의 API를 검증하는 클래스 (5개)
@@ -627,8 +787,8 @@ class ExpenseCategoryAPIViewTestCase(APITestCase):
 
 
 class ExpenseCategorySearchAPIViewTestCase(APITestCase):
-    """ExpenseCategorySearchView의 API를 검증하는 클래스 (5개)
-    get method case: 5개
+    """ExpenseCategorySearchView의 API를 검증하는 클래스 (6개)
+    get method case: 6개
     """
 
     @classmethod
@@ -706,9 +866,25 @@ class ExpenseCategorySearchAPIViewTestCase(APITestCase):
         self.assertEqual(response.status_code, 404)
 
 
+    def test_expense_category_search_streaming_success(self):
+        """
+        ExpenseCategorySearchView의 get 함수를 겸증하는 함수
+        case: 성공(내역이 JSON_STREAM_CHUNK_SIZE보다 많을 때 나눠서 같은 내용으로 응답)
+        """
+        path = f"{reverse('expense-category-search')}?date=2023-02"
+        response = self.client.get(path=path, HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        with override_settings(JSON_STREAM_CHUNK_SIZE=30):
+            streaming_response = self.client.get(path=path, HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.assertNotIsInstance(response, StreamingHttpResponse)
+        self.assertIsInstance(streaming_response, StreamingHttpResponse)
+        self.assertEqual(streaming_response.status_code, 200)
+        self.assertEqual(streaming_response["Content-Type"], "application/json")
+        self.assertEqual(b"".join(streaming_response.streaming_content), response.content)
+        self.assertEqual(len(response.json()), 101)
+
 class ExpenseCategoryStatAPIViewTestCase(APITestCase):
-    """ExpenseCategoryStatView의 API를 검증하는 클래스 (4개)
-    get method case: 4개
+    """ExpenseCategoryStatView의 API를 검증하는 클래스 (5개)
+    get method case: 5개
     """
 
     @classmethod
@@ -773,3 +949,150 @@ class ExpenseCategoryStatAPIViewTestCase(APITestCase):
             HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
         )
         self.assertEqual(response.status_code, 404)
+
+    def test_expense_category_stat_amount_success(self):
+        """
+        ExpenseCategoryStatView의 get 함수를 겸증하는 함수
+        case: 성공(상위 카테고리별 총액)
+        """
+        amounts = {}
+        for expense in Expense.objects.select_related("category"):
+            name = expense.category.get_root().name
+            amounts[name] = amounts.get(name, 0) + expense.money
+
+        response = self.client.get(
+            path=f"{reverse('expense-caregory-stat')}?date=2023-02",
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+        )
+        self.assertEqual(
+            response.data["category_data"],
+            {name: {"amount": str(amount)} for name, amount in amounts.items()},
+        )
+
+
+class ExpenseAsyncViewTestCase(APITestCase):
+    """ExpenseListAsyncView, ExpenseCategorySearchAsyncView, ExpenseCategoryStatAsyncView를 검증하는 클래스 (4개)
+    get method case: 4개
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test1234@test.com", "test1234", "Test1234!")
+        cls.other_user = User.objects.create_user("test1235@test.com", "test1235", "Test1235!")
+        cls.account_book = AccountBook.objects.create(date_at="2023-02-01", owner=cls.user)
+        call_command("loaddata", "json_data/expense_category_data.json", verbosity=0)
+        for index in range(5):
+            Expense.objects.create(
+                money=1000 * (index + 1),
+                expense_detail="(주) 소고기 짱 좋아" if index % 2 else None,
+                payment_method="현금",
+                account_book=cls.account_book,
+                owner=cls.user,
+                category_id=[1, 16][index % 2] if index < 4 else None,
+            )
+
+    def setUp(self):
+        self.access_token = self.client.post(reverse("auth-signin"), {"email": "test1234@test.com", "password": "Test1234!"}).data["access"]
+
+    async def get_both(self, name, query):
+        """sync view와 async view의 응답을 반환합니다."""
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {self.access_token}"}
+        sync_response = await sync_to_async(self.client.get)(f"{reverse(name)}?{query}", **headers)
+        response = await self.async_client.get(f"{reverse(f'{name}-async')}?{query}", AUTHORIZATION=headers["HTTP_AUTHORIZATION"])
+        return sync_response, response
+
+    async def test_expense_list_async_success(self):
+        """
+        ExpenseListAsyncView의 get 함수를 겸증하는 함수
+        case: 성공(ExpenseListView와 같은 응답)
+        """
+        sync_response, response = await self.get_both("expense-list", "date=2023-02-01")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), sync_response.json())
+
+    async def test_expense_category_search_async_success(self):
+        """
+        ExpenseCategorySearchAsyncView의 get 함수를 겸증하는 함수
+        case: 성공(ExpenseCategorySearchView와 같은 응답, 전체/카테고리 검색)
+        """
+        for query in ("date=2023-02", "date=2023-02&main=식비"):
+            sync_response, response = await self.get_both("expense-category-search", query)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), sync_response.json())
+
+    async def test_expense_category_stat_async_success(self):
+        """
+        ExpenseCategoryStatAsyncView의 get 함수를 겸증하는 함수
+        case: 성공(ExpenseCategoryStatView와 같은 응답)
+        """
+        sync_response, response = await self.get_both("expense-caregory-stat", "date=2023-02")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), sync_response.json())
+
+    async def test_expense_async_fail(self):
+        """
+        지출 async view의 get 함수를 겸증하는 함수
+        case: 실패(다른 회원의 가계부일 때, 가계부/카테고리가 없을 때, 매개변수를 잘못 입력했을 때)
+        """
+        other_access_token = (
+            await sync_to_async(self.client.post)(reverse("auth-signin"), {"email": "test1235@test.com", "password": "Test1235!"})
+        ).data["access"]
+        response = await self.async_client.get(
+            f"{reverse('expense-list-async')}?date=2023-02-01", AUTHORIZATION=f"Bearer {other_access_token}"
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json(), {"detail": "접근 권한 없습니다."})
+
+        headers = {"AUTHORIZATION": f"Bearer {self.access_token}"}
+        for path, status_code in (
+            (f"{reverse('expense-list-async')}?date=2023-02-02", 404),
+            (f"{reverse('expense-category-search-async')}?date=2023-03", 404),
+            (f"{reverse('expense-category-search-async')}?date=2023-02&main=없는카테고리", 404),
+            (f"{reverse('expense-caregory-stat-async')}?date=2023", 400),
+        ):
+            response = await self.async_client.get(path, **headers)
+            self.assertEqual(response.status_code, status_code, path)
+
+
+class ExpenseValuesSerializerTestCase(TestCase):
+    """ExpenseListSerializer / ExpenseSearchListSerializer의 values(values_list 조회)를 검증하는 클래스 (2개)
+    serializer.data와 JSON 결과가 같은지 검증: 2개
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test1234@test.com", "test1234", "Test1234!")
+        account_books = [
+            AccountBook.objects.create(date_at="2023-02-01", owner=cls.user),
+            AccountBook.objects.create(date_at="2023-02-28 23:59:59", owner=cls.user),
+        ]
+        # 내역이 없음, 빈 문자열, 10자, 10자 초과 / 금액 0, 음수, 천 단위 이상
+        details = [None, "", "짧은 내역", "0123456789", "01234567890", "(주) 소고기 짱 좋아"]
+        moneys = [0, -500, 999, 1000, 1234567, 30000]
+        for index, (detail, money) in enumerate(zip(details, moneys)):
+            Expense.objects.create(
+                money=money,
+                expense_detail=detail,
+                payment_method="현금" if index % 2 else "카드",
+                owner=cls.user,
+                account_book=account_books[index % 2],
+            )
+        cls.expenses = Expense.objects.filter(owner=cls.user).order_by("id")
+
+    def test_list_values_same_json(self):
+        """
+        ExpenseListSerializer의 values 함수를 검증하는 함수
+        case: 성공(serializer.data와 같은 JSON)
+        """
+        data = ExpenseListSerializer(self.expenses, many=True).data
+        values = ExpenseListSerializer.values(self.expenses)
+        self.assertEqual(JSONRenderer().render(values), JSONRenderer().render(data))
+
+    def test_search_list_values_same_json(self):
+        """
+        ExpenseSearchListSerializer의 values 함수를 검증하는 함수
+        case: 성공(serializer.data와 같은 JSON)
+        """
+        data = ExpenseSearchListSerializer(self.expenses.select_related("account_book"), many=True).data
+        values = ExpenseSearchListSerializer.values(self.expenses)
+        self.assertEqual(JSONRenderer().render(values), JSONRenderer().render(data))
@@ -8,6 +8,7 @@ from . import views
 urlpatterns = [
     # Expense
     path("", views.ExpenseListView.as_view(), name="expense-list"),
+    path("async/", views.ExpenseListAsyncView.as_view(), name="expense-list-async"),
     path("<int:account_book_id>/", views.ExpenseCreateView.as_view(), name="expense-create"),
     path("details/<int:expense_id>/", views.ExpenseDetailView.as_view(), name="expense-detail"),    
     
@@ -18,7 +19,9 @@ urlpatterns = [
     # Expense Category
     path("categories/", views.ExpenseCategoryView.as_view(), name="expense-category"),
     path("categories/search/", views.ExpenseCategorySearchView.as_view(), name="expense-category-search"),
+    path("categories/search/async/", views.ExpenseCategorySearchAsyncView.as_view(), name="expense-category-search-async"),
     
     # Expense Stat
     path("categories/stat/", views.ExpenseCategoryStatView.as_view(), name="expense-caregory-stat"),
+    path("categories/stat/async/", views.ExpenseCategoryStatAsyncView.as_view(), name="expense-caregory-stat-async"),
 ]
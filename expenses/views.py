@@ -6,9 +6,12 @@ from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 
 # django
-from django.db import IntegrityError
+from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Q, Sum
+from django.http import Http404
+from django.core.exceptions import ValidationError
 from django.shortcuts import get_list_or_404
 
 # drf_yasg
@@ -26,7 +29,12 @@ from .serializers import (
     ExpenseCategorySerializer,
 )
 from account_books.models import AccountBook
-from payhere.permissions import IsOwner
+from payhere.permissions import IsOwner, GenericAPIException
+from payhere.middleware import serializer_timing
+from payhere.renderers import streaming_list_response
+from payhere.async_views import AsyncAPIView, aget_list_or_404, json_response
+from payhere.cache import cache_response, stale_while_revalidate
+from payhere.idempotency import idempotent, IDEMPOTENCY_KEY_HEADER
 from payhere.utils import ExpenseCalcUtil, UrlUtil
 
 # Swagger Parameter
@@ -65,6 +73,13 @@ sub_param_config = openapi.Parameter(
     type=openapi.TYPE_STRING,
 )
 
+idempotency_key_param_config = openapi.Parameter(
+    IDEMPOTENCY_KEY_HEADER,
+    in_=openapi.IN_HEADER,
+    description="재시도해도 한 번만 처리할 요청 고유 키 (같은 키로 다시 요청하면 첫 응답을 반환)",
+    type=openapi.TYPE_STRING,
+)
+
 
 class ExpenseListView(APIView):
     """일간 지출 내역 리스트 조회
@@ -76,8 +91,16 @@ class ExpenseListView(APIView):
     permission_classes = [IsOwner]
 
     def get_objects(self, date):
-        account_book = get_object_or_404(AccountBook, date_at=date)
-        self.check_object_permissions(self.request, account_book)
+        # (owner, date_at) 인덱스로 본인 가계부를 조회하고, 없을 때만 다른 사용자의 가계부가 있는지 확인합니다. (403 / 404)
+        try:
+            account_book = AccountBook.objects.filter(owner=self.request.user.id, date_at=date).first()
+            other_exists = account_book is None and AccountBook.objects.filter(date_at=date).exists()
+        except (TypeError, ValueError, ValidationError):
+            account_book, other_exists = None, False
+        if other_exists:
+            raise GenericAPIException(status.HTTP_403_FORBIDDEN, detail={"detail": "접근 권한 없습니다."})
+        if account_book is None:
+            raise Http404
         expenses = account_book.expenses
         return expenses
 
@@ -89,8 +112,28 @@ class ExpenseListView(APIView):
     def get(self, request):
         date = request.GET.get("date", None)
         expenses = self.get_objects(date)
-        serializer = ExpenseListSerializer(expenses, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(ExpenseListSerializer.values(expenses), status=status.HTTP_200_OK)
+
+
+class ExpenseListAsyncView(AsyncAPIView):
+    """일간 지출 내역 리스트 조회 (async)
+
+    get: ExpenseListView의 get과 같은 응답을 async ORM으로 조회합니다. (ASGI)
+        return: id, money, expense_detail, payment_method
+    """
+
+    async def get(self, request):
+        date = request.GET.get("date", None)
+        try:
+            account_book = await AccountBook.objects.filter(owner=request.user.id, date_at=date).afirst()
+            other_exists = account_book is None and await AccountBook.objects.filter(date_at=date).aexists()
+        except (TypeError, ValueError, ValidationError):
+            account_book, other_exists = None, False
+        if other_exists:
+            raise GenericAPIException(status.HTTP_403_FORBIDDEN, detail={"detail": "접근 권한 없습니다."})
+        if account_book is None:
+            raise Http404
+        return json_response(await ExpenseListSerializer.avalues(account_book.expenses.all()))
 
 
 class ExpenseCreateView(APIView):
@@ -99,29 +142,34 @@ class ExpenseCreateView(APIView):
     get_objects: 객체를 조회해 사용자만 접근 가능하도록 검증 후 객체 반환합니다.
     post: money, expense_detail, payment_method, memo, category를 입력받아 지출 내역을 생성합니다.
         sub_total_money_expense 함수를 통해 상위 가계부의 전체금액에 지출 금액만큼 뺀 값이 반영됩니다. 
+        가계부를 select_for_update로 잠근 transaction 안에서 생성과 금액 반영을 처리합니다.
+        Idempotency-Key 헤더가 있으면 같은 키로 재시도한 요청에는 생성하지 않고 첫 응답을 반환합니다. (idempotent)
     """
     permission_classes = [IsOwner]
 
     def get_objects(self, account_book_id):
-        account_book = get_object_or_404(AccountBook, id=account_book_id)
+        account_book = get_object_or_404(AccountBook.objects.select_for_update(), id=account_book_id)
         self.check_object_permissions(self.request, account_book)
         return account_book
 
     @swagger_auto_schema(
         request_body=ExpenseCreateSerializer,
+        manual_parameters=[idempotency_key_param_config],
         operation_summary="지출 내역 생성",
-        responses={201: "성공",400: "인풋값 에러",403: "권한 없음",404: "찾을 수 없음",500: "서버 에러"},
+        responses={201: "성공",400: "인풋값 에러",403: "권한 없음",404: "찾을 수 없음",422: "다른 요청에 사용한 Idempotency-Key",500: "서버 에러"},
     )
+    @idempotent
     def post(self, request, account_book_id):
-        account_book = self.get_objects(account_book_id)
-        serializer = ExpenseCreateSerializer(data=request.data)
-        if serializer.is_valid():
-            serializer.save(owner=request.user, account_book=account_book)
-            ExpenseCalcUtil.sub_total_money_expense(
-                account_book, int(request.data["money"])
-                )
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            account_book = self.get_objects(account_book_id)
+            serializer = ExpenseCreateSerializer(data=request.data, context={"request": request})
+            if serializer.is_valid():
+                expense = serializer.save(owner=request.user, account_book=account_book)
+                ExpenseCalcUtil.sub_total_money_expense(
+                    account_book, expense.money
+                    )
+                return Response(serializer.data, status=status.HTTP_201_CREATED)
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class ExpenseDetailView(APIView):
@@ -132,15 +180,26 @@ class ExpenseDetailView(APIView):
         return id, money, expense_detail, payment_method, memo, category
     post: 특정 객체를 가져와 null 값으로 만들어 새롭게 저장하여 복제합니다.
         sub_total_money_expense 함수를 통해 상위 가계부의 전체금액에 지출 금액만큼 뺀 값이 반영됩니다. 
-    put: 특정 지출 내역을 수정하며 money를 입력받지 않을 경우 KeyError 발생으로 예외처리를 했습니다.
+        Idempotency-Key 헤더가 있으면 같은 키로 재시도한 요청에는 복제하지 않고 첫 응답을 반환합니다. (idempotent)
+    put: 특정 지출 내역을 수정하며 입력받은 필드만 update_fields로 저장합니다.
         mix_total_money_expense 함수를 통해 상위 가계부의 전체금액에 지출 금액만큼 빼고 더한 값이 반영됩니다.
+        account_book을 입력받으면 해당 일자로 이동하며 move_total_money_expense 함수로 두 가계부에 반영됩니다.
     delete: 특정 지출 내역을 삭제합니다.
         add_total_money_expense 함수를 통해 상위 가계부의 전체 금액에 지출 금액만큼 더한 값이 반영됩니다.
+
+    post, put, delete는 transaction 안에서 지출 내역과 가계부를 하나의 join 쿼리로
+    select_for_update 하여 동시 수정 시에도 일 총 금액이 어긋나지 않도록 합니다.
+    다른 일자로 이동하는 put은 두 가계부를 id 순으로 먼저 잠근 뒤 내역을 잠급니다. (AccountBook.lock)
     """
     permission_classes = [IsOwner]
 
-    def get_objects(self, expense_id):
-        expense = get_object_or_404(Expense, id=expense_id)
+    def get_objects(self, expense_id, for_update=False):
+        queryset = Expense.objects.select_related("account_book")
+        if for_update:
+            queryset = queryset.select_for_update()
+        else:
+            queryset = queryset.select_related("category__parent")
+        expense = get_object_or_404(queryset, id=expense_id)
         self.check_object_permissions(self.request, expense)
         return expense
 
@@ -150,20 +209,24 @@ class ExpenseDetailView(APIView):
     )
     def get(self, request, expense_id):
         expense = self.get_objects(expense_id)
-        serializer = ExpenseDetailSerializer(expense)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        with serializer_timing():
+            data = ExpenseDetailSerializer(expense).data
+        return Response(data, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
+        manual_parameters=[idempotency_key_param_config],
         operation_summary="특정 지출 복제",
-        responses={200: "성공", 403: "권한 없음", 404: "찾을 수 없음", 500: "서버 에러"},
+        responses={200: "성공", 403: "권한 없음", 404: "찾을 수 없음", 422: "다른 요청에 사용한 Idempotency-Key", 500: "서버 에러"},
     )
+    @idempotent
     def post(self, reuqest, expense_id):
-        expense = self.get_objects(expense_id)
-        expense.id = None
-        expense.save()
-        ExpenseCalcUtil.sub_total_money_expense(
-            expense.account_book, expense.money
-            )
+        with transaction.atomic():
+            expense = self.get_objects(expense_id, for_update=True)
+            expense.id = None
+            expense.save()
+            ExpenseCalcUtil.sub_total_money_expense(
+                expense.account_book, expense.money
+                )
         return Response({"message": "복사 완료"}, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
@@ -172,19 +235,32 @@ class ExpenseDetailView(APIView):
         responses={200: "성공", 400: "인풋값 에러", 403: "권한 없음", 404: "찾을 수 없음", 500: "서버 에러"},
     )
     def put(self, request, expense_id):
-        try:
-            expense = self.get_objects(expense_id)
+        with transaction.atomic():
+            # 다른 일자로 이동할 수 있으면 지출 내역을 잠그기 전에 두 가계부를 id 순으로 먼저 잠급니다.
+            # (서로 반대 방향으로 이동하는 요청이 상대의 가계부를 기다리며 교착되지 않도록)
+            moving = "account_book" in request.data
+            expense = self.get_objects(expense_id, for_update=not moving)
+            serializer = ExpenseCreateSerializer(expense, data=request.data, partial=True, context={"request": request})
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            if moving:
+                account_books = AccountBook.lock({expense.account_book_id, serializer.validated_data["account_book"].id})
+                expense = serializer.instance = self.get_objects(expense_id, for_update=True)
+
             expense_money = expense.money
-            serializer = ExpenseCreateSerializer(expense, data=request.data, partial=True)
-            if serializer.is_valid():
-                serializer.save()
+            current_account_book = expense.account_book
+            request_account_book = serializer.validated_data.get("account_book", current_account_book)
+            if request_account_book.id != current_account_book.id:
+                request_account_book = account_books[request_account_book.id]
+                expense = serializer.save(account_book=request_account_book)
+                ExpenseCalcUtil.move_total_money_expense(
+                    current_account_book, request_account_book, expense_money, expense.money
+                    )
+            else:
+                expense = serializer.save()
                 ExpenseCalcUtil.mix_total_money_expense(
-                    expense.account_book, expense_money, int(request.data["money"])
+                    current_account_book, expense_money, expense.money
                     )
-                return Response(serializer.data, status=status.HTTP_200_OK)
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-        except KeyError:
             return Response(serializer.data, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
@@ -192,11 +268,12 @@ class ExpenseDetailView(APIView):
         responses={204: "성공", 403: "권한 없음", 404: "찾을 수 없음", 500: "서버 에러"},
     )
     def delete(self, request, expense_id):
-        expense = self.get_objects(expense_id)
-        ExpenseCalcUtil.add_total_money_expense(
-            expense.account_book, expense.money
-            )
-        expense.delete()
+        with transaction.atomic():
+            expense = self.get_objects(expense_id, for_update=True)
+            ExpenseCalcUtil.add_total_money_expense(
+                expense.account_book, expense.money
+                )
+            expense.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -248,17 +325,20 @@ class ExpenseShareUrlView(APIView):
     def get(self, request):
         encode_key = request.GET.get("key", None)
         expense_id = UrlUtil.get_query_id(encode_key)
-        expense_url = get_object_or_404(ExpenseURL, expense_id=expense_id)
+        expense_url = get_object_or_404(
+            ExpenseURL.objects.select_related("expense__owner", "expense__account_book", "expense__category__parent"), expense_id=expense_id
+        )
         if expense_url.expired_at < timezone.now():
             return Response({"message": "만료된 URL 입니다."}, status=status.HTTP_400_BAD_REQUEST)
-        serializer = ExpenseShareUrlSerializer(expense_url.expense)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        with serializer_timing():
+            data = ExpenseShareUrlSerializer(expense_url.expense).data
+        return Response(data, status=status.HTTP_200_OK)
 
 
 class ExpenseCategoryView(APIView):
     """지출 카테고리 리스트 조회
     
-    get: 반복문을 통해 고정된 카테고리를 하위 카테고리가 상위 카테고리에 종속되도록
+    get: 전체 카테고리를 한 번에 조회해 고정된 카테고리를 하위 카테고리가 상위 카테고리에 종속되도록
         만든 다음 반환합니다. 
         return main_category_name, sub_category_name
     """
@@ -269,13 +349,23 @@ class ExpenseCategoryView(APIView):
         responses={200: "성공", 401: "인증 에러", 404: "찾을 수 없음", 500: "서버 에러"},
     )
     def get(self, reuqest):
+        # 전체 카테고리를 트리 순서(tree_id, lft)로 한 번에 조회한 뒤 상위 카테고리별로 묶습니다.
+        main_categories = {}
+        sub_categories = {}
+        for category in ExpenseCategory.objects.order_by("tree_id", "lft"):
+            if category.parent_id is None:
+                main_categories[category.id] = category
+            else:
+                sub_categories.setdefault(category.tree_id, []).append(category)
+
         category_data = {}
-        
         for i in range(1, 15):
-            main_category = get_object_or_404(ExpenseCategory, id=i)
-            sub_categories = main_category.get_descendants(include_self=False)
-            sub_categories_serializer = ExpenseCategorySerializer(sub_categories, many=True)
-            category_data[f"({i}) {main_category.name}"] = sub_categories_serializer.data
+            main_category = main_categories.get(i)
+            if main_category is None:
+                raise Http404
+            sub_categories_serializer = ExpenseCategorySerializer(sub_categories.get(main_category.tree_id, []), many=True)
+            with serializer_timing():
+                category_data[f"({i}) {main_category.name}"] = sub_categories_serializer.data
         return Response(category_data, status=status.HTTP_200_OK)
 
 
@@ -285,6 +375,9 @@ class ExpenseCategorySearchView(APIView):
     get: url 매개변수로 date, main, sub을 받아 카테고리에 맞게 쿼리를 조회하여 반환하며
         기본값으로 main과 sub이 없을 시 date를 기준으로 월간의 모든 지출 내역들을 반환합니다. 
         또한 매개변수 date를 잘못 입력 할 시 예외처리를 하였습니다. 
+        내역이 JSON_STREAM_CHUNK_SIZE개보다 많으면 나눠서 조회해 StreamingHttpResponse로 응답합니다.
+        (이 경우 Accept 헤더와 관계없이 application/json으로 응답하며 캐시하지 않습니다.)
+        JSON_STREAM_CHUNK_SIZE개 이하인 응답은 사용자 데이터 버전별로 캐시합니다. (cache_response)
         return id, money, expense_detail, payment_method, date_at
     """
     permission_classes = [IsAuthenticated]
@@ -294,6 +387,7 @@ class ExpenseCategorySearchView(APIView):
         operation_summary="월간 지출 카테고리 검색 조회",
         responses={200: "성공", 400: "매개변수 에러", 401: "인증 에러", 404: "찾을 수 없음", 500: "서버 에러"},
     )
+    @cache_response("expense-category-search")
     def get(self, request):
         try:
             date = request.GET.get("date", None).split("-")
@@ -302,66 +396,121 @@ class ExpenseCategorySearchView(APIView):
             
             year = date[0]
             month = date[1]
+            # 내역이 많으면 chunk_size개씩 나눠서 조회/응답합니다.
+            chunk_size = settings.JSON_STREAM_CHUNK_SIZE
 
             if main or sub:
                 select_expenses = (
                     Expense.objects.select_related("account_book").select_related("category").filter \
                     (account_book__in=get_list_or_404(AccountBook, date_at__year=year, date_at__month=month, owner=request.user),
                     category__in=get_list_or_404(ExpenseCategory, Q(name=main) | Q(name=sub))))
-                select_serializer = ExpenseSearchListSerializer(select_expenses, many=True)
-                return Response(select_serializer.data, status=status.HTTP_200_OK)
+                select_expenses = ExpenseSearchListSerializer.iter_values(select_expenses, chunk_size)
+                return streaming_list_response(select_expenses, chunk_size, status=status.HTTP_200_OK)
 
             all_expenses = Expense.objects.select_related("account_book").filter \
                 (account_book__in=get_list_or_404(AccountBook,date_at__year=year, date_at__month=month, owner=request.user))
-            all_serializer = ExpenseSearchListSerializer(all_expenses, many=True)
-            return Response(all_serializer.data, status=status.HTTP_200_OK)
+            all_expenses = ExpenseSearchListSerializer.iter_values(all_expenses, chunk_size)
+            return streaming_list_response(all_expenses, chunk_size, status=status.HTTP_200_OK)
 
         except IndexError:
             return Response({"message": "올바른 매개변수의 날짜를 입력해주세요.(Ex: YYYY-MM)"}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ExpenseCategoryStatView(APIView):
-    """월간 지출 내역 통계
-    
-    get: url 매개변수로 date 받아 쿼리를 조회한 후 get_category 함수로 상위 카테고리를 기준으로 찾아 
-        중복된 카테고리를 제거 후 리스트를 반복문으로 카테고리가 존재하면 get_amount_for_category
-        존재하지 않으면 get_amount_for_category_null을 통해 해당 지출 내역 총액 데이터를 반환합니다.
-        또한 매개변수 date를 잘못 입력 할 시 예외처리를 하였습니다. 
-        return main_category_name, amount
+class ExpenseCategorySearchAsyncView(AsyncAPIView):
+    """월간 지출 카테고리 리스트 조회 (async)
+
+    get: ExpenseCategorySearchView의 get과 같은 응답을 async ORM으로 조회합니다. (ASGI)
+        응답 캐시, 스트리밍 응답은 사용하지 않습니다.
+        return id, money, expense_detail, payment_method, date_at
     """
-    permission_classes = [IsAuthenticated]
 
-    def get_amount_for_category_null(self, expense_list):
-        expenses = expense_list.filter(category__isnull=True)
+    async def get(self, request):
+        try:
+            date = request.GET.get("date", None).split("-")
+            main = request.GET.get("main", None)
+            sub = request.GET.get("sub", None)
+
+            year = date[0]
+            month = date[1]
+
+            account_books = await aget_list_or_404(
+                AccountBook.objects.filter(date_at__year=year, date_at__month=month, owner=request.user).values_list("id", flat=True)
+            )
+            expenses = Expense.objects.filter(account_book__in=account_books)
+            if main or sub:
+                categories = await aget_list_or_404(
+                    ExpenseCategory.objects.filter(Q(name=main) | Q(name=sub)).values_list("id", flat=True)
+                )
+                expenses = expenses.filter(category__in=categories)
+            return json_response(await ExpenseSearchListSerializer.avalues(expenses))
+
+        except (IndexError, AttributeError):
+            return json_response({"message": "올바른 매개변수의 날짜를 입력해주세요.(Ex: YYYY-MM)"}, status=status.HTTP_400_BAD_REQUEST)
+
 
-        amount = 0
+def get_amount_for_categories(expense_list):
+    """지출 내역 queryset의 상위 카테고리(트리)별 총액을 한 번의 집계 쿼리로 구합니다. (카테고리가 없으면 "없음")"""
+    amounts = list(expense_list.values("category__tree_id").annotate(amount=Sum("money")).order_by())
+    main_categories = dict(
+        ExpenseCategory.objects.filter(level=0, tree_id__in=[amount["category__tree_id"] for amount in amounts])
+        .values_list("tree_id", "name")
+    )
 
-        for expense in expenses:
-            amount += expense.money
-        return {"amount": str(amount)}
+    final = {}
+    for amount in amounts:
+        name = main_categories.get(amount["category__tree_id"], "없음")
+        final[name] = {"amount": str(amount["amount"])}
+    return final
 
-    def get_amount_for_category(self, category, expense_list):
-        expenses = expense_list.filter(category__in=ExpenseCategory.objects.get(name=category).get_descendants(include_self=True))
 
-        amount = 0
+async def aget_amount_for_categories(expense_list):
+    """get_amount_for_categories의 async ORM 버전"""
+    amounts = [amount async for amount in expense_list.values("category__tree_id").annotate(amount=Sum("money")).order_by()]
+    main_categories = {
+        tree_id: name
+        async for tree_id, name in ExpenseCategory.objects.filter(
+            level=0, tree_id__in=[amount["category__tree_id"] for amount in amounts]
+        ).values_list("tree_id", "name")
+    }
 
-        for expense in expenses:
-            amount += expense.money
-        return {"amount": str(amount)}
+    final = {}
+    for amount in amounts:
+        name = main_categories.get(amount["category__tree_id"], "없음")
+        final[name] = {"amount": str(amount["amount"])}
+    return final
 
-    def get_category(self, expense):
-        try:
-            if not expense.category.parent:
-                return expense.category
 
-        except AttributeError:
-            return None
+def get_category_data(user_id, year, month):
+    """해당 월의 카테고리별 총액 (가계부가 없으면 Http404 / 통계, 월간 대시보드에서 사용)"""
+
+    def compute():
+        expenses = Expense.objects.filter(
+            account_book__in=get_list_or_404(AccountBook, date_at__year=year, date_at__month=month, owner=user_id)
+        )
+        return get_amount_for_categories(expenses)
+
+    return stale_while_revalidate("expense-stat", user_id, f"{year}-{month}", compute)
+
+
+class ExpenseCategoryStatView(APIView):
+    """월간 지출 내역 통계
+    
+    get: url 매개변수로 date 받아 해당 월의 지출 내역을 상위 카테고리(트리) 기준으로 묶어
+        get_amount_for_categories 함수로 카테고리별 총액을 한 번의 집계 쿼리로 구해 반환합니다.
+        카테고리가 없는 지출 내역은 "없음"으로 반환합니다.
+        또한 매개변수 date를 잘못 입력 할 시 예외처리를 하였습니다. 
+        응답은 사용자 데이터 버전별로 캐시합니다. (cache_response)
+        동시에 들어온 같은 월의 통계 계산은 한 번만 실행하고, 다시 계산하는 동안에는 이전 결과를 반환합니다. (stale_while_revalidate)
+        return main_category_name, amount
+    """
+    permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
         manual_parameters=[month_param_config],
         operation_summary="월간 지출 내역 통계",
         responses={200: "성공", 400: "매개변수 에러", 401: "인증 에러", 404: "찾을 수 없음", 500: "서버 에러"},
     )
+    @cache_response("expense-caregory-stat")
     def get(self, request):
         try:
             date = request.GET.get("date", None).split("-")
@@ -369,20 +518,33 @@ class ExpenseCategoryStatView(APIView):
             year = date[0]
             month = date[1]
 
-            expenses = (
-                Expense.objects.select_related("account_book").select_related("category").filter \
-                (account_book__in=get_list_or_404(AccountBook, date_at__year=year, date_at__month=month, owner=request.user)))
-
-            final = {}
-            categories = list(set(map(self.get_category, expenses)))
-
-            for category in categories:
-                if category == None:
-                    final["없음"] = self.get_amount_for_category_null(expenses)
-                    
-                else:
-                    final[str(category)] = self.get_amount_for_category(category, expenses)
-            return Response({"category_data": final}, status=status.HTTP_200_OK)
+            category_data = get_category_data(request.user.id, year, month)
+            return Response({"category_data": category_data}, status=status.HTTP_200_OK)
 
         except IndexError:
             return Response({"message": "올바른 매개변수의 날짜를 입력해주세요.(Ex: YYYY-MM)"}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ExpenseCategoryStatAsyncView(AsyncAPIView):
+    """월간 지출 내역 통계 (async)
+
+    get: ExpenseCategoryStatView의 get과 같은 응답을 async ORM으로 조회합니다. (ASGI)
+        응답 캐시, stale_while_revalidate는 사용하지 않습니다.
+        return main_category_name, amount
+    """
+
+    async def get(self, request):
+        try:
+            date = request.GET.get("date", None).split("-")
+
+            year = date[0]
+            month = date[1]
+
+            account_books = await aget_list_or_404(
+                AccountBook.objects.filter(date_at__year=year, date_at__month=month, owner=request.user).values_list("id", flat=True)
+            )
+            expenses = Expense.objects.filter(account_book__in=account_books)
+            return json_response({"category_data": await aget_amount_for_categories(expenses)})
+
+        except (IndexError, AttributeError):
+            return json_response({"message": "올바른 매개변수의 날짜를 입력해주세요.(Ex: YYYY-MM)"}, status=status.HTTP_400_BAD_REQUEST)
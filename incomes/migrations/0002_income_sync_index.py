@@ -0,0 +1,16 @@
+# Generated by Django 4.1.5 on 2023-02-27 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("incomes", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="income",
+            index=models.Index(fields=["owner", "updated_at", "id"], name="income_owner_sync_idx"),
+        ),
+    ]
@@ -36,6 +36,10 @@ class Income(TimeStampModel):
 
     class Meta:
         db_table = "Income"
+        indexes = [
+            # 동기화 조회 (owner, 수정일, id 순 keyset)
+            models.Index(fields=["owner", "updated_at", "id"], name="income_owner_sync_idx"),
+        ]
 
     def __str__(self):
         return f"[{self.created_at}]{self.money}원"
@@ -4,6 +4,10 @@ from rest_framework import serializers
 # django
 from django.utils.dateformat import DateFormat
 
+# payhere
+from payhere.utils import FormatUtil
+from payhere.serializers import PrefetchedPrimaryKeyRelatedField
+
 # incomes
 from .models import Income, IncomeCategory
 
@@ -27,6 +31,24 @@ class IncomeListSerializer(serializers.ModelSerializer):
     def get_income_detail(sefl, obj):
         return obj.brief_income_detail
 
+    @staticmethod
+    def values(queryset):
+        """필요한 컬럼만 values_list로 조회해 serializer.data와 같은 list를 반환합니다."""
+        money, brief_detail = FormatUtil.money, FormatUtil.brief_detail
+        return [
+            {"id": id, "money": money(amount), "income_detail": brief_detail(detail), "payment_method": payment_method}
+            for id, amount, detail, payment_method in queryset.values_list("id", "money", "income_detail", "payment_method")
+        ]
+
+    @staticmethod
+    async def avalues(queryset):
+        """values의 async 버전 (async ORM으로 조회합니다.)"""
+        money, brief_detail = FormatUtil.money, FormatUtil.brief_detail
+        return [
+            {"id": id, "money": money(amount), "income_detail": brief_detail(detail), "payment_method": payment_method}
+            async for id, amount, detail, payment_method in queryset.values_list("id", "money", "income_detail", "payment_method")
+        ]
+
 
 class IncomeDetailSerializer(serializers.ModelSerializer):
     money = serializers.SerializerMethodField()
@@ -52,8 +74,8 @@ class IncomeDetailSerializer(serializers.ModelSerializer):
             if not obj.category.parent_id:
                 return obj.category.name
 
-            # 상위 카테고리가 있을 경우
-            main = IncomeCategory.objects.get(id=obj.category.parent_id)
+            # 상위 카테고리가 있을 경우 (조회할 때 select_related("category__parent")로 함께 가져옵니다.)
+            main = obj.category.parent
             sub = obj.category.name
             return f"{main} >> {sub}"
 
@@ -63,6 +85,9 @@ class IncomeDetailSerializer(serializers.ModelSerializer):
 
 
 class IncomeCreateSerializer(serializers.ModelSerializer):
+    # 일괄 처리에서 미리 조회한 카테고리/가계부를 사용합니다. (context["prefetched"])
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
+
     class Meta:
         model = Income
         fields = (
@@ -71,6 +96,7 @@ class IncomeCreateSerializer(serializers.ModelSerializer):
             "payment_method",
             "memo",
             "category",
+            "account_book",
         )
         extra_kwargs = {
             "money": {
@@ -80,8 +106,21 @@ class IncomeCreateSerializer(serializers.ModelSerializer):
                     "invalid": "숫자만 입력해주세요.",
                 }
             },
+            "account_book": {"required": False, "write_only": True},
         }
 
+    def validate_account_book(self, value):
+        # 다른 사용자의 가계부로 이동 불가
+        if value.owner_id != self.context.get("request").user.id:
+            raise serializers.ValidationError("접근 권한 없습니다.")
+        return value
+
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, "updated_at"])
+        return instance
+
 
 class IncomeSearchListSerializer(serializers.ModelSerializer):
     money = serializers.SerializerMethodField()
@@ -101,6 +140,43 @@ class IncomeSearchListSerializer(serializers.ModelSerializer):
     def get_date_at(self, obj):
         return DateFormat(obj.account_book.date_at).format("Y-m-d")
 
+    @classmethod
+    def values(cls, queryset):
+        """필요한 컬럼만 values_list로 조회해 serializer.data와 같은 list를 반환합니다."""
+        return list(cls.iter_values(queryset))
+
+    @staticmethod
+    def iter_values(queryset, chunk_size=None):
+        """values와 같은 dict를 한 행씩 반환합니다. (chunk_size를 주면 queryset.iterator로 나눠서 조회)"""
+        money, brief_detail, date = FormatUtil.money, FormatUtil.brief_detail, FormatUtil.date
+        rows = queryset.values_list("id", "money", "income_detail", "payment_method", "account_book__date_at")
+        if chunk_size:
+            rows = rows.iterator(chunk_size=chunk_size)
+        for id, amount, detail, payment_method, date_at in rows:
+            yield {
+                "id": id,
+                "money": money(amount),
+                "income_detail": brief_detail(detail),
+                "payment_method": payment_method,
+                "date_at": date(date_at),
+            }
+
+    @staticmethod
+    async def avalues(queryset):
+        """values의 async 버전 (async ORM으로 조회합니다.)"""
+        money, brief_detail, date = FormatUtil.money, FormatUtil.brief_detail, FormatUtil.date
+        rows = queryset.values_list("id", "money", "income_detail", "payment_method", "account_book__date_at")
+        return [
+            {
+                "id": id,
+                "money": money(amount),
+                "income_detail": brief_detail(detail),
+                "payment_method": payment_method,
+                "date_at": date(date_at),
+            }
+            async for id, amount, detail, payment_method, date_at in rows
+        ]
+
 
 class IncomeShareUrlSerializer(serializers.ModelSerializer):
     date_at = serializers.SerializerMethodField("get_date_at")
@@ -135,8 +211,8 @@ class IncomeShareUrlSerializer(serializers.ModelSerializer):
             if not obj.category.parent_id:
                 return obj.category.name
 
-            # 상위 카테고리가 있을 경우
-            main = IncomeCategory.objects.get(id=obj.category.parent_id)
+            # 상위 카테고리가 있을 경우 (조회할 때 select_related("category__parent")로 함께 가져옵니다.)
+            main = obj.category.parent
             sub = obj.category.name
             return f"{main} >> {sub}"
 
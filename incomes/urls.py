@@ -8,6 +8,7 @@ from . import views
 urlpatterns = [
     # Income
     path("", views.IncomeListView.as_view(), name="income-list"),
+    path("async/", views.IncomeListAsyncView.as_view(), name="income-list-async"),
     path("<int:account_book_id>/", views.IncomeCreateView.as_view(), name="income-create"),
     path("details/<int:income_id>/", views.IncomeDetailView.as_view(), name="income-detail"),
     
@@ -18,7 +19,9 @@ urlpatterns = [
     # Income Category
     path("categories/", views.IncomeCategoryView.as_view(), name="income-category"),
     path("categories/search/", views.IncomeCategorySearchView.as_view(), name="income-category-search"),
+    path("categories/search/async/", views.IncomeCategorySearchAsyncView.as_view(), name="income-category-search-async"),
     
     # Income Stat
     path("categories/stat/", views.IncomeCategoryStatView.as_view(), name="income-caregory-stat"),
+    path("categories/stat/async/", views.IncomeCategoryStatAsyncView.as_view(), name="income-caregory-stat-async"),
 ]
@@ -0,0 +1,62 @@
+# rest_framework
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound
+
+# rest_framework_simplejwt
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+# django
+from django.http import Http404, HttpResponse
+from django.views import View
+
+# asgiref
+from asgiref.sync import sync_to_async
+
+# payhere
+from payhere.renderers import FastJSONRenderer
+
+
+def json_response(data, status=status.HTTP_200_OK):
+    return HttpResponse(FastJSONRenderer().render(data), status=status, content_type="application/json")
+
+
+async def aget_list_or_404(queryset):
+    """get_list_or_404의 async 버전 (비어 있으면 Http404)"""
+    obj_list = [obj async for obj in queryset]
+    if not obj_list:
+        raise Http404
+    return obj_list
+
+
+class AsyncAPIView(View):
+    """ASGI에서 DB 조회를 기다리는 동안 워커를 붙잡지 않는 조회용 async view
+
+    DRF APIView는 async handler를 지원하지 않으므로 Django View에서 JWT 인증(없거나 잘못되면 401)과
+    Http404(404), APIException(권한 에러 등) 처리를 DRF와 같은 응답 형식으로 합니다.
+    handler(async def get)는 HttpResponse를 반환합니다.
+    """
+
+    http_method_names = ["get", "options"]
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            result = await sync_to_async(JWTAuthentication().authenticate)(request)
+        except APIException as e:
+            return self.error_response(e, status.HTTP_401_UNAUTHORIZED)
+        if result is None:
+            return self.error_response(NotAuthenticated(), status.HTTP_401_UNAUTHORIZED)
+        request.user = result[0]
+
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except Http404:
+            return self.error_response(NotFound(), status.HTTP_404_NOT_FOUND)
+        except APIException as e:
+            return self.error_response(e, e.status_code)
+
+    def error_response(self, exc, status_code):
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+        response = json_response(data, status=status_code)
+        if status_code == status.HTTP_401_UNAUTHORIZED:
+            response["WWW-Authenticate"] = JWTAuthentication().authenticate_header(self.request)
+        return response
@@ -0,0 +1,308 @@
+# django
+from django.urls import reverse
+from django.db import connection
+from django.test import Client
+
+# python
+import math
+import asyncio
+import time
+import uuid
+import random
+from collections import defaultdict
+from urllib.parse import urlsplit
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+
+# apps
+from account_books.models import AccountBook
+from expenses.models import Expense, ExpenseURL
+from incomes.models import Income, IncomeURL
+from payhere.db import QueryCounter
+
+
+# url name: (method, path, data)를 반환하는 요청 생성 함수
+ENDPOINTS = {
+    # Auth
+    "auth-signup": lambda user, rng: ("post", reverse("auth-signup"), BenchUser.signup_data()),
+    "auth-signin": lambda user, rng: ("post", reverse("auth-signin"), {"email": user.email, "password": user.password}),
+    "auth-signin-refresh": lambda user, rng: ("post", reverse("auth-signin-refresh"), {"refresh": user.refresh}),
+    "auth-verify": lambda user, rng: ("post", reverse("auth-verify"), {"token": user.access}),
+    # Account book
+    "account-book": lambda user, rng: ("get", f"{reverse('account-book')}?date={rng.choice(user.months)}", None),
+    "account-book-dashboard": lambda user, rng: ("get", f"{reverse('account-book-dashboard')}?date={rng.choice(user.months)}", None),
+    "account-book-digest": lambda user, rng: (
+        "get", f"{reverse('account-book-digest')}?start={user.months[0]}&end={user.months[-1]}&days=true", None
+    ),
+    "account-book-sync": lambda user, rng: ("get", reverse("account-book-sync"), None),
+    "account-book-detail": lambda user, rng: (
+        "get", reverse("account-book-detail", kwargs={"account_book_id": rng.choice(user.account_book_ids)}), None
+    ),
+    # Expense
+    "expense-list": lambda user, rng: ("get", f"{reverse('expense-list')}?date={rng.choice(user.days)}", None),
+    "expense-create": lambda user, rng: (
+        "post",
+        reverse("expense-create", kwargs={"account_book_id": rng.choice(user.account_book_ids)}),
+        {"money": rng.randint(1, 100) * 1000, "expense_detail": "bench", "payment_method": "카드"},
+    ),
+    "expense-detail": lambda user, rng: ("get", reverse("expense-detail", kwargs={"expense_id": rng.choice(user.expense_ids)}), None),
+    "expense-share-url": lambda user, rng: ("get", f"{reverse('expense-share-url')}?key={user.expense_share_key}", None),
+    "expense-category": lambda user, rng: ("get", reverse("expense-category"), None),
+    "expense-category-search": lambda user, rng: (
+        "get", f"{reverse('expense-category-search')}?date={rng.choice(user.months)}", None
+    ),
+    "expense-caregory-stat": lambda user, rng: ("get", f"{reverse('expense-caregory-stat')}?date={rng.choice(user.months)}", None),
+    # Income
+    "income-list": lambda user, rng: ("get", f"{reverse('income-list')}?date={rng.choice(user.days)}", None),
+    "income-create": lambda user, rng: (
+        "post",
+        reverse("income-create", kwargs={"account_book_id": rng.choice(user.account_book_ids)}),
+        {"money": rng.randint(1, 100) * 1000, "income_detail": "bench", "payment_method": "현금"},
+    ),
+    "income-detail": lambda user, rng: ("get", reverse("income-detail", kwargs={"income_id": rng.choice(user.income_ids)}), None),
+    "income-share-url": lambda user, rng: ("get", f"{reverse('income-share-url')}?key={user.income_share_key}", None),
+    "income-category": lambda user, rng: ("get", reverse("income-category"), None),
+    "income-category-search": lambda user, rng: (
+        "get", f"{reverse('income-category-search')}?date={rng.choice(user.months)}", None
+    ),
+    "income-caregory-stat": lambda user, rng: ("get", f"{reverse('income-caregory-stat')}?date={rng.choice(user.months)}", None),
+}
+
+# 조회 위주의 기본 트래픽 비율
+DEFAULT_MIX = {
+    "auth-signup": 1,
+    "auth-signin": 1,
+    "auth-signin-refresh": 1,
+    "auth-verify": 1,
+    "account-book": 10,
+    "account-book-detail": 8,
+    "expense-list": 8,
+    "expense-create": 2,
+    "expense-detail": 6,
+    "expense-share-url": 2,
+    "expense-category": 2,
+    "expense-category-search": 5,
+    "expense-caregory-stat": 4,
+    "income-list": 4,
+    "income-create": 1,
+    "income-detail": 3,
+    "income-share-url": 1,
+    "income-category": 1,
+    "income-category-search": 2,
+    "income-caregory-stat": 2,
+}
+
+
+def parse_mix(value):
+    """"account-book=10,expense-list=5" 형식의 트래픽 비율을 dict로 변환합니다."""
+    if not value:
+        return dict(DEFAULT_MIX)
+
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"알 수 없는 엔드포인트입니다: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(values, percent):
+    """정렬된 값 목록에서 nearest-rank 방식으로 백분위 값을 구합니다."""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(len(values) * percent / 100) - 1)]
+
+
+class BenchUser:
+    """로그인 토큰과 요청에 사용할 본인 가계부/지출/수익 id 목록"""
+
+    def __init__(self, client, user, password):
+        self.email = user.email
+        self.password = password
+        tokens = client.post(reverse("auth-signin"), {"email": user.email, "password": password}).json()
+        self.access = tokens["access"]
+        self.refresh = tokens["refresh"]
+
+        account_books = list(AccountBook.objects.filter(owner=user).values_list("id", "date_at"))
+        self.account_book_ids = [account_book_id for account_book_id, _ in account_books]
+        self.days = sorted({date_at.strftime("%Y-%m-%d") for _, date_at in account_books})
+        self.months = sorted({date_at.strftime("%Y-%m") for _, date_at in account_books})
+        self.expense_ids = list(Expense.objects.filter(owner=user).values_list("id", flat=True)[:200])
+        self.income_ids = list(Income.objects.filter(owner=user).values_list("id", flat=True)[:200])
+        self.expense_share_key = self.share_key(client, "expense", ExpenseURL, self.expense_ids)
+        self.income_share_key = self.share_key(client, "income", IncomeURL, self.income_ids)
+
+    def share_key(self, client, name, url_model, ids):
+        if not ids:
+            return ""
+        client.post(reverse(f"{name}-share-url-create", kwargs={f"{name}_id": ids[0]}), HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        shared_url = url_model.objects.filter(**{f"{name}_id": ids[0]}).values_list("shared_url", flat=True).first()
+        return shared_url.rsplit("/", 1)[-1] if shared_url else ""
+
+    @staticmethod
+    def signup_data():
+        nickname = f"b{uuid.uuid4().hex[:9]}"
+        return {"nickname": nickname, "email": f"{nickname}@bench.com", "password": "bench123!", "repassword": "bench123!"}
+
+
+class BenchRunner:
+    """트래픽 비율에 따라 요청 목록을 만들고 스레드마다 Client를 두어 실행합니다."""
+
+    def __init__(self, users, mix, seed=0, recorder=None):
+        self.users = users
+        self.mix = {name: weight for name, weight in mix.items() if weight > 0}
+        self.rng = random.Random(seed)
+        # 실행한 쿼리를 모을 WorkloadRecorder (advise_indexes 입력)
+        self.recorder = recorder
+
+    def plan(self, total):
+        names = self.rng.choices(list(self.mix), weights=list(self.mix.values()), k=total)
+        requests = []
+        for name in names:
+            user = self.rng.choice(self.users)
+            try:
+                method, path, data = ENDPOINTS[name](user, self.rng)
+            # 해당 유저에게 조회할 내역이 없는 경우
+            except IndexError:
+                continue
+            requests.append((name, method, path, data, user.access))
+        return requests
+
+    def worker(self, requests):
+        client = Client()
+        results = []
+        try:
+            with ExitStack() as stack:
+                if self.recorder is not None:
+                    stack.enter_context(connection.execute_wrapper(self.recorder))
+                for name, method, path, data, access in requests:
+                    counter = QueryCounter()
+                    start = time.perf_counter()
+                    with connection.execute_wrapper(counter):
+                        response = getattr(client, method)(path, data=data, HTTP_AUTHORIZATION=f"Bearer {access}")
+                    results.append((name, response.status_code, time.perf_counter() - start, counter.count))
+        finally:
+            connection.close()
+        return results
+
+    def run(self, total, threads=1):
+        return self.execute(self.plan(total), threads=threads)
+
+    def execute(self, requests, threads=1):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            chunks = executor.map(self.worker, [requests[i::threads] for i in range(threads)])
+            results = [result for chunk in chunks for result in chunk]
+        return summarize(results, time.perf_counter() - start)
+
+
+# sync url name: 같은 응답을 반환하는 async view의 url name
+ASYNC_ENDPOINTS = {
+    "account-book": "account-book-async",
+    "expense-list": "expense-list-async",
+    "expense-category-search": "expense-category-search-async",
+    "expense-caregory-stat": "expense-caregory-stat-async",
+    "income-list": "income-list-async",
+    "income-category-search": "income-category-search-async",
+    "income-caregory-stat": "income-caregory-stat-async",
+}
+
+
+class AsyncBenchRunner:
+    """BenchRunner.plan으로 만든 요청을 async view 경로로 바꿔 ASGI application에 concurrency개씩 동시에 보냅니다.
+
+    소켓 없이 ASGI 서버처럼 scope/receive/send로 application을 호출하므로 요청마다 ThreadSensitiveContext(sync_to_async
+    스레드)가 만들어지는 것까지 실제 ASGI 서버와 같습니다. (GET 요청만 지원)
+    """
+
+    def __init__(self, application, concurrency):
+        self.application = application
+        self.concurrency = concurrency
+
+    async def request(self, path, access):
+        url = urlsplit(path)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": url.path,
+            "raw_path": url.path.encode(),
+            "query_string": url.query.encode(),
+            "root_path": "",
+            "headers": [(b"host", b"testserver"), (b"authorization", f"Bearer {access}".encode())],
+            "client": ("127.0.0.1", 0),
+            "server": ("testserver", 80),
+        }
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+        response = {}
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            # 응답을 보낸 뒤에도 연결이 끊기지 않은 것처럼 기다립니다.
+            await asyncio.Future()
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+
+        await self.application(scope, receive, send)
+        return response["status"]
+
+    async def execute_all(self, requests):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = []
+
+        async def execute(name, path, access):
+            async with semaphore:
+                start = time.perf_counter()
+                status = await self.request(path, access)
+                results.append((name, status, time.perf_counter() - start, 0))
+
+        await asyncio.gather(*(execute(name, path, access) for name, _, path, _, access in requests))
+        return results
+
+    def execute(self, requests):
+        requests = [
+            (name, method, reverse(ASYNC_ENDPOINTS[name]) + path[len(reverse(name)):], data, access)
+            for name, method, path, data, access in requests
+        ]
+        start = time.perf_counter()
+        results = asyncio.run(self.execute_all(requests))
+        return summarize(results, time.perf_counter() - start)
+
+
+def summarize(results, duration):
+    """(엔드포인트, 상태코드, 응답시간, 쿼리 수) 목록을 엔드포인트별 통계로 요약합니다."""
+
+    def stats(rows):
+        latencies = sorted(row[2] * 1000 for row in rows)
+        statuses = defaultdict(int)
+        for row in rows:
+            statuses[str(row[1])] += 1
+        return {
+            "requests": len(rows),
+            "errors": sum(1 for row in rows if row[1] >= 500),
+            "statuses": dict(sorted(statuses.items())),
+            "rps": round(len(rows) / duration, 2) if duration else 0.0,
+            "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+            "queries_per_request": round(sum(row[3] for row in rows) / len(rows), 2) if rows else 0.0,
+        }
+
+    by_endpoint = defaultdict(list)
+    for row in results:
+        by_endpoint[row[0]].append(row)
+
+    return {
+        "duration_s": round(duration, 3),
+        "total": stats(results),
+        "endpoints": {name: stats(rows) for name, rows in sorted(by_endpoint.items())},
+    }
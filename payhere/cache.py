@@ -0,0 +1,202 @@
+# rest_framework
+from rest_framework.response import Response
+
+# django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# python
+import time
+import uuid
+import hashlib
+import functools
+import threading
+import contextvars
+
+# payhere
+from payhere.metrics import record_cache, record_single_flight
+from payhere.renderers import FastJSONRenderer, JSONFragment
+from payhere.utils import ConditionalUtil
+
+
+def user_version_key(user_id):
+    return f"user_version:{user_id}"
+
+
+def get_user_version(user_id):
+    """사용자 데이터 버전 (캐시에 없으면 새 값으로 시작합니다.)"""
+    key = user_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def bump_user_version(user_id):
+    """사용자의 응답 캐시를 한 번에 무효화합니다.
+
+    커밋 전에 바꾸면 다른 요청이 커밋 전 데이터를 새 버전으로 저장할 수 있으므로 커밋 후에 바꿉니다.
+    파일/DB 캐시의 incr는 원자적이지 않아 동시에 올리면 같은 값이 될 수 있으므로 매번 새 값으로 바꿉니다.
+    """
+    transaction.on_commit(lambda: cache.set(user_version_key(user_id), uuid.uuid4().hex, None))
+
+
+# cache_response가 요청마다 넣는 dict로, stale_while_revalidate가 이전 결과를 반환하면 stale을 True로 바꿉니다.
+# (run_concurrently의 스레드에는 context가 복사되므로 같은 dict를 바꿉니다.)
+response_freshness = contextvars.ContextVar("response_freshness", default=None)
+
+
+def mark_stale():
+    freshness = response_freshness.get()
+    if freshness is not None:
+        freshness["stale"] = True
+
+
+def cache_response(name):
+    """APIView의 get 응답(200)을 (사용자, 엔드포인트, 매개변수, 사용자 데이터 버전) 키로 캐시합니다.
+
+    지출/수익/가계부를 바꾸면 bump_user_version으로 버전이 바뀌어 이전 응답은 더 이상 조회되지 않습니다.
+    응답은 인코딩한 JSON bytes와 ETag로 저장하고, RESPONSE_CACHE_TIMEOUT이 0이면 캐시하지 않습니다.
+    stale_while_revalidate가 이전 결과를 반환한 응답은 새 버전 키로 저장하지 않습니다. (mark_stale)
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            timeout = settings.RESPONSE_CACHE_TIMEOUT
+            user_id = request.user.id
+            if not timeout or user_id is None:
+                return method(self, request, *args, **kwargs)
+
+            params = sorted((key, request.GET.getlist(key)) for key in request.GET)
+            digest = hashlib.md5(repr((params, sorted(kwargs.items()))).encode(), usedforsecurity=False).hexdigest()
+            key = f"response:{name}:{user_id}:{get_user_version(user_id)}:{digest}"
+
+            cached = cache.get(key)
+            record_cache(f"response:{name}", cached is not None)
+            if cached is not None:
+                content, etag = cached
+                if etag:
+                    not_modified = ConditionalUtil.not_modified(request, etag)
+                    if not_modified:
+                        return not_modified
+                    return ConditionalUtil.set_etag(Response(JSONFragment(content)), etag)
+                return Response(JSONFragment(content))
+
+            freshness = {"stale": False}
+            token = response_freshness.set(freshness)
+            try:
+                response = method(self, request, *args, **kwargs)
+            finally:
+                response_freshness.reset(token)
+            if isinstance(response, Response) and response.status_code == 200 and not freshness["stale"]:
+                cache.set(key, (FastJSONRenderer().render(response.data), response.get("ETag")), timeout)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+class Flight:
+    """single_flight에서 실행 중인 계산 (끝나면 event가 set 됩니다.)"""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+flights = {}
+flights_lock = threading.Lock()
+
+
+def single_flight(key, compute, stale=None):
+    """같은 key의 compute를 워커 안에서 한 번만 실행하고, 그동안 들어온 호출은 같은 결과(또는 예외)를 받습니다.
+
+    stale이 None이 아니면 다른 호출이 계산 중일 때 기다리지 않고 stale을 반환합니다.
+    """
+    with flights_lock:
+        flight = flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = flights[key] = Flight()
+
+    name = key.split(":", 1)[0]
+    if not leader:
+        if stale is not None:
+            record_single_flight(name, "stale")
+            return stale
+        record_single_flight(name, "shared")
+        flight.event.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    record_single_flight(name, "compute")
+    try:
+        flight.result = compute()
+        return flight.result
+    except Exception as error:
+        flight.error = error
+        raise
+    finally:
+        with flights_lock:
+            del flights[key]
+        flight.event.set()
+
+
+def stale_while_revalidate(name, user_id, params, compute):
+    """compute 결과를 (name, 사용자, params) 키로 사용자 데이터 버전과 함께 STAT_CACHE_TIMEOUT 동안 저장합니다.
+
+    버전이 같으면 저장한 결과를 반환하고, 다르면 single_flight로 다시 계산합니다.
+    다시 계산하는 동안(같은 워커 또는 캐시 lock을 잡은 다른 워커) 들어온 요청은 이전 결과를 받고,
+    이전 결과가 없으면 계산이 끝날 때까지 기다립니다. (최대 STAT_LOCK_TIMEOUT초, 넘으면 직접 계산)
+    이전 결과를 반환하면 mark_stale로 알려 cache_response가 저장하지 않도록 합니다.
+    single_flight 키에는 버전을 넣어 다른 버전으로 계산 중인 결과를 받지 않습니다.
+    """
+    timeout = settings.STAT_CACHE_TIMEOUT
+    if not timeout or user_id is None:
+        return compute()
+
+    key = f"{name}:{user_id}:{params}"
+    version = get_user_version(user_id)
+    cached = cache.get(key)
+    record_cache(f"stat:{name}", cached is not None and cached[0] == version)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    stale = cached[1] if cached is not None else None
+    result = single_flight(f"{key}:{version}", lambda: revalidate(key, version, stale, compute, timeout), stale)
+    if stale is not None and result is stale:
+        mark_stale()
+    return result
+
+
+def revalidate(key, version, stale, compute, timeout):
+    lock_key = f"lock:{key}"
+    lock_timeout = settings.STAT_LOCK_TIMEOUT
+    locked = cache.add(lock_key, version, lock_timeout)
+    if not locked:
+        # 다른 워커가 계산 중
+        if stale is not None:
+            record_single_flight(key.split(":", 1)[0], "stale")
+            return stale
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline and cache.get(lock_key) is not None:
+            time.sleep(0.05)
+            cached = cache.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+    try:
+        result = compute()
+        cache.set(key, (version, result), timeout)
+        return result
+    finally:
+        if locked:
+            cache.delete(lock_key)
@@ -0,0 +1,251 @@
+# django
+from django.conf import settings
+from django.db import DatabaseError, connection, close_old_connections
+
+# python
+import re
+import json
+import time
+import logging
+import threading
+import traceback
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+
+slow_query_logger = logging.getLogger("payhere.slow_query")
+nplusone_logger = logging.getLogger("payhere.nplusone")
+
+
+class QueryCounter:
+    """connection.execute_wrapper에 등록해 실행된 쿼리 수와 시간을 셉니다.
+
+    with connection.execute_wrapper(counter):
+        ...
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def normalize_sql(sql):
+    """값이 달라도 같은 쿼리로 묶이도록 IN 목록, 문자열/숫자 값, 공백을 정리합니다."""
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql)
+    sql = re.sub(r"%s|\?", "?", sql)
+    sql = re.sub(r"\(\s*\?(?:\s*,\s*\?)*\s*\)", "(...)", sql)
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+def caller_frame():
+    """쿼리를 실행한 프로젝트 코드 위치 (site-packages, payhere/db.py, payhere/middleware.py 제외)"""
+    base_dir = str(settings.BASE_DIR)
+    skip = (str(settings.BASE_DIR / "payhere" / "db.py"), str(settings.BASE_DIR / "payhere" / "middleware.py"))
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(base_dir) and "site-packages" not in frame.filename and frame.filename not in skip:
+            return f"{frame.filename[len(base_dir) + 1:]}:{frame.lineno} in {frame.name}"
+    return ""
+
+
+EXPLAIN_PREFIX = {"sqlite": "EXPLAIN QUERY PLAN ", "mysql": "EXPLAIN "}
+
+
+def explain_query_plan(connection, sql, params=None):
+    """실행 계획을 한 줄씩 반환합니다. (SQLite: EXPLAIN QUERY PLAN의 detail / MySQL: EXPLAIN 행)
+
+    CursorWrapper가 아닌 DB API cursor로 실행해 execute_wrapper를 거치지 않습니다.
+    """
+    with connection.cursor() as cursor:
+        cursor.cursor.execute(EXPLAIN_PREFIX[connection.vendor] + sql, params)
+        rows = cursor.cursor.fetchall()
+    if connection.vendor == "sqlite":
+        return [row[-1] for row in rows]
+    return [" ".join(str(column) for column in row) for row in rows]
+
+
+def full_scans(plan, tables, allowed=()):
+    """SQLite 실행 계획에서 tables 중 전체를 읽는(SCAN) 테이블 목록
+
+    SEARCH ... USING INDEX만 인덱스로 찾은 것으로 보며, SCAN ... USING (COVERING) INDEX도 인덱스 전체를 읽으므로 포함합니다.
+    전체를 읽는 것이 의도된 테이블은 allowed로 명시해 제외합니다.
+    """
+    scanned = []
+    for line in plan:
+        match = re.match(r"SCAN (\w+)", line.strip())
+        if match and match.group(1) in tables and match.group(1) not in allowed:
+            scanned.append(match.group(1))
+    return scanned
+
+
+class SlowQueryLogger:
+    """connection.execute_wrapper에 등록해 SLOW_QUERY_THRESHOLD_MS 이상 걸린 쿼리를 payhere.slow_query 로그로 남깁니다.
+
+    정규화한 SQL, 파라미터 수, 요청한 view, 호출한 코드 위치와 실행 계획(explain_query_plan)을 JSON 한 줄로 기록합니다.
+    실행 계획은 execute_wrapper를 거치지 않으므로 쿼리 수에 포함되지 않습니다.
+    """
+
+    def __init__(self, threshold_ms, get_view=None):
+        self.threshold_ms = threshold_ms
+        self.get_view = get_view
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if duration_ms >= self.threshold_ms:
+                self.log(sql, params, many, context["connection"], duration_ms)
+
+    def log(self, sql, params, many, connection, duration_ms):
+        if many:
+            params_count = sum(len(row) for row in params or ())
+        else:
+            params_count = len(params or ())
+
+        slow_query_logger.warning(
+            json.dumps(
+                {
+                    "duration_ms": round(duration_ms, 2),
+                    "sql": normalize_sql(sql),
+                    "params_count": params_count,
+                    "view": self.get_view() if self.get_view else "",
+                    "frame": caller_frame(),
+                    "plan": [] if many else self.explain(connection, sql, params),
+                },
+                ensure_ascii=False,
+            )
+        )
+
+    def explain(self, connection, sql, params):
+        if connection.vendor not in EXPLAIN_PREFIX or not sql.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "INSERT")):
+            return []
+        try:
+            return explain_query_plan(connection, sql, params)
+        except DatabaseError as e:
+            return [f"EXPLAIN 실패: {e}"]
+
+
+class NPlusOneError(Exception):
+    pass
+
+
+class NPlusOneDetector:
+    """connection.execute_wrapper에 등록해 요청 하나에서 같은 모양(normalize_sql)의 쿼리가
+    threshold번 넘게 실행되면 N+1로 보고합니다.
+
+    모양마다 처음 실행한 프로젝트 코드 위치를 함께 기록합니다.
+    N+1은 조회 패턴이므로 SELECT 쿼리만 셉니다. (반복 INSERT/UPDATE, SAVEPOINT 등은 보고하지 않음)
+    """
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.shapes = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip()[:6].upper() != "SELECT":
+            return execute(sql, params, many, context)
+        shape = normalize_sql(sql)
+        entry = self.shapes.get(shape)
+        if entry is None:
+            self.shapes[shape] = [1, caller_frame()]
+        else:
+            entry[0] += 1
+        return execute(sql, params, many, context)
+
+    def problems(self):
+        """(실행 횟수, 코드 위치, SQL) 목록"""
+        return [(count, frame, shape) for shape, (count, frame) in self.shapes.items() if count > self.threshold]
+
+    def report(self, view, mode):
+        """mode가 warn이면 payhere.nplusone 로그를 남기고 raise면 NPlusOneError를 발생시킵니다."""
+        problems = self.problems()
+        if not problems:
+            return
+        message = "\n".join(
+            f"N+1 의심 쿼리 ({view}): {count}번 실행 / {frame}\n    {shape}" for count, frame, shape in problems
+        )
+        if mode == "raise":
+            raise NPlusOneError(message)
+        nplusone_logger.warning(message)
+
+
+class WorkloadRecorder:
+    """connection.execute_wrapper에 등록해 쿼리 모양(normalize_sql)별 실행 횟수와 시간을 모읍니다.
+
+    여러 스레드의 connection에 같은 객체를 등록할 수 있으며, dump()로 advise_indexes 명령어가 읽는
+    JSON lines({"sql", "count", "duration_ms"}) 파일을 만듭니다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.shapes = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            shape = normalize_sql(sql)
+            with self.lock:
+                count, total = self.shapes.get(shape, (0, 0.0))
+                self.shapes[shape] = (count + 1, total + duration)
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for shape, (count, duration) in sorted(self.shapes.items(), key=lambda item: -item[1][1]):
+                f.write(json.dumps({"sql": shape, "count": count, "duration_ms": round(duration * 1000, 3)}, ensure_ascii=False))
+                f.write("\n")
+
+
+# DB_PARALLEL_WORKERS 값별 ThreadPoolExecutor
+executors = {}
+executors_lock = threading.Lock()
+
+
+def get_executor():
+    """DB_PARALLEL_WORKERS개 스레드를 가진 프로세스 공용 ThreadPoolExecutor (동시에 여는 DB 연결 수를 제한합니다.)
+
+    설정 값이 바뀌면 (override_settings 등) 그 값으로 새 executor를 만들어 사용합니다.
+    """
+    workers = settings.DB_PARALLEL_WORKERS
+    with executors_lock:
+        executor = executors.get(workers)
+        if executor is None:
+            executor = executors[workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="payhere-db")
+        return executor
+
+
+def run_in_thread(function):
+    # 스레드마다 자신의 DB 연결을 사용하며, CONN_MAX_AGE가 지난 연결은 닫습니다. (요청 시작/끝과 같은 처리)
+    close_old_connections()
+    try:
+        return function()
+    finally:
+        close_old_connections()
+
+
+def run_concurrently(*functions):
+    """서로 관계없는 조회 함수들을 스레드 풀에서 동시에 실행하고 결과를 같은 순서의 list로 반환합니다.
+
+    예외가 나면 첫 번째 예외를 그대로 발생시킵니다.
+    DB_PARALLEL_WORKERS가 1 이하이거나 트랜잭션 안(다른 연결에서 커밋 전 데이터가 보이지 않음)이면 순서대로 실행합니다.
+    스레드에서 실행한 쿼리는 요청 connection의 execute_wrapper(쿼리 수, N+1 검사)에 포함되지 않습니다.
+    함수는 호출한 스레드의 context(contextvars)를 복사해 실행합니다.
+    """
+    if settings.DB_PARALLEL_WORKERS <= 1 or len(functions) <= 1 or connection.in_atomic_block:
+        return [function() for function in functions]
+    futures = [
+        get_executor().submit(contextvars.copy_context().run, run_in_thread, function) for function in functions
+    ]
+    return [future.result() for future in futures]
@@ -0,0 +1,90 @@
+# rest_framework
+from rest_framework import status
+from rest_framework.response import Response
+
+# django
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+# python
+import hashlib
+import functools
+from datetime import timedelta
+
+# payhere
+from payhere.renderers import FastJSONRenderer, JSONFragment
+
+# apps
+from account_books.models import IdempotencyKey
+
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+
+def replay(idempotency_key):
+    response = Response(JSONFragment(bytes(idempotency_key.content)), status=idempotency_key.status_code)
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def matched(idempotency_key, fingerprint):
+    """저장한 키와 같은 요청이면 저장한 응답, 다른 요청이면 422를 반환합니다."""
+    if idempotency_key.fingerprint != fingerprint:
+        return Response(
+            {"message": f"같은 {IDEMPOTENCY_KEY_HEADER}로 다른 요청을 보낼 수 없습니다."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    return replay(idempotency_key)
+
+
+def idempotent(method):
+    """APIView의 생성/복제 요청에 Idempotency-Key 헤더가 있으면 (사용자, 키)별로 첫 응답을 저장하고 재시도에는 그 응답을 반환합니다.
+
+    저장한 키 조회(unique 인덱스) 한 번과 저장 한 번이 더해지며, 응답을 만드는 작업과 같은 transaction에서 저장하므로
+    동시에 같은 키로 들어온 요청은 unique 제약으로 하나만 커밋되고 나머지는 되돌린 뒤 저장된 응답을 반환합니다.
+    같은 키로 다른 요청(method, 경로, 본문)을 보내면 422, 서버 에러(5xx) 응답은 저장하지 않아 다시 시도할 수 있습니다.
+    IDEMPOTENCY_KEY_TTL_HOURS가 지난 키는 새 요청으로 처리합니다.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+        user_id = request.user.id
+        if key is None or user_id is None:
+            return method(self, request, *args, **kwargs)
+        if not 0 < len(key) <= 255:
+            return Response(
+                {"message": f"{IDEMPOTENCY_KEY_HEADER}는 1~255자로 입력해주세요."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        fingerprint = hashlib.md5(
+            b"\n".join((request.method.encode(), request.path.encode(), request.body)), usedforsecurity=False
+        ).hexdigest()
+        expired_at = timezone.now() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+        try:
+            with transaction.atomic():
+                idempotency_key = IdempotencyKey.objects.filter(owner=user_id, key=key).first()
+                if idempotency_key is not None:
+                    if idempotency_key.created_at >= expired_at:
+                        return matched(idempotency_key, fingerprint)
+                    idempotency_key.delete()
+
+                response = method(self, request, *args, **kwargs)
+                if isinstance(response, Response) and response.status_code < 500:
+                    IdempotencyKey.objects.create(
+                        owner_id=user_id,
+                        key=key,
+                        fingerprint=fingerprint,
+                        status_code=response.status_code,
+                        content=FastJSONRenderer().render(response.data),
+                    )
+                return response
+        except IntegrityError:
+            # 같은 키로 동시에 들어온 다른 요청이 먼저 저장한 경우 (이 요청의 작업은 되돌려집니다.)
+            idempotency_key = IdempotencyKey.objects.filter(owner=user_id, key=key).first()
+            if idempotency_key is None:
+                raise
+            return matched(idempotency_key, fingerprint)
+
+    return wrapper
@@ -0,0 +1,219 @@
+# django
+from django.conf import settings
+
+# python
+import os
+import json
+import time
+import re
+import glob
+import threading
+from bisect import bisect_left
+
+
+# 요청 처리 시간(초) / 요청당 SQL 수 구간
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+# 이름: (타입, 설명, 히스토그램 구간)
+METRICS = {
+    "payhere_requests_total": ("counter", "처리한 요청 수", None),
+    "payhere_request_duration_seconds": ("histogram", "요청 처리 시간(초)", LATENCY_BUCKETS),
+    "payhere_request_queries": ("histogram", "요청당 실행한 SQL 수", QUERY_BUCKETS),
+    "payhere_request_query_seconds": ("counter", "요청에서 SQL 실행에 쓴 시간(초)", None),
+    "payhere_cache_requests_total": ("counter", "캐시 조회 수 (result: hit/miss)", None),
+    "payhere_cache_hit_ratio": ("gauge", "캐시 적중률 (payhere_cache_requests_total에서 계산)", None),
+    "payhere_cache_evictions_total": ("counter", "캐시에서 버린 값 수 (reason: lru/expired/stale)", None),
+    "payhere_single_flight_total": ("counter", "통계 계산 호출 수 (result: compute/shared/stale)", None),
+}
+
+
+class MetricsRegistry:
+    """프로세스 내 카운터/히스토그램 저장소
+
+    METRICS_DIR이 설정되어 있으면 프로세스마다 metrics_<pid>.json 파일에 값을 저장하고
+    (METRICS_FLUSH_INTERVAL초 간격), 조회할 때 디렉토리의 모든 파일을 합쳐서 gunicorn 워커 전체 값을 보여줍니다.
+    조회할 때 종료된 프로세스의 파일은 지우므로 (같은 호스트의 프로세스만 METRICS_DIR을 사용)
+    워커가 재시작되면 그 워커의 값만큼 카운터가 줄어들며, Prometheus는 이를 카운터 reset으로 처리합니다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.pid = os.getpid()
+        self.counters = {}
+        self.histograms = {}
+        self.flushed_at = 0.0
+
+    def check_fork(self):
+        # fork 전에 기록된 값은 부모 프로세스 파일에 있으므로 자식 프로세스는 새로 시작합니다.
+        if self.pid != os.getpid():
+            self.reset()
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.check_fork()
+            self.counters[key] = self.counters.get(key, 0) + value
+        self.flush()
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.check_fork()
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                # [구간별 개수..., +Inf 개수, 합계]
+                histogram = self.histograms[key] = [0] * (len(buckets) + 1) + [0]
+            histogram[bisect_left(buckets, value)] += 1
+            histogram[-1] += value
+        self.flush()
+
+    def snapshot(self):
+        with self.lock:
+            self.check_fork()
+            return {
+                "counters": [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                "histograms": [[name, list(labels), list(values)] for (name, labels), values in self.histograms.items()],
+            }
+
+    def flush(self, force=False):
+        metrics_dir = settings.METRICS_DIR
+        if not metrics_dir:
+            return
+        now = time.monotonic()
+        if not force and now - self.flushed_at < settings.METRICS_FLUSH_INTERVAL:
+            return
+        self.flushed_at = now
+
+        os.makedirs(metrics_dir, exist_ok=True)
+        path = os.path.join(metrics_dir, f"metrics_{os.getpid()}.json")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def collect(self):
+        """모든 프로세스의 값을 합쳐 (counters, histograms) dict로 반환합니다."""
+        if settings.METRICS_DIR:
+            self.flush(force=True)
+            snapshots = []
+            for path in glob.glob(os.path.join(settings.METRICS_DIR, "metrics_*.json")):
+                if not is_alive(path):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                    continue
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        snapshots.append(json.load(f))
+                # 다른 프로세스가 파일을 교체하는 중인 경우
+                except (OSError, ValueError):
+                    continue
+        else:
+            snapshots = [self.snapshot()]
+
+        counters, histograms = {}, {}
+        for snapshot in snapshots:
+            for name, labels, value in snapshot["counters"]:
+                key = (name, tuple(tuple(label) for label in labels))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, values in snapshot["histograms"]:
+                key = (name, tuple(tuple(label) for label in labels))
+                if key in histograms:
+                    histograms[key] = [a + b for a, b in zip(histograms[key], values)]
+                else:
+                    histograms[key] = values
+        return counters, histograms
+
+    def render(self):
+        """Prometheus text exposition format(0.0.4) 문자열을 반환합니다."""
+        counters, histograms = self.collect()
+        counters.update(cache_hit_ratios(counters))
+
+        lines = []
+        for name, (kind, description, buckets) in METRICS.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "histogram":
+                for (metric, labels), values in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip((*buckets, "+Inf"), values):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{format_labels(labels, le=bound)} {cumulative}")
+                    lines.append(f"{name}_sum{format_labels(labels)} {values[-1]}")
+                    lines.append(f"{name}_count{format_labels(labels)} {cumulative}")
+            else:
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def is_alive(path):
+    """metrics_<pid>.json 파일을 저장한 프로세스가 실행 중인지 반환합니다."""
+    match = re.search(r"metrics_(\d+)\.json$", path)
+    if match is None:
+        return True
+    try:
+        os.kill(int(match.group(1)), 0)
+    except ProcessLookupError:
+        return False
+    # 다른 사용자의 프로세스 (신호를 보낼 권한만 없음)
+    except PermissionError:
+        return True
+    return True
+
+
+def format_labels(labels, le=None):
+    labels = list(labels)
+    if le is not None:
+        labels.append(("le", str(le)))
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape_label(value)}"' for key, value in labels) + "}"
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def cache_hit_ratios(counters):
+    totals = {}
+    for (name, labels), value in counters.items():
+        if name != "payhere_cache_requests_total":
+            continue
+        labels = dict(labels)
+        hit, total = totals.get(labels["cache"], (0, 0))
+        totals[labels["cache"]] = (hit + (value if labels["result"] == "hit" else 0), total + value)
+    return {
+        ("payhere_cache_hit_ratio", (("cache", cache),)): round(hit / total, 6) for cache, (hit, total) in totals.items() if total
+    }
+
+
+registry = MetricsRegistry()
+
+
+def record_request(view, method, status, duration, queries, query_duration):
+    registry.inc("payhere_requests_total", {"view": view, "method": method, "status": str(status)})
+    registry.observe("payhere_request_duration_seconds", {"view": view, "method": method}, duration)
+    registry.observe("payhere_request_queries", {"view": view}, queries)
+    registry.inc("payhere_request_query_seconds", {"view": view}, query_duration)
+
+
+def record_cache(cache, hit):
+    registry.inc("payhere_cache_requests_total", {"cache": cache, "result": "hit" if hit else "miss"})
+
+
+def record_cache_eviction(cache, reason):
+    registry.inc("payhere_cache_evictions_total", {"cache": cache, "reason": reason})
+
+
+def record_single_flight(name, result):
+    registry.inc("payhere_single_flight_total", {"name": name, "result": result})
@@ -0,0 +1,264 @@
+# django
+from django.conf import settings
+from django.db import connection
+from django.utils.functional import SimpleLazyObject, empty
+
+# asgiref
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+# rest_framework
+from rest_framework.exceptions import APIException
+
+# rest_framework_simplejwt
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+# python
+import json
+import time
+import random
+import logging
+import functools
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+# payhere
+from payhere.db import QueryCounter, SlowQueryLogger, NPlusOneDetector
+from payhere.metrics import record_request
+from payhere.profiling import RequestProfiler
+
+
+logger = logging.getLogger("payhere.performance")
+
+# 현재 요청의 RequestTiming (미들웨어 밖에서는 None)
+current_timing = ContextVar("current_timing", default=None)
+# 현재 async 요청의 execute_wrapper 목록 (async ORM은 sync_to_async 스레드의 connection에서 쿼리를 실행합니다.)
+current_query_wrappers = ContextVar("current_query_wrappers", default=())
+
+
+def context_execute_wrapper(execute, sql, params, many, context):
+    """current_query_wrappers의 execute_wrapper를 순서대로 적용합니다. (등록한 connection을 다른 요청이 쓰면 그대로 실행)"""
+    for wrapper in reversed(current_query_wrappers.get()):
+        execute = functools.partial(wrapper, execute)
+    return execute(sql, params, many, context)
+
+
+def add_context_execute_wrapper():
+    # 요청의 thread sensitive 스레드(async ORM이 쿼리를 실행하는 스레드)의 connection에 한 번만 등록합니다.
+    if context_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, context_execute_wrapper)
+
+
+class RequestTiming:
+    """요청 하나의 전체 시간, SQL 수/시간, 직렬화 시간, 렌더링 시간"""
+
+    def __init__(self, sampled=True):
+        self.sampled = sampled
+        self.start = time.perf_counter()
+        self.total = 0.0
+        self.queries = QueryCounter()
+        self.serializer = 0.0
+        self.render = 0.0
+        self.view = "unresolved"
+
+    def server_timing(self):
+        return ", ".join(
+            (
+                f'db;dur={self.queries.duration * 1000:.1f};desc="{self.queries.count} queries"',
+                f"serializer;dur={self.serializer * 1000:.1f}",
+                f"render;dur={self.render * 1000:.1f}",
+                f"total;dur={self.total * 1000:.1f}",
+            )
+        )
+
+    def log(self, request, response):
+        return {
+            "method": request.method,
+            "path": request.path,
+            "view": self.view,
+            "status": response.status_code,
+            "total_ms": round(self.total * 1000, 2),
+            "db_ms": round(self.queries.duration * 1000, 2),
+            "db_queries": self.queries.count,
+            "serializer_ms": round(self.serializer * 1000, 2),
+            "render_ms": round(self.render * 1000, 2),
+        }
+
+
+@contextmanager
+def serializer_timing():
+    """블록 실행 시간을 현재 요청의 직렬화 시간(RequestTiming.serializer)에 더합니다.
+
+    view에서 serializer.data를 만드는 부분을 감싸며, 샘플링되지 않은 요청에서는 측정하지 않습니다.
+        with serializer_timing():
+            data = serializer.data
+    """
+    timing = current_timing.get()
+    if timing is None or not timing.sampled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.serializer += time.perf_counter() - start
+
+
+def is_staff_request(request):
+    """인증을 마친 요청의 사용자가 관리자인지 반환합니다. (아직 조회하지 않은 세션 사용자는 조회하지 않음)"""
+    user = getattr(request, "user", None)
+    if user is None or (isinstance(user, SimpleLazyObject) and user._wrapped is empty):
+        return False
+    return user.is_staff
+
+
+class PerformanceMiddleware:
+    """요청별 성능 측정
+
+    모든 요청의 전체 시간, SQL 수/시간(connection.execute_wrapper)을 view 클래스별 metrics에 기록하고,
+    PERFORMANCE_SAMPLE_RATE 비율의 요청은 serializer 시간(serializer_timing), 렌더링 시간까지 측정해
+    payhere.performance 로그(JSON)로 남기고, DEBUG이거나 관리자 요청이면 Server-Timing 헤더로도 알려줍니다.
+    (내부 처리 시간이 일반 사용자에게 노출되지 않도록)
+    SLOW_QUERY_THRESHOLD_MS 이상 걸린 쿼리는 SlowQueryLogger로 실행 계획과 함께 기록하고,
+    NPLUSONE_MODE(warn/raise)가 켜져 있으면 NPlusOneDetector로 같은 모양의 쿼리 반복(N+1)을 검사합니다.
+    ASGI(async) 요청은 같은 execute_wrapper를 current_query_wrappers로 sync_to_async 스레드의 connection에 적용합니다.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        timing, wrappers, nplusone_detector = self.start()
+        token = current_timing.set(timing)
+        try:
+            with ExitStack() as stack:
+                for wrapper in wrappers:
+                    stack.enter_context(connection.execute_wrapper(wrapper))
+                response = self.get_response(request)
+        finally:
+            current_timing.reset(token)
+        return self.finish(request, response, timing, nplusone_detector)
+
+    async def __acall__(self, request):
+        timing, wrappers, nplusone_detector = self.start()
+        await sync_to_async(add_context_execute_wrapper)()
+        token = current_timing.set(timing)
+        wrappers_token = current_query_wrappers.set(tuple(wrappers))
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_query_wrappers.reset(wrappers_token)
+            current_timing.reset(token)
+        return self.finish(request, response, timing, nplusone_detector)
+
+    def start(self):
+        """(RequestTiming, 등록할 execute_wrapper 목록, NPlusOneDetector 또는 None)"""
+        timing = RequestTiming(sampled=random.random() < settings.PERFORMANCE_SAMPLE_RATE)
+        wrappers = [timing.queries]
+        if settings.SLOW_QUERY_THRESHOLD_MS >= 0:
+            wrappers.append(SlowQueryLogger(settings.SLOW_QUERY_THRESHOLD_MS, get_view=lambda: timing.view))
+        nplusone_detector = None
+        if settings.NPLUSONE_MODE != "off":
+            nplusone_detector = NPlusOneDetector(settings.NPLUSONE_THRESHOLD)
+            wrappers.append(nplusone_detector)
+        return timing, wrappers, nplusone_detector
+
+    def finish(self, request, response, timing, nplusone_detector):
+        if nplusone_detector is not None:
+            nplusone_detector.report(timing.view, settings.NPLUSONE_MODE)
+
+        timing.total = time.perf_counter() - timing.start
+        record_request(
+            timing.view, request.method, response.status_code, timing.total, timing.queries.count, timing.queries.duration
+        )
+        if timing.sampled:
+            if settings.DEBUG or is_staff_request(request):
+                response["Server-Timing"] = timing.server_timing()
+            logger.info(json.dumps(timing.log(request, response), ensure_ascii=False))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timing = current_timing.get()
+        if timing is not None:
+            view_class = getattr(view_func, "view_class", None) or getattr(view_func, "cls", None)
+            timing.view = (view_class or view_func).__name__
+
+    def process_template_response(self, request, response):
+        timing = current_timing.get()
+        if timing is not None and timing.sampled:
+            start = time.perf_counter()
+
+            def rendered(response):
+                timing.render += time.perf_counter() - start
+
+            response.add_post_render_callback(rendered)
+        return response
+
+
+class ProfilingMiddleware:
+    """관리자 요청 하나를 cProfile / tracemalloc으로 프로파일링
+
+    X-Profile 헤더 또는 _profile 쿼리 매개변수(cpu, memory, cpu,memory)가 있는 관리자 요청만 측정하고
+    결과 파일(pstats, collapsed stack, 메모리 할당 목록)을 PROFILE_DIR에 저장한 뒤 X-Profile-Id 헤더로 id를 알려줍니다.
+    """
+
+    modes = {"cpu", "memory"}
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        modes = self.get_modes(request)
+        if not modes or not self.is_staff(request):
+            return self.get_response(request)
+
+        with RequestProfiler(cpu="cpu" in modes, memory="memory" in modes) as profiler:
+            response = self.get_response(request)
+        profiler.save()
+        response["X-Profile-Id"] = profiler.id
+        return response
+
+    async def __acall__(self, request):
+        # async 요청은 이벤트 루프 스레드에서 실행한 코드만 측정합니다. (sync_to_async 스레드의 ORM 실행은 제외)
+        modes = self.get_modes(request)
+        if not modes or not await sync_to_async(self.is_staff)(request):
+            return await self.get_response(request)
+
+        with RequestProfiler(cpu="cpu" in modes, memory="memory" in modes) as profiler:
+            response = await self.get_response(request)
+        profiler.save()
+        response["X-Profile-Id"] = profiler.id
+        return response
+
+    def get_modes(self, request):
+        value = request.headers.get("X-Profile") or request.GET.get("_profile")
+        if not value:
+            return set()
+        if value.lower() in ("1", "true"):
+            return {"cpu"}
+        return {mode.strip().lower() for mode in value.split(",")} & self.modes
+
+    def is_staff(self, request):
+        # 세션(admin) 로그인 또는 JWT 토큰으로 관리자인지 확인합니다. (프로파일링을 요청한 경우에만 조회)
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return user.is_staff
+        try:
+            result = JWTAuthentication().authenticate(request)
+        except APIException:
+            return False
+        return result is not None and result[0].is_staff
@@ -17,7 +17,8 @@ class IsOwner(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         user = request.user
-        if obj.owner == user:
+        # obj.owner를 조회하지 않도록 id로 비교합니다.
+        if obj.owner_id == user.id:
             return True
 
         if user.is_authenticated or user.is_anonymous:
@@ -0,0 +1,125 @@
+# django
+from django.conf import settings
+
+# python
+import os
+import io
+import uuid
+import pstats
+import cProfile
+import threading
+import tracemalloc
+
+
+# tracemalloc은 프로세스 전체에서 하나만 추적하므로 동시에 한 요청만 메모리 프로파일링합니다.
+memory_lock = threading.Lock()
+
+
+class RequestProfiler:
+    """요청 하나를 cProfile / tracemalloc으로 측정하고 PROFILE_DIR에 결과 파일을 저장합니다.
+
+    with RequestProfiler(cpu=True, memory=True) as profiler:
+        response = ...
+    files = profiler.save()
+
+    <id>.pstats: python -m pstats / snakeviz로 확인
+    <id>.collapsed: flamegraph.pl / speedscope에서 바로 여는 collapsed stack
+    <id>.memory.txt: 코드 위치별 메모리 할당 상위 목록과 최대 사용량
+    """
+
+    def __init__(self, cpu=True, memory=False):
+        self.id = uuid.uuid4().hex[:12]
+        self.profile = cProfile.Profile() if cpu else None
+        self.memory = memory
+        self.snapshot = None
+        self.peak = 0
+
+    def __enter__(self):
+        # 다른 요청이 메모리 프로파일링 중이면 CPU만 측정합니다.
+        self.memory = self.memory and memory_lock.acquire(blocking=False)
+        if self.memory:
+            tracemalloc.start(25)
+        if self.profile:
+            self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.profile:
+            self.profile.disable()
+        if self.memory:
+            try:
+                self.snapshot = tracemalloc.take_snapshot()
+                self.peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+                memory_lock.release()
+
+    def save(self, directory=None):
+        """저장한 파일 경로 목록을 반환합니다."""
+        directory = directory or settings.PROFILE_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, self.id)
+        files = []
+
+        if self.profile:
+            self.profile.dump_stats(f"{path}.pstats")
+            with open(f"{path}.collapsed", "w", encoding="utf-8") as f:
+                for stack, microseconds in collapse_stacks(pstats.Stats(self.profile)).items():
+                    f.write(f"{stack} {microseconds}\n")
+            files += [f"{path}.pstats", f"{path}.collapsed"]
+
+        if self.snapshot:
+            with open(f"{path}.memory.txt", "w", encoding="utf-8") as f:
+                f.write(f"peak: {self.peak / 1024:.1f} KiB\n\n")
+                for stat in self.snapshot.statistics("lineno")[:30]:
+                    f.write(f"{stat}\n")
+            files.append(f"{path}.memory.txt")
+        return files
+
+    def top(self, limit=20):
+        """누적 시간 상위 함수 목록 문자열"""
+        output = io.StringIO()
+        pstats.Stats(self.profile, stream=output).sort_stats("cumulative").print_stats(limit)
+        return output.getvalue()
+
+
+def function_label(function):
+    filename, lineno, name = function
+    if filename == "~":
+        return name
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+
+def collapse_stacks(stats, max_depth=64):
+    """pstats의 호출 관계로 collapsed stack({"a;b;c": 자체 시간(μs)})을 만듭니다.
+
+    cProfile은 호출 경로를 저장하지 않으므로 함수를 여러 곳에서 호출한 경우
+    호출한 쪽의 누적 시간 비율로 자체 시간을 나눕니다.
+    """
+    callees = {}
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, []).append((function, cumulative))
+
+    stacks = {}
+
+    def walk(function, path, share):
+        _, _, self_time, cumulative, _ = stats.stats[function]
+        path = path + [function_label(function)]
+        microseconds = int(self_time * share * 1_000_000)
+        if microseconds:
+            stack = ";".join(path)
+            stacks[stack] = stacks.get(stack, 0) + microseconds
+        if len(path) >= max_depth or not cumulative:
+            return
+        for callee, edge_cumulative in callees.get(function, ()):
+            callee_cumulative = stats.stats[callee][3]
+            # 재귀 호출과 1μs 미만 경로는 펼치지 않습니다.
+            if function_label(callee) in path or share * edge_cumulative < 1e-6:
+                continue
+            walk(callee, path, share * min(1.0, edge_cumulative / callee_cumulative))
+
+    roots = [function for function, (*_, callers) in stats.stats.items() if not callers]
+    for root in roots:
+        walk(root, [], 1.0)
+    return stacks
@@ -0,0 +1,118 @@
+# rest_framework
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.compat import INDENT_SEPARATORS, LONG_SEPARATORS, SHORT_SEPARATORS
+
+# django
+from django.http import StreamingHttpResponse
+
+# python
+import json
+import uuid
+from itertools import chain, islice
+
+# orjson (설치되어 있지 않으면 json 모듈을 사용합니다.)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONFragment:
+    """이미 JSON으로 인코딩한 bytes를 다시 인코딩하지 않고 응답에 그대로 넣기 위한 객체
+
+    Response({"categories": JSONFragment(cached_bytes)})
+    """
+
+    __slots__ = ("content",)
+
+    def __init__(self, content):
+        self.content = content.encode() if isinstance(content, str) else content
+
+
+class FastJSONRenderer(JSONRenderer):
+    """orjson이 설치되어 있으면 orjson으로 인코딩하는 JSONRenderer
+
+    날짜/Decimal 등은 DRF JSONEncoder로 변환하므로 결과는 JSONRenderer와 같은 bytes입니다.
+    들여쓰기(browsable API, indent 요청)나 UNICODE_JSON/COMPACT_JSON 설정을 끈 경우,
+    orjson이 인코딩할 수 없는 값(64bit를 넘는 정수 등)이 있는 경우에는 json 모듈을 사용합니다.
+    (지수 표기 float는 1e-07 대신 1e-7처럼 표기만 다를 수 있습니다.)
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        fragments = {}
+        encoder = self.encoder_class()
+
+        def default(obj):
+            # JSONFragment는 자리 표시 문자열로 인코딩한 뒤 마지막에 원래 bytes로 바꿉니다.
+            if isinstance(obj, JSONFragment):
+                placeholder = f"__json_fragment_{uuid.uuid4().hex}__"
+                fragments[placeholder] = obj.content
+                return placeholder
+            return encoder.default(obj)
+
+        ret = None
+        if orjson is not None and indent is None and self.compact and not self.ensure_ascii:
+            try:
+                ret = orjson.dumps(data, default=default, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS)
+            except orjson.JSONEncodeError:
+                fragments.clear()
+
+        if ret is None:
+            if indent is None:
+                separators = SHORT_SEPARATORS if self.compact else LONG_SEPARATORS
+            else:
+                separators = INDENT_SEPARATORS
+            ret = json.dumps(
+                data,
+                cls=self.encoder_class,
+                default=default,
+                indent=indent,
+                ensure_ascii=self.ensure_ascii,
+                allow_nan=not self.strict,
+                separators=separators,
+            ).encode()
+
+        # JSONRenderer와 같이 \u2028, \u2029는 escape 합니다.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+        for placeholder, content in fragments.items():
+            ret = ret.replace(f'"{placeholder}"'.encode(), content, 1)
+        return ret
+
+
+def streaming_list_response(items, chunk_size, status=200):
+    """items(dict generator)를 JSON 배열로 응답합니다.
+
+    chunk_size + 1개를 먼저 읽어 chunk_size개 이하면 Response를 반환하고, 더 있으면 chunk_size개씩 인코딩해 보내는
+    StreamingHttpResponse를 반환해 전체 리스트를 메모리에 만들지 않습니다. (응답 내용은 같음)
+    StreamingHttpResponse는 content negotiation 없이 application/json(FastJSONRenderer)으로 인코딩하며
+    cache_response로 캐시되지 않습니다.
+    """
+    first = list(islice(items, chunk_size + 1))
+    if len(first) <= chunk_size:
+        return Response(first, status=status)
+    return StreamingHttpResponse(
+        stream_json_list(first[:chunk_size], chain(first[chunk_size:], items), chunk_size),
+        status=status,
+        content_type="application/json",
+    )
+
+
+def stream_json_list(first, items, chunk_size):
+    renderer = FastJSONRenderer()
+    separator = b"," if renderer.compact else b", "
+    # 리스트를 인코딩한 결과에서 대괄호를 떼고 이어 붙입니다.
+    yield b"[" + renderer.render(first)[1:-1]
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            break
+        yield separator + renderer.render(chunk)[1:-1]
+    yield b"]"
@@ -0,0 +1,21 @@
+# rest_framework
+from rest_framework import serializers
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """serializer context["prefetched"][모델]({id: 객체})에 미리 조회한 객체가 있으면 쿼리 없이 사용하는 PrimaryKeyRelatedField
+
+    일괄 처리처럼 같은 serializer를 여러 번 검증할 때 참조하는 객체를 한 번에 조회해 넘기면 작업마다 조회하지 않습니다.
+    미리 조회하지 않은 id는 PrimaryKeyRelatedField와 같이 조회/검증합니다.
+    """
+
+    def to_internal_value(self, data):
+        prefetched = self.context.get("prefetched", {}).get(self.get_queryset().model)
+        if prefetched and not isinstance(data, bool):
+            try:
+                obj = prefetched.get(int(data))
+            except (TypeError, ValueError):
+                obj = None
+            if obj is not None:
+                return obj
+        return super().to_internal_value(data)
@@ -46,6 +46,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "payhere.middleware.PerformanceMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -53,10 +54,13 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "payhere.middleware.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "payhere.urls"
 
+TEST_RUNNER = "payhere.test_runner.TestRunner"
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -103,6 +107,22 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/ref/settings/#caches
+# default: 프로세스별 LRU 캐시(L1) + 워커들이 함께 쓰는 캐시(L2, shared) / L2 값이 바뀌면 L1 값은 버려집니다.
+CACHES = {
+    "default": {
+        "BACKEND": "payhere.tiered_cache.TieredCache",
+        "LOCATION": "shared",
+        "OPTIONS": {
+            "L1_MAX_ENTRIES": env.int("L1_CACHE_MAX_ENTRIES", default=500),
+            "L1_TIMEOUT": env.float("L1_CACHE_TIMEOUT", default=60),
+        },
+    },
+    "shared": env.cache_url("SHARED_CACHE_URL", default=f"filecache://{BASE_DIR / 'cache'}"),
+}
+
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -151,7 +171,12 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ]
+    ],
+    # orjson이 설치되어 있으면 orjson으로 인코딩 (없으면 json 모듈)
+    "DEFAULT_RENDERER_CLASSES": [
+        "payhere.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
 
 
@@ -192,19 +217,97 @@ SIMPLE_JWT = {
 }
 
 
-# LOGGING = {
-#     "version": 1,
-#     "disable_existing_loggers": False,
-#     "handlers": {
-#         "console": {
-#             "level": "DEBUG",
-#             "class": "logging.StreamHandler",
-#         },
-#     },
-#     "loggers": {
-#         "django.db.backends": {
-#             "handlers": ["console"],
-#             "level": "DEBUG",
-#         },
-#     },
-# }
+# Performance Setting
+# 성능 로그(DEBUG이거나 관리자 요청이면 Server-Timing 헤더도)를 남길 요청 비율 (0.0 ~ 1.0)
+PERFORMANCE_SAMPLE_RATE = env.float("PERFORMANCE_SAMPLE_RATE", default=0.01)
+
+# 프로세스별 메트릭 파일을 저장할 디렉토리 (gunicorn 워커 여러 개의 값을 합칠 때 사용, 비우면 프로세스 내 값만 조회)
+METRICS_DIR = env("METRICS_DIR", default="")
+METRICS_FLUSH_INTERVAL = env.float("METRICS_FLUSH_INTERVAL", default=1.0)
+
+# 이 시간(ms) 이상 걸린 쿼리를 실행 계획과 함께 SLOW_QUERY_LOG_FILE에 기록 (음수면 기록하지 않음)
+SLOW_QUERY_THRESHOLD_MS = env.float("SLOW_QUERY_THRESHOLD_MS", default=200)
+SLOW_QUERY_LOG_FILE = env("SLOW_QUERY_LOG_FILE", default=str(BASE_DIR / "slow_query.log"))
+
+# 요청 하나에서 같은 모양의 SELECT 쿼리가 NPLUSONE_THRESHOLD번 넘게 실행되면 N+1로 보고 (off / warn / raise)
+# 테스트 실행 시에는 NPLUSONE_TEST_MODE를 사용합니다. (payhere.test_runner.TestRunner)
+NPLUSONE_MODE = env("NPLUSONE_MODE", default="warn" if DEBUG else "off")
+NPLUSONE_TEST_MODE = env("NPLUSONE_TEST_MODE", default="raise")
+NPLUSONE_THRESHOLD = env.int("NPLUSONE_THRESHOLD", default=5)
+
+# 검색 리스트 응답이 이 행 수보다 많으면 이 단위로 나눠 조회/인코딩해 StreamingHttpResponse로 보냄
+JSON_STREAM_CHUNK_SIZE = env.int("JSON_STREAM_CHUNK_SIZE", default=2000)
+
+# 월간 조회/검색/통계 응답 캐시 시간(초, 0이면 캐시하지 않음) / 테스트 실행 시에는 RESPONSE_CACHE_TEST_TIMEOUT을 사용합니다.
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_TIMEOUT", default=300)
+RESPONSE_CACHE_TEST_TIMEOUT = env.int("RESPONSE_CACHE_TEST_TIMEOUT", default=0)
+
+# 카테고리 통계 계산 결과를 사용자 데이터 버전과 함께 보관할 시간(초, 0이면 보관하지 않음)
+# 데이터가 바뀐 뒤 다시 계산하는 동안 들어온 요청에는 이전 결과를 반환하고, 다른 워커는 STAT_LOCK_TIMEOUT초까지 계산을 기다립니다.
+STAT_CACHE_TIMEOUT = env.int("STAT_CACHE_TIMEOUT", default=3600)
+STAT_CACHE_TEST_TIMEOUT = env.int("STAT_CACHE_TEST_TIMEOUT", default=0)
+STAT_LOCK_TIMEOUT = env.int("STAT_LOCK_TIMEOUT", default=10)
+
+# 월간 대시보드처럼 서로 관계없는 조회를 동시에 실행할 스레드 수 (스레드마다 DB 연결을 하나씩 사용, 1이면 순서대로 실행)
+DB_PARALLEL_WORKERS = env.int("DB_PARALLEL_WORKERS", default=4)
+
+# 일괄 처리(account-books/batch/) 요청 하나에 보낼 수 있는 최대 작업 수
+BATCH_MAX_OPERATIONS = env.int("BATCH_MAX_OPERATIONS", default=100)
+
+# 동기화(account-books/sync/) 응답 한 번에 보낼 종류별 최대 내역 수
+SYNC_PAGE_SIZE = env.int("SYNC_PAGE_SIZE", default=500)
+# 커밋이 늦은 transaction의 내역을 건너뛰지 않도록 최근 SYNC_SETTLE_SECONDS초 동안 바뀐 내역은 다음 동기화에서 보냅니다.
+SYNC_SETTLE_SECONDS = env.int("SYNC_SETTLE_SECONDS", default=5)
+# 삭제 기록(Tombstone) 보관 기간(일) / 이보다 오래된 cursor는 410으로 응답해 처음부터 다시 동기화하도록 합니다.
+SYNC_TOMBSTONE_RETENTION_DAYS = env.int("SYNC_TOMBSTONE_RETENTION_DAYS", default=30)
+
+# Idempotency-Key로 저장한 첫 응답을 재시도에 돌려줄 시간(시간) / 지난 키는 prune_idempotency_keys 명령으로 삭제합니다.
+IDEMPOTENCY_KEY_TTL_HOURS = env.int("IDEMPOTENCY_KEY_TTL_HOURS", default=24)
+
+# 관리자 요청 프로파일링(X-Profile 헤더, _profile 매개변수) 결과 파일을 저장할 디렉토리
+PROFILE_DIR = env("PROFILE_DIR", default=str(BASE_DIR / "profiles"))
+
+
+# Logging Setting
+# 요청별 성능 로그(payhere.performance)는 LOG_LEVEL=INFO 일 때 출력됩니다.
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "simple": {
+            "format": "{asctime} {levelname} {name} {message}",
+            "style": "{",
+        },
+    },
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": "simple",
+        },
+        "slow_query_file": {
+            "class": "logging.handlers.RotatingFileHandler",
+            "filename": SLOW_QUERY_LOG_FILE,
+            "maxBytes": 10 * 1024 * 1024,
+            "backupCount": 5,
+            "encoding": "utf-8",
+            "delay": True,
+            "formatter": "simple",
+        },
+    },
+    "loggers": {
+        "payhere": {
+            "handlers": ["console"],
+            "level": env("LOG_LEVEL", default="WARNING"),
+            "propagate": False,
+        },
+        "payhere.slow_query": {
+            "handlers": ["slow_query_file"],
+            "level": "WARNING",
+            "propagate": False,
+        },
+        # "django.db.backends": {
+        #     "handlers": ["console"],
+        #     "level": "DEBUG",
+        # },
+    },
+}
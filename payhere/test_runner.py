@@ -0,0 +1,15 @@
+# django
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """테스트 실행 중에는 N+1 검사를 NPLUSONE_TEST_MODE(기본 raise)로 켜고,
+    테스트 사이에 캐시가 남지 않도록 응답/통계 캐시 시간을 RESPONSE_CACHE_TEST_TIMEOUT, STAT_CACHE_TEST_TIMEOUT(기본 0)으로 바꿉니다.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.NPLUSONE_MODE = settings.NPLUSONE_TEST_MODE
+        settings.RESPONSE_CACHE_TIMEOUT = settings.RESPONSE_CACHE_TEST_TIMEOUT
+        settings.STAT_CACHE_TIMEOUT = settings.STAT_CACHE_TEST_TIMEOUT
@@ -0,0 +1,1019 @@
+# django
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.http import Http404, StreamingHttpResponse
+from django.conf import settings
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.core.management import call_command
+from django.core.cache import cache, caches
+
+# rest_framework
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework.utils.serializer_helpers import ReturnList
+
+# python
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import datetime
+import tempfile
+import warnings
+import threading
+import subprocess
+from decimal import Decimal
+from unittest import mock
+from io import StringIO
+from statistics import median
+
+# apps
+from users.models import User
+from payhere.bench import ENDPOINTS, BenchUser
+from payhere.db import QueryCounter, NPlusOneDetector, NPlusOneError, normalize_sql, explain_query_plan, full_scans
+from payhere.metrics import MetricsRegistry, registry
+from payhere.renderers import FastJSONRenderer, JSONFragment, streaming_list_response
+from payhere.cache import single_flight, stale_while_revalidate, flights, user_version_key
+from account_books.models import AccountBook
+from expenses.models import Expense
+
+
+BASELINE_PATH = settings.BASE_DIR / "payhere" / "perf_baseline.json"
+
+
+class PerformanceBudgetTestCase(TestCase):
+    """엔드포인트별 쿼리 수/응답 시간 예산을 검증하는 클래스 (4개)
+
+    내역이 적은 유저(하루 평균 1건)와 많은 유저(하루 평균 10건)에게 같은 요청을 보내
+    perf_baseline.json의 예산과 비교합니다.
+    쿼리 수는 실행 환경과 무관하므로 항상 검사하고, 응답 시간은 CI 장비에 따라 흔들리므로 경고만 남깁니다.
+    PERF_UPDATE_BASELINE=1 로 실행하면 측정값으로 baseline 파일을 갱신합니다.
+    PERF_LATENCY_STRICT=1 로 실행하면 응답 시간 예산을 넘을 때 실패합니다.
+    PERF_LATENCY_TOLERANCE로 응답 시간 허용 배수를 바꿀 수 있습니다.
+    """
+
+    repeat = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command("loaddata", "json_data/expense_category_data.json", verbosity=0)
+        call_command("loaddata", "json_data/income_category_data.json", verbosity=0)
+        call_command("seed_dumy_data", users=1, days=62, entries_per_day=1, seed=1, stdout=StringIO())
+        call_command("seed_dumy_data", users=1, days=62, entries_per_day=10, seed=2, stdout=StringIO())
+
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            cls.baseline = json.load(f)
+        cls.tolerance = float(os.environ.get("PERF_LATENCY_TOLERANCE", cls.baseline["latency_tolerance"]))
+
+        client = Client()
+        light_user, heavy_user = User.objects.order_by("id")
+        cls.light = cls.measure_all(client, BenchUser(client, light_user, "test1234!"))
+        cls.heavy = cls.measure_all(client, BenchUser(client, heavy_user, "test1234!"))
+
+        if os.environ.get("PERF_UPDATE_BASELINE"):
+            cls.baseline["endpoints"] = {
+                name: {"max_queries": queries, "latency_ms": round(latency, 1)}
+                for name, (queries, latency, _) in cls.heavy.items()
+            }
+            with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+                json.dump(cls.baseline, f, ensure_ascii=False, indent=2)
+                f.write("\n")
+
+    @classmethod
+    def measure_all(cls, client, user):
+        """엔드포인트마다 (최대 쿼리 수, 응답 시간 중앙값(ms), 상태 코드 목록)을 반환합니다."""
+        results = {}
+        for name, endpoint in ENDPOINTS.items():
+            rng = random.Random(0)
+            queries, latencies, statuses = [], [], []
+            for _ in range(cls.repeat):
+                method, path, data = endpoint(user, rng)
+                counter = QueryCounter()
+                start = time.perf_counter()
+                with connection.execute_wrapper(counter):
+                    response = getattr(client, method)(path, data=data, HTTP_AUTHORIZATION=f"Bearer {user.access}")
+                latencies.append((time.perf_counter() - start) * 1000)
+                queries.append(counter.count)
+                statuses.append(response.status_code)
+            results[name] = (max(queries), median(latencies), statuses)
+        return results
+
+    def test_endpoint_success(self):
+        """
+        측정한 요청이 모두 성공했는지 검증하는 함수
+        """
+        for results in (self.light, self.heavy):
+            for name, (_, _, statuses) in results.items():
+                with self.subTest(endpoint=name):
+                    self.assertTrue(all(code < 400 for code in statuses), statuses)
+
+    def test_query_count_not_grow_with_rows(self):
+        """
+        내역 수가 늘어나도 쿼리 수가 같은지 검증하는 함수 (N+1 방지)
+        """
+        for name in ENDPOINTS:
+            with self.subTest(endpoint=name):
+                self.assertEqual(self.light[name][0], self.heavy[name][0])
+
+    def test_query_budget(self):
+        """
+        baseline의 최대 쿼리 수를 넘지 않는지 검증하는 함수
+        """
+        for name, (queries, _, _) in self.heavy.items():
+            budget = self.baseline["endpoints"].get(name)
+            with self.subTest(endpoint=name):
+                self.assertIsNotNone(budget, "perf_baseline.json에 예산이 없습니다.")
+                self.assertLessEqual(queries, budget["max_queries"])
+
+    def test_latency_budget(self):
+        """
+        baseline의 응답 시간 * 허용 배수 (+ 여유 시간)를 넘는 엔드포인트가 있으면 경고하는 함수
+        (PERF_LATENCY_STRICT=1 이면 실패)
+        """
+        over = {}
+        for name, (_, latency, _) in self.heavy.items():
+            budget = self.baseline["endpoints"].get(name)
+            if budget is None:
+                continue
+            limit = budget["latency_ms"] * self.tolerance + self.baseline["latency_floor_ms"]
+            if latency > limit:
+                over[name] = (round(latency, 1), round(limit, 1))
+        if not over:
+            return
+        message = f"응답 시간 예산 초과 (측정 ms, 예산 ms): {over}"
+        if os.environ.get("PERF_LATENCY_STRICT"):
+            self.fail(message)
+        warnings.warn(message)
+
+
+@override_settings(PERFORMANCE_SAMPLE_RATE=1.0)
+class PerformanceMiddlewareTestCase(TestCase):
+    """요청별 성능 측정 미들웨어를 검증하는 클래스 (5개)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test@test.com", "test", "Test1234!")
+        cls.admin = User.objects.create_superuser("admin@test.com", "admin", "Test1234!")
+        AccountBook.objects.create(owner=cls.user, date_at="2023-01-01")
+        AccountBook.objects.create(owner=cls.admin, date_at="2023-01-01")
+
+    def setUp(self):
+        self.access = self.get_access("test@test.com")
+        self.admin_access = self.get_access("admin@test.com")
+
+    def get_access(self, email):
+        return self.client.post(reverse("auth-signin"), {"email": email, "password": "Test1234!"}).json()["access"]
+
+    def get_account_book(self, access=None):
+        return self.client.get(
+            f"{reverse('account-book')}?date=2023-01", HTTP_AUTHORIZATION=f"Bearer {access or self.access}"
+        )
+
+    def test_server_timing_header(self):
+        """
+        관리자 요청의 Server-Timing 헤더에 db/serializer/render/total 시간과 쿼리 수가 담기는지 검증하는 함수
+        """
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = self.get_account_book(self.admin_access)
+        self.assertEqual(response.status_code, 200)
+        timing = response["Server-Timing"]
+        for name in ("db", "serializer", "render", "total"):
+            self.assertIn(f"{name};dur=", timing)
+        self.assertIn(f'desc="{counter.count} queries"', timing)
+
+    def test_server_timing_header_hidden(self):
+        """
+        일반 사용자 요청에는 Server-Timing 헤더 없이 로그만 남기는지 검증하는 함수 (DEBUG이면 헤더 포함)
+        """
+        with self.assertLogs("payhere.performance", "INFO"):
+            response = self.get_account_book()
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Server-Timing"))
+
+        with override_settings(DEBUG=True):
+            response = self.get_account_book()
+        self.assertTrue(response.has_header("Server-Timing"))
+
+    def test_log(self):
+        """
+        성능 로그가 JSON 한 줄로 남는지 검증하는 함수
+        """
+        with self.assertLogs("payhere.performance", "INFO") as logs:
+            self.get_account_book()
+        log = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(log["path"], reverse("account-book"))
+        self.assertEqual(log["view"], "AccountBookView")
+        self.assertEqual(log["status"], 200)
+        self.assertGreater(log["db_queries"], 0)
+
+    async def test_async_request(self):
+        """
+        async view 요청(ASGI)도 async ORM 쿼리 수와 view 이름을 기록하는지 검증하는 함수
+        """
+        with self.assertLogs("payhere.performance", "INFO") as logs:
+            response = await self.async_client.get(
+                f"{reverse('account-book-async')}?date=2023-01", AUTHORIZATION=f"Bearer {self.admin_access}"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("total;dur=", response["Server-Timing"])
+        log = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(log["view"], "AccountBookAsyncView")
+        self.assertGreater(log["db_queries"], 0)
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=0.0)
+    def test_sample_rate_zero(self):
+        """
+        샘플링 비율이 0이면 측정하지 않는지 검증하는 함수
+        """
+        with override_settings(DEBUG=True):
+            response = self.get_account_book()
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Server-Timing"))
+
+
+class MetricsAPIViewTestCase(TestCase):
+    """메트릭 조회를 검증하는 클래스 (5개)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user("test@test.com", "test", "Test1234!")
+        User.objects.create_superuser("admin@test.com", "admin", "Test1234!")
+
+    def get_access(self, email):
+        return self.client.post(reverse("auth-signin"), {"email": email, "password": "Test1234!"}).json()["access"]
+
+    def test_metrics_admin(self):
+        """
+        관리자가 메트릭을 text exposition format으로 조회하고 view 클래스 라벨이 붙는지 검증하는 함수
+        """
+        access = self.get_access("admin@test.com")
+        self.client.get(reverse("metrics"), HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        self.assertIn("# TYPE payhere_request_duration_seconds histogram", body)
+        self.assertIn('payhere_requests_total{method="GET",status="200",view="MetricsView"}', body)
+        self.assertIn('payhere_request_queries_bucket{view="MetricsView",le="+Inf"}', body)
+
+    def test_metrics_not_admin_fail(self):
+        """
+        관리자가 아닌 유저는 메트릭을 조회할 수 없는지 검증하는 함수
+        """
+        access = self.get_access("test@test.com")
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(response.status_code, 403)
+
+    def test_metrics_not_login_fail(self):
+        """
+        로그인하지 않은 유저는 메트릭을 조회할 수 없는지 검증하는 함수
+        """
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 401)
+
+    def test_metrics_multi_process(self):
+        """
+        METRICS_DIR의 프로세스별 파일을 합쳐서 보여주고 캐시 적중률을 계산하는지 검증하는 함수
+        """
+        with tempfile.TemporaryDirectory() as metrics_dir, self.settings(METRICS_DIR=metrics_dir):
+            worker = MetricsRegistry()
+            worker.inc("payhere_cache_requests_total", {"cache": "stat", "result": "hit"}, 3)
+            worker.observe("payhere_request_duration_seconds", {"view": "V", "method": "GET"}, 0.02)
+            # 실행 중인 다른 워커 (부모 프로세스의 pid)
+            with open(os.path.join(metrics_dir, f"metrics_{os.getppid()}.json"), "w", encoding="utf-8") as f:
+                json.dump(worker.snapshot(), f)
+
+            registry = MetricsRegistry()
+            registry.inc("payhere_cache_requests_total", {"cache": "stat", "result": "miss"})
+            registry.observe("payhere_request_duration_seconds", {"view": "V", "method": "GET"}, 0.2)
+            body = registry.render()
+
+        self.assertIn('payhere_cache_requests_total{cache="stat",result="hit"} 3', body)
+        self.assertIn('payhere_cache_hit_ratio{cache="stat"} 0.75', body)
+        self.assertIn('payhere_request_duration_seconds_bucket{method="GET",view="V",le="0.025"} 1', body)
+        self.assertIn('payhere_request_duration_seconds_bucket{method="GET",view="V",le="0.25"} 2', body)
+        self.assertIn('payhere_request_duration_seconds_count{method="GET",view="V"} 2', body)
+
+    def test_metrics_dead_process(self):
+        """
+        종료된 프로세스의 METRICS_DIR 파일은 합치지 않고 지우는지 검증하는 함수
+        """
+        process = subprocess.Popen([sys.executable, "-c", ""])
+        process.wait()
+        with tempfile.TemporaryDirectory() as metrics_dir, self.settings(METRICS_DIR=metrics_dir):
+            worker = MetricsRegistry()
+            worker.inc("payhere_cache_requests_total", {"cache": "stat", "result": "hit"}, 3)
+            path = os.path.join(metrics_dir, f"metrics_{process.pid}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(worker.snapshot(), f)
+
+            registry = MetricsRegistry()
+            registry.inc("payhere_cache_requests_total", {"cache": "stat", "result": "miss"})
+            body = registry.render()
+            self.assertFalse(os.path.exists(path))
+            self.assertTrue(os.path.exists(os.path.join(metrics_dir, f"metrics_{os.getpid()}.json")))
+
+        self.assertNotIn('payhere_cache_requests_total{cache="stat",result="hit"}', body)
+        self.assertIn('payhere_cache_requests_total{cache="stat",result="miss"} 1', body)
+
+
+class SlowQueryLoggerTestCase(TestCase):
+    """느린 쿼리 로그를 검증하는 클래스 (4개)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test@test.com", "test", "Test1234!")
+        AccountBook.objects.create(owner=cls.user, date_at="2023-01-01")
+
+    def setUp(self):
+        self.access = self.client.post(
+            reverse("auth-signin"), {"email": "test@test.com", "password": "Test1234!"}
+        ).json()["access"]
+
+    def get_account_book(self):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = self.client.get(f"{reverse('account-book')}?date=2023-01", HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        self.assertEqual(response.status_code, 200)
+        return counter.count
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_slow_query_log(self):
+        """
+        기준 시간 이상 걸린 쿼리가 정규화한 SQL, 파라미터 수, view, 코드 위치, 실행 계획과 함께 기록되는지 검증하는 함수
+        """
+        with self.assertLogs("payhere.slow_query", "WARNING") as logs:
+            self.get_account_book()
+        records = [json.loads(record.getMessage()) for record in logs.records]
+        log = next(record for record in records if 'FROM "AccountBook"' in record["sql"])
+        self.assertEqual(log["view"], "AccountBookView")
+        self.assertTrue(log["frame"].startswith("account_books/views.py:"))
+        self.assertEqual(log["params_count"], 7)
+        self.assertTrue(log["plan"])
+
+    def test_slow_query_under_threshold(self):
+        """
+        기준 시간보다 빠른 쿼리는 기록하지 않는지 검증하는 함수
+        """
+        with self.settings(SLOW_QUERY_THRESHOLD_MS=60 * 1000), self.assertNoLogs("payhere.slow_query", "WARNING"):
+            self.get_account_book()
+
+    def test_explain_not_counted(self):
+        """
+        실행 계획 조회가 요청의 쿼리 수에 포함되지 않는지 검증하는 함수
+        """
+        with self.settings(SLOW_QUERY_THRESHOLD_MS=-1):
+            count = self.get_account_book()
+        with self.settings(SLOW_QUERY_THRESHOLD_MS=0), self.assertLogs("payhere.slow_query", "WARNING"):
+            self.assertEqual(self.get_account_book(), count)
+
+    def test_normalize_sql(self):
+        """
+        IN 목록과 값이 달라도 같은 SQL로 정규화되는지 검증하는 함수
+        """
+        self.assertEqual(
+            normalize_sql("SELECT *  FROM t WHERE a IN (%s, %s, %s) AND b = 'x' AND c > 10"),
+            normalize_sql("SELECT * FROM t WHERE a IN (%s) AND b = 'y' AND c > 3"),
+        )
+        self.assertEqual(normalize_sql("SELECT * FROM t WHERE a IN (%s, %s)"), "SELECT * FROM t WHERE a IN (...)")
+
+
+class ProfilingMiddlewareTestCase(TestCase):
+    """관리자 요청 프로파일링을 검증하는 클래스 (4개)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test@test.com", "test", "Test1234!")
+        cls.admin = User.objects.create_superuser("admin@test.com", "admin", "Test1234!")
+        AccountBook.objects.create(owner=cls.admin, date_at="2023-01-01")
+
+    def setUp(self):
+        self.profile_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.profile_dir.cleanup)
+        self.settings_override = self.settings(PROFILE_DIR=self.profile_dir.name)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def get_account_book(self, email, **extra):
+        access = self.client.post(reverse("auth-signin"), {"email": email, "password": "Test1234!"}).json()["access"]
+        return self.client.get(f"{reverse('account-book')}?date=2023-01", HTTP_AUTHORIZATION=f"Bearer {access}", **extra)
+
+    def test_profile_cpu(self):
+        """
+        관리자가 X-Profile 헤더를 보내면 pstats, collapsed stack 파일이 저장되는지 검증하는 함수
+        """
+        response = self.get_account_book("admin@test.com", HTTP_X_PROFILE="cpu")
+        self.assertEqual(response.status_code, 200)
+        profile_id = response["X-Profile-Id"]
+        self.assertEqual(
+            sorted(os.listdir(self.profile_dir.name)), [f"{profile_id}.collapsed", f"{profile_id}.pstats"]
+        )
+        with open(os.path.join(self.profile_dir.name, f"{profile_id}.collapsed"), encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertTrue(lines)
+        self.assertTrue(any("get (views.py:" in line for line in lines))
+        self.assertTrue(all(line.rsplit(" ", 1)[1].isdigit() for line in lines))
+
+    def test_profile_memory(self):
+        """
+        _profile 매개변수로 메모리 할당 목록이 저장되는지 검증하는 함수
+        """
+        access = self.client.post(reverse("auth-signin"), {"email": "admin@test.com", "password": "Test1234!"}).json()["access"]
+        response = self.client.get(
+            f"{reverse('account-book')}?date=2023-01&_profile=memory", HTTP_AUTHORIZATION=f"Bearer {access}"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(os.listdir(self.profile_dir.name), [f"{response['X-Profile-Id']}.memory.txt"])
+
+    def test_profile_not_admin(self):
+        """
+        관리자가 아니면 프로파일링하지 않는지 검증하는 함수
+        """
+        response = self.get_account_book("test@test.com", HTTP_X_PROFILE="cpu,memory")
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header("X-Profile-Id"))
+        self.assertEqual(os.listdir(self.profile_dir.name), [])
+
+    def test_profile_invalid_token(self):
+        """
+        토큰이 잘못되면 프로파일링하지 않고 기존 인증 오류를 반환하는지 검증하는 함수
+        """
+        response = self.client.get(
+            f"{reverse('account-book')}?date=2023-01", HTTP_AUTHORIZATION="Bearer invalid", HTTP_X_PROFILE="cpu"
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(response.has_header("X-Profile-Id"))
+
+
+class NPlusOneDetectorTestCase(TestCase):
+    """N+1 쿼리 검사를 검증하는 클래스 (5개)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test@test.com", "test", "Test1234!")
+        AccountBook.objects.create(owner=cls.user, date_at="2023-01-01")
+
+    def run_queries(self, detector, count):
+        with connection.execute_wrapper(detector):
+            for i in range(count):
+                AccountBook.objects.filter(id=i).first()
+
+    def test_detect(self):
+        """
+        같은 모양의 쿼리가 기준 횟수를 넘으면 실행 횟수와 코드 위치를 보고하는지 검증하는 함수
+        """
+        detector = NPlusOneDetector(threshold=2)
+        self.run_queries(detector, 3)
+        [(count, frame, shape)] = detector.problems()
+        self.assertEqual(count, 3)
+        self.assertTrue(frame.startswith("payhere/tests.py:"))
+        self.assertIn('FROM "AccountBook"', shape)
+        with self.assertRaises(NPlusOneError):
+            detector.report("View", "raise")
+        with self.assertLogs("payhere.nplusone", "WARNING"):
+            detector.report("View", "warn")
+
+    def test_under_threshold(self):
+        """
+        기준 횟수 이하로 실행하면 보고하지 않는지 검증하는 함수
+        """
+        detector = NPlusOneDetector(threshold=2)
+        self.run_queries(detector, 2)
+        self.assertEqual(detector.problems(), [])
+
+    def test_writes_not_reported(self):
+        """
+        INSERT, UPDATE, SAVEPOINT 반복은 N+1로 보고하지 않는지 검증하는 함수
+        """
+        detector = NPlusOneDetector(threshold=2)
+        with connection.execute_wrapper(detector):
+            for i in range(5):
+                with transaction.atomic():
+                    account_book = AccountBook.objects.create(owner=self.user, date_at=f"2023-02-0{i + 1}")
+                    AccountBook.objects.filter(id=account_book.id).update(day_total_money=i)
+        self.assertEqual(detector.problems(), [])
+
+    @override_settings(NPLUSONE_MODE="raise", NPLUSONE_THRESHOLD=0)
+    def test_middleware_raise(self):
+        """
+        raise 모드에서 요청 중 N+1이 발견되면 NPlusOneError가 발생하는지 검증하는 함수
+        """
+        with self.assertRaises(NPlusOneError):
+            self.client.post(reverse("auth-signin"), {"email": "test@test.com", "password": "Test1234!"})
+
+    @override_settings(NPLUSONE_MODE="raise", NPLUSONE_THRESHOLD=1)
+    def test_category_list_query(self):
+        """
+        카테고리 리스트 조회가 카테고리마다 쿼리를 반복하지 않는지 검증하는 함수
+        """
+        call_command("loaddata", "json_data/expense_category_data.json", verbosity=0)
+        call_command("loaddata", "json_data/income_category_data.json", verbosity=0)
+        access = self.client.post(reverse("auth-signin"), {"email": "test@test.com", "password": "Test1234!"}).json()["access"]
+        for name in ("expense-category", "income-category"):
+            with self.subTest(name=name):
+                response = self.client.get(reverse(name), HTTP_AUTHORIZATION=f"Bearer {access}")
+                self.assertEqual(response.status_code, 200)
+
+
+class QueryPlanTestCase(TestCase):
+    """자주 호출되는 조회 쿼리가 인덱스를 사용하는지 검증하는 클래스 (2개)
+
+    엔드포인트마다 실행한 SELECT 쿼리를 모아 EXPLAIN QUERY PLAN(SQLite)으로
+    가계부/지출/수익/공유 URL 테이블을 전체 SCAN 하지 않는지 확인합니다.
+    """
+
+    tables = {"AccountBook", "Expense", "Income", "ExpenseURL", "IncomeURL"}
+    endpoints = (
+        "account-book",
+        "account-book-detail",
+        "expense-list",
+        "expense-detail",
+        "expense-share-url",
+        "expense-category-search",
+        "expense-caregory-stat",
+        "income-list",
+        "income-detail",
+        "income-share-url",
+        "income-category-search",
+        "income-caregory-stat",
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command("loaddata", "json_data/expense_category_data.json", verbosity=0)
+        call_command("loaddata", "json_data/income_category_data.json", verbosity=0)
+        call_command("seed_dumy_data", users=2, days=5, entries_per_day=2, seed=1, stdout=StringIO())
+        cls.bench_user = BenchUser(Client(), User.objects.order_by("id").first(), "test1234!")
+
+    def capture_plans(self, name):
+        """엔드포인트 요청에서 실행한 SELECT 쿼리별 (SQL, 실행 계획) 목록"""
+        method, path, data = ENDPOINTS[name](self.bench_user, random.Random(0))
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(path, data=data, HTTP_AUTHORIZATION=f"Bearer {self.bench_user.access}")
+        self.assertLess(response.status_code, 400, path)
+
+        plans = []
+        for query in context.captured_queries:
+            sql = query["sql"]
+            if sql.startswith("SELECT"):
+                plans.append((sql, explain_query_plan(connection, sql)))
+        return plans
+
+    def test_hot_query_use_index(self):
+        """
+        조회 엔드포인트의 쿼리가 가계부/지출/수익/공유 URL 테이블을 SCAN 하지 않는지 검증하는 함수 (인덱스 전체 SCAN 포함)
+        """
+        if connection.vendor != "sqlite":
+            self.skipTest("EXPLAIN QUERY PLAN은 SQLite에서만 검사합니다.")
+
+        for name in self.endpoints:
+            for sql, plan in self.capture_plans(name):
+                with self.subTest(endpoint=name, sql=sql):
+                    self.assertEqual(full_scans(plan, self.tables), [], plan)
+
+    def test_full_scans(self):
+        """
+        실행 계획에서 SEARCH ... USING INDEX가 아닌 SCAN을 모두 골라내는지 검증하는 함수
+        case: 인덱스 전체 SCAN 포함, 의도한 전체 SCAN 제외(allowed)
+        """
+        plan = [
+            "SCAN AccountBook",
+            "SCAN Expense USING INDEX Expense_account_book_id_a001c11d",
+            "SEARCH Income USING INDEX Income_account_book_id_a0f27bb1 (account_book_id=?)",
+            "SCAN IncomeURL USING COVERING INDEX IncomeURL_income_id_key",
+            "SCAN ExpenseCategory",
+            "USE TEMP B-TREE FOR ORDER BY",
+        ]
+        self.assertEqual(full_scans(plan, self.tables), ["AccountBook", "Expense", "IncomeURL"])
+        self.assertEqual(full_scans(plan, self.tables, allowed={"AccountBook"}), ["Expense", "IncomeURL"])
+
+
+class FastJSONRendererTestCase(TestCase):
+    """FastJSONRenderer를 검증하는 클래스 (5개)"""
+
+    data = {
+        "id": 1,
+        "money": "1,234,567",
+        "detail": "(주) 소고기 짱 좋아\u2028",
+        "date_at": datetime.datetime(2023, 2, 1, 12, 30, 15, 123456),
+        "day": datetime.date(2023, 2, 1),
+        "amount": Decimal("12.50"),
+        "key": uuid.UUID(int=1),
+        1: None,
+        "items": ReturnList([{"id": 1, "ratio": 0.1, "ok": True}, {"id": 2, "ratio": 33.33, "ok": False}], serializer=None),
+    }
+
+    def test_same_as_json_renderer(self):
+        """
+        JSONRenderer와 같은 bytes로 인코딩하는지 검증하는 함수
+        """
+        self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_json_fallback(self):
+        """
+        orjson이 없거나 인코딩할 수 없을 때, 들여쓰기를 요청했을 때 json 모듈로 같은 결과를 만드는지 검증하는 함수
+        """
+        with mock.patch("payhere.renderers.orjson", None):
+            self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+        data = {"big": 2 ** 70}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+        media_type = "application/json; indent=4"
+        self.assertEqual(
+            FastJSONRenderer().render(self.data, media_type), JSONRenderer().render(self.data, media_type)
+        )
+
+    def test_json_fragment(self):
+        """
+        JSONFragment의 bytes를 다시 인코딩하지 않고 그대로 넣는지 검증하는 함수
+        """
+        categories = {"(1) 식비": [{"id": 15, "name": "외식"}]}
+        data = {"categories": JSONFragment(JSONRenderer().render(categories)), "total": JSONFragment("3")}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render({"categories": categories, "total": 3}))
+
+        with mock.patch("payhere.renderers.orjson", None):
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render({"categories": categories, "total": 3}))
+
+    def test_streaming_list_response(self):
+        """
+        chunk_size개 이하면 Response로, 더 많으면 같은 내용의 StreamingHttpResponse로 응답하는지 검증하는 함수
+        """
+        items = [{"id": i} for i in range(4)]
+        for count in (0, 2):
+            with self.subTest(count=count):
+                response = streaming_list_response(iter(items[:count]), 2)
+                self.assertIsInstance(response, Response)
+                self.assertEqual(response.data, items[:count])
+
+        for count in (3, 4):
+            with self.subTest(count=count):
+                response = streaming_list_response(iter(items[:count]), 2)
+                self.assertIsInstance(response, StreamingHttpResponse)
+                self.assertEqual(b"".join(response.streaming_content), FastJSONRenderer().render(items[:count]))
+
+    def test_default_renderer(self):
+        """
+        API 응답이 FastJSONRenderer로 렌더링되는지 검증하는 함수
+        """
+        user = User.objects.create_user("test@test.com", "test", "Test1234!")
+        account_book = AccountBook.objects.create(owner=user, date_at="2023-01-01", day_total_money=-1234567)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.get(f"{reverse('account-book')}?date=2023-01")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        expected = [{"id": account_book.id, "date_at": "2023-01-01", "day_total_money": "-1,234,567"}]
+        self.assertEqual(response.content, JSONRenderer().render(expected))
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=300)
+class ResponseCacheTestCase(TestCase):
+    """사용자 데이터 버전별 응답 캐시(cache_response)를 검증하는 클래스 (4개)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test@test.com", "test", "Test1234!")
+        cls.other_user = User.objects.create_user("other@test.com", "other", "Test1234!")
+        cls.account_book = AccountBook.objects.create(owner=cls.user, date_at="2023-01-01")
+        AccountBook.objects.create(owner=cls.other_user, date_at="2023-01-01")
+        Expense.objects.create(money=3000, owner=cls.user, account_book=cls.account_book)
+
+    def setUp(self):
+        cache.clear()
+        self.headers = {"HTTP_AUTHORIZATION": f"Bearer {self.get_access('test@test.com')}"}
+
+    def get_access(self, email):
+        return self.client.post(reverse("auth-signin"), {"email": email, "password": "Test1234!"}).json()["access"]
+
+    def get(self, name, **extra):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"{reverse(name)}?date=2023-01", **{**self.headers, **extra})
+        return response, len(queries)
+
+    def hits(self, name):
+        labels = [("cache", f"response:{name}"), ("result", "hit")]
+        counters = registry.snapshot()["counters"]
+        return sum(value for metric, metric_labels, value in counters if metric == "payhere_cache_requests_total" and metric_labels == labels)
+
+    def test_cache_hit(self):
+        """
+        같은 요청은 인증 쿼리 외에 쿼리 없이 같은 응답을 반환하고 적중 수를 기록하는지 검증하는 함수
+        """
+        for name in ("account-book", "expense-category-search", "expense-caregory-stat", "income-caregory-stat"):
+            hits = self.hits(name)
+            response, _ = self.get(name)
+            cached_response, count = self.get(name)
+            self.assertEqual(cached_response.status_code, 200)
+            self.assertEqual(cached_response.content, response.content)
+            self.assertEqual(count, 1)
+            self.assertEqual(self.hits(name), hits + 1)
+
+    def test_cache_invalidated_by_write(self):
+        """
+        지출 생성, 가계부 생성 후에는 이전 응답을 반환하지 않는지 검증하는 함수
+        """
+        self.get("account-book")
+        self.get("expense-caregory-stat")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("expense-create", kwargs={"account_book_id": self.account_book.id}),
+                {"money": 1000, "payment_method": "현금"},
+                **self.headers,
+            )
+        response, count = self.get("account-book")
+        self.assertGreater(count, 1)
+        self.assertEqual(response.json()[0]["day_total_money"], "-1,000")
+        response, _ = self.get("expense-caregory-stat")
+        self.assertEqual(response.json()["category_data"]["없음"]["amount"], "4000")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("account-book"), {"date_at": "2023-01-02"}, **self.headers)
+        self.assertEqual(len(self.get("account-book")[0].json()), 2)
+
+    def test_cache_per_user(self):
+        """
+        다른 사용자, 다른 매개변수의 요청은 캐시를 공유하지 않는지 검증하는 함수
+        """
+        response, _ = self.get("account-book")
+        other_response, _ = self.get("account-book", HTTP_AUTHORIZATION=f"Bearer {self.get_access('other@test.com')}")
+        self.assertNotEqual(other_response.json()[0]["id"], response.json()[0]["id"])
+
+        self.assertEqual(self.client.get(f"{reverse('account-book')}?date=2023-02", **self.headers).status_code, 404)
+
+    def test_cache_not_modified(self):
+        """
+        캐시된 응답도 ETag가 같으면 304로 응답하는지 검증하는 함수
+        """
+        response, _ = self.get("account-book")
+        not_modified, count = self.get("account-book", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+        self.assertEqual(count, 1)
+
+
+TIERED_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "tiered-default"},
+    "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "tiered-shared"},
+    "worker1": {
+        "BACKEND": "payhere.tiered_cache.TieredCache",
+        "LOCATION": "shared",
+        "OPTIONS": {"L1_MAX_ENTRIES": 2, "L1_TIMEOUT": 60},
+    },
+    "worker2": {"BACKEND": "payhere.tiered_cache.TieredCache", "LOCATION": "shared"},
+}
+
+
+@override_settings(CACHES=TIERED_CACHES)
+class TieredCacheTestCase(TestCase):
+    """L1(프로세스 LRU) + L2(공유 캐시) 캐시(TieredCache)를 검증하는 클래스 (5개)"""
+
+    def setUp(self):
+        caches["shared"].clear()
+        self.worker1 = caches["worker1"]
+        self.worker2 = caches["worker2"]
+        self.worker1.l1.clear()
+        self.worker2.l1.clear()
+
+    def count(self, metric, **labels):
+        labels = sorted(labels.items())
+        counters = registry.snapshot()["counters"]
+        return sum(value for name, metric_labels, value in counters if name == metric and metric_labels == labels)
+
+    def test_l1_hit(self):
+        """
+        L1에 있는 값은 L2에서 stamp만 확인하고 반환하는지 검증하는 함수
+        """
+        self.worker1.set("key", {"value": 1})
+        hits = self.count("payhere_cache_requests_total", cache="tiered:l1", result="hit")
+        value = self.worker1.get("key")
+        value["value"] = 2
+        self.assertEqual(self.worker1.get("key"), {"value": 1})
+        self.assertEqual(self.count("payhere_cache_requests_total", cache="tiered:l1", result="hit"), hits + 2)
+
+        # 다른 워커는 L2에서 읽고 L1에 저장
+        l2_hits = self.count("payhere_cache_requests_total", cache="tiered:l2", result="hit")
+        self.assertEqual(self.worker2.get("key"), {"value": 1})
+        self.assertEqual(self.worker2.get("key"), {"value": 1})
+        self.assertEqual(self.count("payhere_cache_requests_total", cache="tiered:l2", result="hit"), l2_hits + 1)
+        self.assertIsNone(self.worker2.get("missing"))
+
+    def test_stale_invalidation(self):
+        """
+        다른 워커가 값을 바꾸거나 지우면 L1 값을 버리는지 검증하는 함수
+        """
+        self.worker1.set("key", "old")
+        self.assertEqual(self.worker2.get("key"), "old")
+        stale = self.count("payhere_cache_evictions_total", cache="tiered:l1", reason="stale")
+
+        self.worker1.set("key", "new")
+        self.assertEqual(self.worker2.get("key"), "new")
+        self.worker2.delete("key")
+        self.assertIsNone(self.worker1.get("key"))
+        self.assertEqual(self.count("payhere_cache_evictions_total", cache="tiered:l1", reason="stale"), stale + 2)
+
+    def test_concurrent_set_not_cached_stale(self):
+        """
+        L2에서 stamp와 값을 읽는 사이에 다른 워커가 값을 바꿔도 이전 값을 L1에 남기지 않는지 검증하는 함수
+        """
+        self.worker1.set("key", "old")
+        shared_get = caches["shared"].get
+
+        def get(key, *args, **kwargs):
+            value = shared_get(key, *args, **kwargs)
+            # 첫 L2 읽기 직후 다른 워커가 값을 바꿉니다.
+            if not written:
+                written.append(1)
+                self.worker2.set("key", "new")
+            return value
+
+        written = []
+        # L1에 없어 L2에서 읽는 경우
+        self.worker1.l1.clear()
+        with mock.patch.object(caches["shared"], "get", side_effect=get):
+            value = self.worker1.get("key")
+        self.assertIn(value, ("old", "new"))
+        self.assertEqual(self.worker1.get("key"), "new")
+        self.assertEqual(self.worker1.get("key"), "new")
+
+    def test_eviction(self):
+        """
+        L1_MAX_ENTRIES, L1_TIMEOUT을 넘은 L1 값을 버리는지 검증하는 함수
+        case: LRU, 만료
+        """
+        lru = self.count("payhere_cache_evictions_total", cache="tiered:l1", reason="lru")
+        for key in ("a", "b", "c"):
+            self.worker1.set(key, key)
+        self.assertEqual(list(self.worker1.l1), [self.worker1.make_key(key) for key in ("b", "c")])
+        self.assertEqual(self.count("payhere_cache_evictions_total", cache="tiered:l1", reason="lru"), lru + 1)
+        # L1에서 빠져도 L2에서 조회
+        self.assertEqual(self.worker1.get("a"), "a")
+
+        expired = self.count("payhere_cache_evictions_total", cache="tiered:l1", reason="expired")
+        with mock.patch("payhere.tiered_cache.time.monotonic", return_value=time.monotonic() + 61):
+            self.assertEqual(self.worker1.get("c"), "c")
+        self.assertEqual(self.count("payhere_cache_evictions_total", cache="tiered:l1", reason="expired"), expired + 1)
+
+    def test_add_incr(self):
+        """
+        add, incr, touch가 L2 기준으로 동작하는지 검증하는 함수
+        """
+        self.assertTrue(self.worker1.add("count", 1))
+        self.assertFalse(self.worker2.add("count", 5))
+        self.assertEqual(self.worker2.get("count"), 1)
+        self.assertEqual(self.worker1.incr("count"), 2)
+        self.assertEqual(self.worker2.get("count"), 2)
+        self.assertTrue(self.worker2.has_key("count"))
+        self.assertTrue(self.worker1.touch("count", 10))
+        self.assertFalse(self.worker1.touch("missing", 10))
+        with self.assertRaises(ValueError):
+            self.worker1.incr("missing")
+
+
+@override_settings(STAT_CACHE_TIMEOUT=300)
+class SingleFlightTestCase(TestCase):
+    """통계 계산 single-flight / stale-while-revalidate를 검증하는 클래스 (5개)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("test@test.com", "test", "Test1234!")
+        cls.account_book = AccountBook.objects.create(owner=cls.user, date_at="2023-01-01")
+        Expense.objects.create(money=3000, owner=cls.user, account_book=cls.account_book)
+
+    def setUp(self):
+        cache.clear()
+
+    def count(self, name, result):
+        labels = [("name", name), ("result", result)]
+        counters = registry.snapshot()["counters"]
+        return sum(value for metric, metric_labels, value in counters if metric == "payhere_single_flight_total" and metric_labels == labels)
+
+    def run_concurrently(self, key, compute):
+        """compute가 실행 중일 때 같은 key로 한 번 더 호출하고 두 호출의 (결과 또는 예외) 목록을 반환합니다."""
+        started, release, results = threading.Event(), threading.Event(), []
+
+        def blocking_compute():
+            started.set()
+            release.wait(5)
+            return compute()
+
+        def call(function):
+            try:
+                results.append(single_flight(key, function))
+            except Exception as error:
+                results.append(error)
+
+        shared = self.count("test", "shared")
+        leader = threading.Thread(target=call, args=(blocking_compute,))
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=call, args=(compute,))
+        follower.start()
+        while self.count("test", "shared") == shared:
+            time.sleep(0.01)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+        self.assertNotIn(key, flights)
+        return results
+
+    def test_single_flight(self):
+        """
+        single_flight 함수를 검증하는 함수
+        case: 동시에 들어온 같은 key의 호출은 한 번만 계산하고 결과를 함께 사용
+        """
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"amount": "3000"}
+
+        results = self.run_concurrently("test:1", compute)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"amount": "3000"}, {"amount": "3000"}])
+
+    def test_single_flight_error(self):
+        """
+        single_flight 함수를 검증하는 함수
+        case: 계산 중 예외가 나면 기다리던 호출도 같은 예외를 받음
+        """
+
+        def compute():
+            raise Http404
+
+        results = self.run_concurrently("test:2", compute)
+        self.assertEqual(len(results), 2)
+        self.assertIs(results[0], results[1])
+        self.assertIsInstance(results[0], Http404)
+
+    def test_stale_while_revalidate(self):
+        """
+        stale_while_revalidate 함수를 검증하는 함수
+        case: 같은 버전은 저장한 결과, 다른 워커가 계산 중이면 이전 결과, 계산이 끝나면 새 결과
+        """
+        values = iter(["old", "new"])
+        compute = lambda: next(values)
+        self.assertEqual(stale_while_revalidate("test-stat", self.user.id, "2023-01", compute), "old")
+        self.assertEqual(stale_while_revalidate("test-stat", self.user.id, "2023-01", compute), "old")
+
+        cache.set(user_version_key(self.user.id), uuid.uuid4().hex, None)
+        cache.add(f"lock:test-stat:{self.user.id}:2023-01", "other", 10)
+        stale = self.count("test-stat", "stale")
+        self.assertEqual(stale_while_revalidate("test-stat", self.user.id, "2023-01", compute), "old")
+        self.assertEqual(self.count("test-stat", "stale"), stale + 1)
+
+        cache.delete(f"lock:test-stat:{self.user.id}:2023-01")
+        self.assertEqual(stale_while_revalidate("test-stat", self.user.id, "2023-01", compute), "new")
+        self.assertEqual(stale_while_revalidate("test-stat", self.user.id, "2023-01", compute), "new")
+
+    def test_stale_response_not_cached(self):
+        """
+        cache_response 함수를 검증하는 함수
+        case: stale_while_revalidate가 이전 결과를 반환한 응답은 새 버전 키로 캐시하지 않음
+        """
+        access = self.client.post(reverse("auth-signin"), {"email": "test@test.com", "password": "Test1234!"}).json()["access"]
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {access}"}
+        url = f"{reverse('expense-caregory-stat')}?date=2023-01"
+        amount = lambda: self.client.get(url, **headers).json()["category_data"]["없음"]["amount"]
+
+        with self.settings(RESPONSE_CACHE_TIMEOUT=300, STAT_CACHE_TIMEOUT=3600):
+            self.assertEqual(amount(), "3000")
+            with self.captureOnCommitCallbacks(execute=True):
+                Expense.objects.create(money=1000, owner=self.user, account_book=self.account_book)
+                self.account_book.touch()
+
+            # 다른 워커가 다시 계산 중이면 이전 결과를 받지만 응답 캐시에는 저장하지 않습니다.
+            lock_key = f"lock:expense-stat:{self.user.id}:2023-01"
+            cache.add(lock_key, "other", 10)
+            self.assertEqual(amount(), "3000")
+            cache.delete(lock_key)
+            self.assertEqual(amount(), "4000")
+            self.assertEqual(amount(), "4000")
+
+    def test_stat_view(self):
+        """
+        카테고리 통계 API가 계산 결과를 다시 사용하고, 데이터가 바뀌면 다시 계산하는지 검증하는 함수
+        """
+        access = self.client.post(reverse("auth-signin"), {"email": "test@test.com", "password": "Test1234!"}).json()["access"]
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {access}"}
+        url = f"{reverse('expense-caregory-stat')}?date=2023-01"
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, **headers)
+        with CaptureQueriesContext(connection) as cached_queries:
+            cached_response = self.client.get(url, **headers)
+        self.assertEqual(cached_response.json(), response.json())
+        self.assertLess(len(cached_queries), len(queries))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("expense-create", kwargs={"account_book_id": self.account_book.id}),
+                {"money": 1000, "payment_method": "현금"},
+                **headers,
+            )
+        self.assertEqual(self.client.get(url, **headers).json()["category_data"]["없음"]["amount"], "4000")
@@ -0,0 +1,150 @@
+# django
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+
+# python
+import time
+import uuid
+import pickle
+import threading
+from collections import OrderedDict
+
+# payhere
+from payhere.metrics import record_cache, record_cache_eviction
+
+
+class TieredCache(BaseCache):
+    """프로세스별 LRU 캐시(L1)를 공유 캐시(L2, LOCATION의 캐시 alias) 앞에 둔 캐시
+
+    CACHES = {
+        "default": {"BACKEND": "payhere.tiered_cache.TieredCache", "LOCATION": "shared",
+                    "OPTIONS": {"L1_MAX_ENTRIES": 500, "L1_TIMEOUT": 60}},
+        "shared": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": "..."},
+    }
+
+    L2에는 값과 함께 저장할 때마다 바뀌는 stamp를 저장합니다. L1에 있는 값은 L2의 stamp가 같을 때만 사용하므로
+    다른 워커가 값을 바꾸거나 지우면 L1 값은 버려집니다. (큰 값 대신 작은 stamp만 L2에서 읽습니다.)
+    L2에서는 stamp를 먼저 읽고 값을 읽으며, 저장할 때는 값을 먼저 쓰고 stamp를 씁니다.
+    L1은 L1_MAX_ENTRIES개, L1_TIMEOUT초까지만 보관합니다.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.shared_alias = location
+        self.l1_max_entries = int(options.get("L1_MAX_ENTRIES", 500))
+        self.l1_timeout = float(options.get("L1_TIMEOUT", 60))
+        # key: (만료 시각, stamp, pickle한 값)
+        self.l1 = OrderedDict()
+        self.lock = threading.Lock()
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def stamp_key(self, key):
+        return f"stamp:{key}"
+
+    def l1_get(self, l1_key):
+        with self.lock:
+            entry = self.l1.get(l1_key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self.l1[l1_key]
+                record_cache_eviction("tiered:l1", "expired")
+                return None
+            self.l1.move_to_end(l1_key)
+            return entry
+
+    def l1_set(self, l1_key, stamp, value, timeout=DEFAULT_TIMEOUT):
+        timeout = self.get_backend_timeout(timeout)
+        l1_timeout = self.l1_timeout if timeout is None else min(self.l1_timeout, timeout)
+        if l1_timeout <= 0:
+            self.l1_delete(l1_key)
+            return
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self.l1[l1_key] = (time.monotonic() + l1_timeout, stamp, pickled)
+            self.l1.move_to_end(l1_key)
+            while len(self.l1) > self.l1_max_entries:
+                self.l1.popitem(last=False)
+                record_cache_eviction("tiered:l1", "lru")
+
+    def l1_delete(self, l1_key):
+        with self.lock:
+            self.l1.pop(l1_key, None)
+
+    def get(self, key, default=None, version=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        stamp_key = self.stamp_key(key)
+        entry = self.l1_get(l1_key)
+        if entry is not None:
+            _, stamp, pickled = entry
+            if self.shared.get(stamp_key, version=version) == stamp:
+                record_cache("tiered:l1", True)
+                return pickle.loads(pickled)
+            # 다른 워커가 바꾸거나 지운 값
+            self.l1_delete(l1_key)
+            record_cache_eviction("tiered:l1", "stale")
+        record_cache("tiered:l1", False)
+
+        # stamp를 먼저 읽고 값을 읽습니다. (저장할 때는 값을 먼저, stamp를 나중에 씁니다.)
+        # 그 사이에 다른 워커가 값을 바꾸면 L1에는 (이전 stamp, 새 값)이 들어가 다음 조회에서 버려지고,
+        # 반대 순서처럼 (새 stamp, 이전 값)이 L1에 남아 계속 사용되는 일은 없습니다.
+        stamp = self.shared.get(stamp_key, version=version)
+        sentinel = object()
+        value = self.shared.get(key, sentinel, version=version)
+        record_cache("tiered:l2", value is not sentinel)
+        if value is sentinel:
+            return default
+        if stamp is not None:
+            self.l1_set(l1_key, stamp, value)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        stamp = uuid.uuid4().hex
+        # get과 반대로 값을 먼저, stamp를 나중에 씁니다. (set_many는 backend에 따라 순서를 보장하지 않음)
+        self.shared.set(key, value, timeout, version=version)
+        self.shared.set(self.stamp_key(key), stamp, timeout, version=version)
+        self.l1_set(l1_key, stamp, value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        if not self.shared.add(key, value, timeout, version=version):
+            return False
+        stamp = uuid.uuid4().hex
+        self.shared.set(self.stamp_key(key), stamp, timeout, version=version)
+        self.l1_set(l1_key, stamp, value, timeout)
+        return True
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        self.l1_delete(l1_key)
+        self.shared.touch(self.stamp_key(key), timeout, version=version)
+        return self.shared.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        self.l1_delete(l1_key)
+        deleted = self.shared.delete(key, version=version)
+        self.shared.delete(self.stamp_key(key), version=version)
+        return deleted
+
+    def has_key(self, key, version=None):
+        self.make_and_validate_key(key, version=version)
+        return self.shared.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        # 공유 캐시 backend의 incr를 사용합니다. (파일/DB 캐시는 원자적이지 않음)
+        l1_key = self.make_and_validate_key(key, version=version)
+        self.l1_delete(l1_key)
+        value = self.shared.incr(key, delta, version=version)
+        self.shared.set(self.stamp_key(key), uuid.uuid4().hex, None, version=version)
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.l1.clear()
+        self.shared.clear()
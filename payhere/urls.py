@@ -9,6 +9,9 @@ from django.urls import path, include
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+# payhere
+from payhere.views import MetricsView
+
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -32,6 +35,9 @@ urlpatterns = [
     path("expenses/", include("expenses.urls")),
     path("incomes/", include("incomes.urls")),
     
+    # Metrics
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+    
     # Swagger
     path("", schema_view.with_ui("swagger", cache_timeout=0), name="schema-swagger-ui"),
     path("api/api.json/", schema_view.without_ui(cache_timeout=0), name="schema-swagger-json"),
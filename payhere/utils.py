@@ -1,49 +1,83 @@
 # django
+from django.conf import settings
 from django.contrib.sites.shortcuts import get_current_site
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import smart_bytes, force_str
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
 
 # python
+import json
 import uuid
+import base64
+import hashlib
+from datetime import datetime
 
 
 class ExpenseCalcUtil:
+    """지출 내역에 따른 가계부 일 총 금액 계산
+
+    호출하는 쪽에서 transaction 안에서 select_for_update로 가계부를 잠근 뒤 사용하며,
+    AccountBook.touch로 version을 올려 일 총 금액과 함께 저장합니다.
+    """
+
     def sub_total_money_expense(account_book, expense):
         account_book.day_total_money -= expense
-        account_book.save()
+        account_book.touch(["day_total_money"])
 
     def add_total_money_expense(account_book, expense):
         account_book.day_total_money += expense
-        account_book.save()
+        account_book.touch(["day_total_money"])
 
     def mix_total_money_expense(account_book, current_money, request_money):
         if current_money < request_money:
             account_book.day_total_money -= request_money - current_money
-            account_book.save()
+            account_book.touch(["day_total_money"])
 
         elif current_money > request_money:
             account_book.day_total_money += current_money - request_money
-            account_book.save()
+            account_book.touch(["day_total_money"])
+
+        # 금액이 같아도 다른 내역이 바뀌었으므로 version은 올립니다.
+        else:
+            account_book.touch()
+
+    def move_total_money_expense(current_account_book, request_account_book, current_money, request_money):
+        ExpenseCalcUtil.add_total_money_expense(current_account_book, current_money)
+        ExpenseCalcUtil.sub_total_money_expense(request_account_book, request_money)
 
 
 class IncomeCalcUtil:
+    """수익 내역에 따른 가계부 일 총 금액 계산
+
+    호출하는 쪽에서 transaction 안에서 select_for_update로 가계부를 잠근 뒤 사용하며,
+    AccountBook.touch로 version을 올려 일 총 금액과 함께 저장합니다.
+    """
+
     def sub_total_money_income(account_book, income):
         account_book.day_total_money -= income
-        account_book.save()
+        account_book.touch(["day_total_money"])
 
     def add_total_money_income(account_book, income):
         account_book.day_total_money += income
-        account_book.save()
+        account_book.touch(["day_total_money"])
 
     def mix_total_money_income(account_book, current_money, request_money):
         if current_money < request_money:
             account_book.day_total_money += request_money - current_money
-            account_book.save()
+            account_book.touch(["day_total_money"])
 
         elif current_money > request_money:
             account_book.day_total_money -= current_money - request_money
-            account_book.save()
+            account_book.touch(["day_total_money"])
+
+        # 금액이 같아도 다른 내역이 바뀌었으므로 version은 올립니다.
+        else:
+            account_book.touch()
+
+    def move_total_money_income(current_account_book, request_account_book, current_money, request_money):
+        IncomeCalcUtil.sub_total_money_income(current_account_book, current_money)
+        IncomeCalcUtil.add_total_money_income(request_account_book, request_money)
 
 
 class UrlUtil:
@@ -63,3 +97,82 @@ class UrlUtil:
         uidb64 = encode_key[:-7]
         query_id = force_str(urlsafe_base64_decode(uidb64))
         return query_id
+
+
+class FormatUtil:
+    """values_list로 조회한 값을 serializer(SerializerMethodField)와 같은 문자열로 변환
+
+    모델 인스턴스 없이 튜플을 바로 변환하므로 리스트 조회에서 행마다 드는 비용이 적습니다.
+    """
+
+    def money(value):
+        # format(obj.money, ",")
+        return format(value, ",")
+
+    def date(value):
+        # DateFormat(date_at).format("Y-m-d")
+        return f"{value.year:04d}-{value.month:02d}-{value.day:02d}"
+
+    def brief_detail(value):
+        # 모델의 brief_expense_detail / brief_income_detail (빈 문자열, null은 None)
+        if not value:
+            return None
+        if len(value) > 10:
+            return f"{value[:10]}..."
+        return value
+
+
+class ConditionalUtil:
+    """ETag(If-None-Match)로 바뀌지 않은 응답은 304로 응답합니다.
+
+    ETag는 조회 결과를 만들기 전에 version 등 가벼운 값으로 계산합니다.
+    """
+
+    def get_etag(*parts):
+        digest = hashlib.md5(":".join(str(part) for part in parts).encode(), usedforsecurity=False).hexdigest()
+        return f'"{digest}"'
+
+    def not_modified(request, etag):
+        """If-None-Match가 etag와 같으면 304 응답, 다르면 None을 반환합니다."""
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            ConditionalUtil.set_etag(response, etag)
+        return response
+
+    def set_etag(response, etag):
+        # 사용자별 응답이므로 공유 캐시에는 저장하지 않고, 클라이언트는 매번 ETag로 확인합니다.
+        response.headers["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class DigestUtil:
+    """월/일별 내역 요약 hash (클라이언트가 가진 데이터와 비교해 바뀐 월만 다시 조회하도록 합니다.)"""
+
+    def digest(*parts):
+        return hashlib.md5(":".join(str(part) for part in parts).encode(), usedforsecurity=False).hexdigest()[:16]
+
+
+class CursorUtil:
+    """동기화 API의 cursor (종류별 마지막 위치 (시각, id)를 담은 base64 문자열)
+
+    클라이언트는 내용을 해석하지 않고 받은 cursor를 그대로 다시 보냅니다.
+    """
+
+    def encode(positions):
+        data = {name: [at.isoformat(), id] for name, (at, id) in positions.items()}
+        return base64.urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode()).decode()
+
+    def decode(cursor, names):
+        """잘못된 cursor면 ValueError를 발생시킵니다.
+
+        시각의 timezone 정보 유무가 USE_TZ와 다르면 DB 시각과 비교할 수 없으므로 잘못된 cursor로 봅니다.
+        """
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            positions = {name: (datetime.fromisoformat(data[name][0]), int(data[name][1])) for name in names}
+        except (KeyError, IndexError, TypeError, AttributeError, UnicodeError) as e:
+            raise ValueError("invalid cursor") from e
+        if any(timezone.is_aware(at) != settings.USE_TZ for at, _ in positions.values()):
+            raise ValueError("invalid cursor")
+        return positions
@@ -0,0 +1,27 @@
+# rest_framework
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAdminUser
+
+# django
+from django.http import HttpResponse
+
+# drf_yasg
+from drf_yasg.utils import swagger_auto_schema
+
+# payhere
+from payhere.metrics import registry
+
+
+class MetricsView(APIView):
+    """Prometheus 메트릭 조회
+
+    get: 관리자만 view 클래스별 요청 수/응답 시간/SQL 수, 캐시 적중률을 text exposition format으로 조회합니다.
+    """
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_summary="Prometheus 메트릭 조회",
+        responses={200: "성공", 401: "인증 오류", 403: "접근 권한 에러", 500: "서버 에러"},
+    )
+    def get(self, request):
+        return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")